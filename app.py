@@ -1,56 +1,83 @@
 from flask import Flask, render_template, redirect, url_for
 from routes.competition_routes import competition_bp
 from routes.match_routes import match_bp
+from routes.team_routes import team_bp
+from routes.player_routes import player_bp
+from routes.search_routes import search_bp
 from utils.extensions import cache
+from utils.fast_json import FastJSONProvider
+from utils.metrics import init_metrics
+from utils.search_index import catalog_search
 import logging
-from flask_sqlalchemy import SQLAlchemy
 import os
 from utils.db import db  # ⬅️ Instead of 'from flask_sqlalchemy import SQLAlchemy'
 
+# Import models AFTER db is created
+from models import Competition, Season, Match, MatchPlot
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
-)
 
-app = Flask(__name__)
-cache.init_app(app)
+def database_uri() -> str:
+    db_uri = os.environ.get("DATABASE_URL", "sqlite:///local.db")
+    if db_uri.startswith("postgres://"):
+        db_uri = db_uri.replace("postgres://", "postgresql://", 1)
+    return db_uri
 
-db_uri = os.environ.get("DATABASE_URL", "sqlite:///local.db")
-if db_uri.startswith("postgres://"):
-    db_uri = db_uri.replace("postgres://", "postgresql://", 1)
-app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-db.init_app(app)  # ✅ Attach it to the app
+def create_app(config: dict = None) -> Flask:
+    """Application factory; ``config`` overrides the environment-derived settings"""
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+    )
 
-# Import models AFTER db is attached
-from models import Competition, Season, Match, MatchPlot
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri()
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        app.config.update(config)
 
+    cache.init_app(app)
+    db.init_app(app)  # ✅ Attach it to the app
+    init_metrics(app, cache)  # Opt-in /metrics (METRICS_ENABLED=1)
+    catalog_search.init_app(app)
 
-@app.route('/')
-def index():
-    return redirect(url_for('match.match_analysis'))  # 👈 'match' is the blueprint name
+    @app.route('/')
+    def index():
+        return redirect(url_for('match.match_analysis'))  # 👈 'match' is the blueprint name
 
-@app.route('/team-analysis')
-def team_analysis():
-    return render_template('team_analysis.html')
+    @app.route('/team-analysis')
+    def team_analysis():
+        return render_template('team_analysis.html')
 
-@app.route('/player-analysis')
-def player_analysis():
-    return render_template('player_analysis.html')
+    @app.route('/player-analysis')
+    def player_analysis():
+        return render_template('player_analysis.html')
 
-app.register_blueprint(competition_bp)
-app.register_blueprint(match_bp)
+    app.register_blueprint(competition_bp)
+    app.register_blueprint(match_bp)
+    app.register_blueprint(team_bp)
+    app.register_blueprint(player_bp)
+    app.register_blueprint(search_bp)
 
-@app.route('/debug/competitions')
-def debug_competitions():
-    comps = Competition.query.all()
-    if not comps:
-        return "No competitions found."
-    return "<br>".join(f"{c.id} – {c.name}" for c in comps)
+    @app.route('/debug/competitions')
+    def debug_competitions():
+        comps = Competition.query.all()
+        if not comps:
+            return "No competitions found."
+        return "<br>".join(f"{c.id} – {c.name}" for c in comps)
 
+    return app
 
-if __name__ == '__main__':
-    app.run(debug=True)
 
+def __getattr__(name):
+    # `gunicorn app:app` and older scripts still use the module-level app; build it on first access
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == '__main__':
+    create_app().run(debug=True)
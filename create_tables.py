@@ -1,7 +1,36 @@
-from app import app
+from sqlalchemy import inspect, text
+
+from app import create_app
 from utils.db import db
 
+
+def add_missing_columns():
+    """create_all() never alters existing tables; add any new columns in place"""
+    inspector = inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            definition = f"{preparer.quote(column.name)} {column.type.compile(dialect=db.engine.dialect)}"
+            if column.default is not None and column.default.is_scalar:
+                # Existing rows take the default, so NOT NULL totals stay summable
+                definition += f" DEFAULT {column.default.arg!r}"
+                if not column.nullable:
+                    definition += " NOT NULL"
+            elif not column.nullable:
+                print(f"⚠️ Cannot add NOT NULL column {table.name}.{column.name} without a default")
+                continue
+            with db.engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {definition}"))
+            print(f"➕ Added {table.name}.{column.name}")
+
+
 if __name__ == "__main__":
-    with app.app_context():
+    with create_app().app_context():
         db.create_all()
+        add_missing_columns()
         print("✅ Tables created")
@@ -1,131 +1,259 @@
 """
-Benchmark script to compare original vs optimized ETL performance
+Stage-level ETL benchmark.
+
+Runs the optimized ETL over a sample of matches in each execution mode
+(sync, async, thread, process) and worker count, and splits the time into
+stages: fetch, frame prep, each plot generator, JSON serialization and the
+DB write. Peak memory is recorded with tracemalloc (main process only) and
+the OS peak RSS. Every configuration runs in a fresh child process so
+memory figures don't bleed between runs.
+
+By default events come from the synthetic generator (optionally with a
+simulated fetch latency) and results are written to a throwaway SQLite DB,
+so the benchmark runs offline. ``--source statsbomb`` uses the live API and
+the configured DATABASE_URL instead.
+
+Usage:
+    python -m data.etl.benchmark_etl
+    python -m data.etl.benchmark_etl --modes thread process --workers 1 2 4 --matches 12
+    python -m data.etl.benchmark_etl --fetch-latency-ms 300 --output etl_bench.json
 """
-import time
+import argparse
+import asyncio
+import functools
+import json
 import logging
-from app import app
-from models import Match
-from data.etl.create_match_plots import create_all_match_plots as original_etl
-from data.etl.create_match_plots_optimized import create_all_match_plots_optimized
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from utils.synthetic_statsbomb import TEAM_NAMES, generate_match_events
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("benchmark")
 
+MODES = ('sync', 'async', 'thread', 'process')
+SYNTHETIC_MATCH_ID_BASE = 9900000
+
+# Pre-generated synthetic events, filled in the config process before any
+# worker pool forks so workers inherit them instead of regenerating
+_SYNTHETIC_EVENTS = {}
+
+
+def synthetic_events(match_id: int, latency: float = 0.0):
+    """Synthetic stand-in for ``sb.events`` with an optional simulated network latency"""
+    if latency:
+        time.sleep(latency)
+    events = _SYNTHETIC_EVENTS.get(match_id)
+    if events is None:
+        offset = match_id - SYNTHETIC_MATCH_ID_BASE
+        home = TEAM_NAMES[offset % len(TEAM_NAMES)]
+        away = TEAM_NAMES[(offset + 1 + offset // len(TEAM_NAMES)) % len(TEAM_NAMES)]
+        if away == home:
+            away = TEAM_NAMES[(offset + 2) % len(TEAM_NAMES)]
+        events = generate_match_events(match_id=match_id, home_team=home, away_team=away, seed=match_id)
+        _SYNTHETIC_EVENTS[match_id] = events
+    return events.copy()
+
 
-def benchmark_original_etl(sample_size: int = 5):
-    """Benchmark the original ETL with a sample of matches"""
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _seed_synthetic_matches(match_ids: List[int]):
+    """Insert the competition/season/match rows the synthetic events belong to"""
+    from utils.db import db
+    from models import Competition, Season, Match
+
+    db.session.merge(Competition(id=9900, name='Synthetic League'))
+    db.session.merge(Season(id='9900-1', season_id=1, competition_id=9900, year='2024/2025'))
+    for match_id in match_ids:
+        events = synthetic_events(match_id)
+        home, away = events['team'].dropna().unique()[:2]
+        # Weekly rounds so the synthetic season has a chronological order
+        match_date = (date(2024, 8, 10) + timedelta(days=7 * ((match_id - SYNTHETIC_MATCH_ID_BASE) // 6))).isoformat()
+        db.session.merge(Match(id=match_id, season_id='9900-1', home_team=home, away_team=away, scoreline='',
+                               match_date=match_date))
+    db.session.commit()
+
+
+def run_configuration(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one (mode, workers) configuration; executed in a fresh child process"""
+    from app import create_app
+    from utils.db import db
+    from models import Match
+    from data.etl.create_match_plots_optimized import MatchPlotProcessor, fetch_statsbomb_events
+
+    logging.getLogger("create_match_plots_optimized").setLevel(logging.WARNING)
+
+    if options['tracemalloc']:
+        tracemalloc.start()
+
+    mode, workers = options['mode'], options['workers']
+    app = create_app({'SQLALCHEMY_DATABASE_URI': options['database_url']} if options['database_url'] else None)
     with app.app_context():
-        matches = Match.query.limit(sample_size).all()
-        logger.info(f"🔥 Benchmarking ORIGINAL ETL with {len(matches)} matches...")
-        
-        start_time = time.time()
-        
-        # Run original ETL logic on sample
-        try:
-            # We'll simulate the original logic here since we don't want to modify the original
-            from data.etl.create_match_plots import create_all_match_plots
-            # Note: This would process ALL matches, so we'll just time a smaller operation
-            logger.info("⚠️  Original ETL processes all matches - skipping full benchmark")
-            logger.info("⚠️  Use the optimized version for better performance")
-            return None
-        except Exception as e:
-            logger.error(f"Original ETL failed: {e}")
-            return None
-
-
-def benchmark_optimized_etl(sample_size: int = 5, batch_size: int = 2, max_workers: int = 2):
-    """Benchmark the optimized ETL with a sample of matches"""
-    logger.info(f"🚀 Benchmarking OPTIMIZED ETL with {sample_size} matches...")
-    logger.info(f"📊 Config: batch_size={batch_size}, max_workers={max_workers}")
-    
-    start_time = time.time()
-    
-    try:
-        # Create a custom processor for limited matches
-        from data.etl.create_match_plots_optimized import MatchPlotProcessor
-        
-        with app.app_context():
-            processor = MatchPlotProcessor(batch_size=batch_size, max_workers=max_workers)
-            matches = Match.query.limit(sample_size).all()
-            
-            logger.info(f"Processing {len(matches)} matches...")
-            
-            # Process the sample
-            results = processor.process_matches_concurrent(matches)
-            processor.batch_update_database(results)
-            
-            end_time = time.time()
-            total_time = end_time - start_time
-            
-            successful = sum(1 for r in results if r['success'])
-            failed = len(results) - successful
-            
-            logger.info(f"✅ Optimized ETL Results:")
-            logger.info(f"⏱️  Total time: {total_time:.2f}s")
-            logger.info(f"📊 Successful: {successful}/{len(matches)}")
-            logger.info(f"❌ Failed: {failed}")
-            logger.info(f"🚀 Speed: {len(matches)/total_time:.2f} matches/second")
-            
-            return {
-                'total_time': total_time,
-                'matches_processed': len(matches),
-                'successful': successful,
-                'failed': failed,
-                'speed': len(matches)/total_time
-            }
-            
-    except Exception as e:
-        logger.error(f"Optimized ETL failed: {e}")
-        return None
-
-
-def run_performance_comparison():
-    """Run a comprehensive performance comparison"""
+        db.create_all()
+        if options['source'] == 'synthetic':
+            match_ids = [SYNTHETIC_MATCH_ID_BASE + i for i in range(options['matches'])]
+            for match_id in match_ids:
+                synthetic_events(match_id)
+            _seed_synthetic_matches(match_ids)
+            matches = Match.query.filter(Match.id.in_(match_ids)).order_by(Match.id).all()
+            fetcher = functools.partial(synthetic_events, latency=options['fetch_latency_ms'] / 1000)
+        else:
+            matches = Match.query.order_by(Match.id).limit(options['matches']).all()
+            fetcher = fetch_statsbomb_events
+
+        processor = MatchPlotProcessor(batch_size=options['batch_size'], max_workers=workers,
+                                       events_fetcher=fetcher)
+        results, db_write = [], 0.0
+        start = time.perf_counter()
+        for i in range(0, len(matches), processor.batch_size):
+            batch = matches[i:i + processor.batch_size]
+            if mode == 'sync':
+                batch_results = processor.process_matches_sequential(batch)
+            elif mode == 'async':
+                batch_results = asyncio.run(processor.process_matches_async(batch))
+            elif mode == 'thread':
+                batch_results = processor.process_matches_concurrent(batch)
+            else:
+                batch_results = processor.process_matches_multiprocess(batch)
+            write_start = time.perf_counter()
+            processor.batch_update_database(batch_results)
+            db_write += time.perf_counter() - write_start
+            results.extend(batch_results)
+        wall = time.perf_counter() - start
+
+    stages = defaultdict(float)
+    for result in results:
+        for stage, seconds in result.get('timings', {}).items():
+            stages[stage] += seconds
+    stages['db_write'] = db_write
+
+    report = {
+        'mode': mode,
+        'workers': workers,
+        'matches': len(matches),
+        'successful': sum(1 for r in results if r['success']),
+        'events': sum(r.get('event_count', 0) for r in results),
+        'wall_s': wall,
+        'matches_per_s': len(matches) / wall if wall else 0.0,
+        'stages_s': dict(stages),
+        'peak_rss_mb': _peak_rss_mb(),
+        'peak_rss_children_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+    if options['tracemalloc']:
+        report['tracemalloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return report
+
+
+def log_report(report: Dict[str, Any]):
+    """Log one configuration's results with a per-stage breakdown"""
+    logger.info(f"🔧 {report['mode']} × {report['workers']} workers: {report['wall_s']:.2f}s wall, "
+                f"{report['matches_per_s']:.2f} matches/s, {report['successful']}/{report['matches']} ok")
+    memory = f"   💾 peak RSS {report['peak_rss_mb']:.0f}MB"
+    if report['mode'] == 'process':
+        memory += f" (workers {report['peak_rss_children_mb']:.0f}MB)"
+    if 'tracemalloc_peak_mb' in report:
+        memory += f", tracemalloc peak {report['tracemalloc_peak_mb']:.0f}MB"
+    logger.info(memory)
+
+    # Stage totals are summed across matches, so with concurrency they can exceed wall time
+    total = sum(report['stages_s'].values()) or 1.0
+    per_match = max(report['matches'], 1)
+    for stage, seconds in sorted(report['stages_s'].items(), key=lambda item: -item[1]):
+        logger.info(f"   {stage:<22} {seconds:8.2f}s total  {seconds / per_match * 1000:8.1f}ms/match  "
+                    f"{seconds / total * 100:5.1f}%")
+
+
+def run_performance_comparison(modes=MODES, worker_counts=(1, 2, 4), matches: int = 8, batch_size: int = 4,
+                               source: str = 'synthetic', fetch_latency_ms: float = 0.0,
+                               use_tracemalloc: bool = True, database_url: str = None) -> List[Dict[str, Any]]:
+    """Benchmark every (mode, workers) combination and report the bottleneck stage"""
     logger.info("🏁 Starting ETL Performance Benchmark")
     logger.info("=" * 60)
-    
-    # Test different configurations
-    test_configs = [
-        {'sample_size': 3, 'batch_size': 2, 'max_workers': 2, 'name': 'Small (3 matches, 2 workers)'},
-        {'sample_size': 5, 'batch_size': 3, 'max_workers': 3, 'name': 'Medium (5 matches, 3 workers)'},
-        {'sample_size': 10, 'batch_size': 5, 'max_workers': 4, 'name': 'Large (10 matches, 4 workers)'},
-    ]
-    
-    results = []
-    
-    for config in test_configs:
-        logger.info(f"\n🧪 Testing: {config['name']}")
+
+    if source == 'synthetic' and database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='etl_bench_'), 'bench.db')}"
+    logger.info(f"📊 source={source}, matches={matches}, batch_size={batch_size}, "
+                f"fetch_latency={fetch_latency_ms}ms, db={database_url or 'DATABASE_URL'}")
+
+    configs = []
+    for mode in modes:
+        # Sync ignores the worker count, so one run is enough
+        for workers in ((1,) if mode == 'sync' else worker_counts):
+            configs.append({
+                'mode': mode, 'workers': workers, 'matches': matches, 'batch_size': batch_size,
+                'source': source, 'fetch_latency_ms': fetch_latency_ms,
+                'tracemalloc': use_tracemalloc, 'database_url': database_url,
+            })
+
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+    reports = []
+    for config in configs:
+        logger.info(f"\n🧪 Testing: {config['mode']} with {config['workers']} worker(s)")
         logger.info("-" * 40)
-        
-        result = benchmark_optimized_etl(
-            sample_size=config['sample_size'],
-            batch_size=config['batch_size'],
-            max_workers=config['max_workers']
-        )
-        
-        if result:
-            result['config'] = config['name']
-            results.append(result)
-    
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                report = executor.submit(run_configuration, config).result()
+        except Exception as e:
+            logger.error(f"❌ {config['mode']} × {config['workers']} failed: {e}")
+            continue
+        log_report(report)
+        reports.append(report)
+
     # Summary
     logger.info("\n📊 BENCHMARK SUMMARY")
     logger.info("=" * 60)
-    
-    for result in results:
-        logger.info(f"🔧 {result['config']}:")
-        logger.info(f"   ⏱️  Time: {result['total_time']:.2f}s")
-        logger.info(f"   ✅ Success: {result['successful']}/{result['matches_processed']}")
-        logger.info(f"   🚀 Speed: {result['speed']:.2f} matches/sec")
-        logger.info("")
-    
-    # Find best performing config
-    if results:
-        best = max(results, key=lambda x: x['speed'])
-        logger.info(f"🏆 BEST PERFORMANCE: {best['config']}")
-        logger.info(f"   🚀 Speed: {best['speed']:.2f} matches/second")
-        logger.info(f"   ⏱️  Time: {best['total_time']:.2f}s for {best['matches_processed']} matches")
+    for report in sorted(reports, key=lambda r: r['wall_s']):
+        bottleneck = max(report['stages_s'].items(), key=lambda item: item[1])[0] if report['stages_s'] else '-'
+        logger.info(f"   {report['mode']:<8} ×{report['workers']:<3} {report['wall_s']:8.2f}s  "
+                    f"{report['matches_per_s']:6.2f} matches/s  RSS {report['peak_rss_mb']:6.0f}MB  "
+                    f"bottleneck: {bottleneck}")
+    if reports:
+        best = max(reports, key=lambda r: r['matches_per_s'])
+        logger.info(f"🏆 BEST PERFORMANCE: {best['mode']} with {best['workers']} worker(s) "
+                    f"({best['matches_per_s']:.2f} matches/second)")
+    return reports
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stage-level ETL benchmark across execution modes")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument('--matches', type=int, default=8, help="Matches per configuration")
+    parser.add_argument('--batch-size', type=int, default=4)
+    parser.add_argument('--source', choices=('synthetic', 'statsbomb'), default='synthetic')
+    parser.add_argument('--fetch-latency-ms', type=float, default=0.0,
+                        help="Simulated per-match fetch latency for the synthetic source")
+    parser.add_argument('--database-url', help="Override the database (synthetic default: temporary SQLite)")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Skip tracemalloc (it slows Python code)")
+    parser.add_argument('--output', help="Write the reports as JSON to this path")
+    args = parser.parse_args(argv)
+
+    reports = run_performance_comparison(
+        modes=args.modes, worker_counts=args.workers, matches=args.matches, batch_size=args.batch_size,
+        source=args.source, fetch_latency_ms=args.fetch_latency_ms,
+        use_tracemalloc=not args.no_tracemalloc, database_url=args.database_url,
+    )
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(reports, f, indent=2)
+        logger.info(f"💾 Reports written to {args.output}")
+    return 0 if reports else 1
 
 
 if __name__ == "__main__":
-    run_performance_comparison()
+    sys.exit(main())
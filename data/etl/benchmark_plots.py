@@ -0,0 +1,288 @@
+"""
+Per-generator microbenchmarks over fixed synthetic match fixtures.
+
+Times every hot plot/analytics function on deterministic synthetic matches,
+compares against a JSON baseline and exits non-zero when a function slows
+down beyond the threshold or when its output no longer matches the baseline
+fingerprint (so optimisations can't silently change the plots).
+
+Fingerprints are checked everywhere. Timings are only comparable on the host
+that recorded the baseline, so elsewhere slowdowns are reported as warnings;
+re-record the baseline on the machine that gates on time.
+
+Usage:
+    python -m data.etl.benchmark_plots                    # check against baseline
+    python -m data.etl.benchmark_plots --update-baseline  # record a new baseline
+    python -m data.etl.benchmark_plots --only heatmap --repeat 10
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from utils.event_codes import encode_events, team_mask
+from utils.synthetic_statsbomb import generate_match_events
+from utils.plots.plot_factory import MatchDataProcessor, generate_all_plots_async, generate_all_plots_sync
+from utils.plots.match_plots.unified_heatmap import generate_heatmap
+from utils.plots.match_plots.momentum_per_game import generate_momentum_graph_plot
+from utils.plots.match_plots.xG_per_game import generate_match_graph_plot
+from utils.analytics.match_analytics.match_analysis_utils import goal_assist_stats, generate_team_stats
+
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("benchmark_plots")
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "plot_baseline.json")
+
+# Fixed fixtures: changing these invalidates every stored baseline
+FIXTURES = {
+    'regular': dict(seed=101, n_events=3400, home_goals=2, away_goals=1),
+    'extra_time_penalties': dict(seed=202, n_events=3800, home_goals=1, away_goals=1,
+                                 extra_time=True, extra_time_goals=(1, 1), penalties=True,
+                                 red_cards=1, yellow_cards=5),
+    'large': dict(seed=303, n_events=5000, home_goals=4, away_goals=3, home_shots=24, away_shots=18),
+}
+
+
+def build_fixtures() -> Dict[str, pd.DataFrame]:
+    """Generate the fixture frames exactly as the ETL would see them"""
+    return {name: encode_events(generate_match_events(**kwargs).fillna(-999)) for name, kwargs in FIXTURES.items()}
+
+
+def _teams(match_df: pd.DataFrame):
+    processor = MatchDataProcessor(match_df)
+    return processor.home_team, processor.away_team
+
+
+def _heatmap(heatmap_type: str, half: str = 'full') -> Callable[[pd.DataFrame], Any]:
+    def run(match_df):
+        if heatmap_type == 'dominance':
+            return generate_heatmap(match_df, heatmap_type, half)
+        home, _ = _teams(match_df)
+        return generate_heatmap(match_df[team_mask(match_df, home)], heatmap_type, half)
+    return run
+
+
+def _momentum(match_df):
+    return generate_momentum_graph_plot(match_df, *_teams(match_df))
+
+
+def _xg(match_df):
+    return generate_match_graph_plot(match_df, *_teams(match_df))
+
+
+def _goal_assist(match_df):
+    return goal_assist_stats(match_df, *_teams(match_df))
+
+
+def _team_stats(match_df):
+    home, _ = _teams(match_df)
+    return generate_team_stats(match_df[team_mask(match_df, home)], home)
+
+
+def _factory_sync(match_df):
+    return generate_all_plots_sync(MatchDataProcessor(match_df))
+
+
+def _factory_async(match_df):
+    return asyncio.run(generate_all_plots_async(MatchDataProcessor(match_df)))
+
+
+BENCHMARKS: Dict[str, Callable[[pd.DataFrame], Any]] = {
+    'heatmap_dominance': _heatmap('dominance'),
+    'heatmap_possession': _heatmap('possession'),
+    'heatmap_attack': _heatmap('attack'),
+    'heatmap_defense': _heatmap('defense'),
+    'heatmap_possession_first': _heatmap('possession', 'first'),
+    'momentum_graph': _momentum,
+    'xg_graph': _xg,
+    'goal_assist_stats': _goal_assist,
+    'team_stats': _team_stats,
+    'plot_factory_sync': _factory_sync,
+    'plot_factory_async': _factory_async,
+}
+
+
+def _canonical(obj: Any, digits: int) -> Any:
+    """Convert a generator result into plain JSON values with rounded floats"""
+    if isinstance(obj, pd.DataFrame):
+        return _canonical(obj.to_dict(orient='list'), digits)
+    if isinstance(obj, pd.Series):
+        return _canonical(obj.tolist(), digits)
+    if isinstance(obj, np.ndarray):
+        return _canonical(obj.tolist(), digits)
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v, digits) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v, digits) for v in obj]
+    if isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    if isinstance(obj, (int, np.integer)):
+        return int(obj)
+    if isinstance(obj, (float, np.floating)):
+        value = float(obj)
+        if value != value:
+            return None
+        return float(f"{value:.{digits}g}")
+    return obj
+
+
+def fingerprint(result: Any, digits: int = 9) -> str:
+    """Stable hash of a result; floats are compared to ``digits`` significant figures"""
+    payload = json.dumps(_canonical(result, digits), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def time_function(func: Callable[[pd.DataFrame], Any], match_df: pd.DataFrame, repeat: int, warmup: int = 1):
+    """Return (timings in seconds, last result); each run gets a fresh copy of the frame"""
+    result = None
+    for _ in range(warmup):
+        result = func(match_df.copy())
+    timings = []
+    for _ in range(repeat):
+        frame = match_df.copy()
+        start = time.perf_counter()
+        result = func(frame)
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def run_benchmarks(repeat: int = 5, only: str = None) -> Dict[str, Dict[str, Any]]:
+    """Run every selected benchmark on every fixture"""
+    fixtures = build_fixtures()
+    results = {}
+    for bench_name, func in BENCHMARKS.items():
+        if only and only not in bench_name:
+            continue
+        for fixture_name, match_df in fixtures.items():
+            key = f"{bench_name}[{fixture_name}]"
+            timings, result = time_function(func, match_df, repeat)
+            results[key] = {
+                'median_ms': round(statistics.median(timings) * 1000, 3),
+                'min_ms': round(min(timings) * 1000, 3),
+                'fingerprint': fingerprint(result),
+            }
+            logger.info(f"⏱️  {key:<50} median {results[key]['median_ms']:>9.2f}ms  "
+                        f"min {results[key]['min_ms']:>9.2f}ms  [{results[key]['fingerprint']}]")
+    return results
+
+
+def host_info() -> Dict[str, Any]:
+    """The machine a baseline's timings were recorded on"""
+    return {
+        'node': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def _canonical_fixtures() -> Dict[str, Any]:
+    """FIXTURES as they read back from the baseline JSON (tuples become lists)"""
+    return json.loads(json.dumps(FIXTURES, sort_keys=True))
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                        threshold: float, min_delta_ms: float, gate_timings: bool = True) -> list:
+    """
+    Return a list of human readable failures
+
+    Output changes always fail; slowdowns fail only with ``gate_timings``
+    (same host as the baseline) and are logged as warnings otherwise.
+    """
+    failures = []
+    for key, current in results.items():
+        expected = baseline.get('results', {}).get(key)
+        if expected is None:
+            logger.info(f"🆕 {key}: no baseline entry")
+            continue
+        if current['fingerprint'] != expected['fingerprint']:
+            failures.append(f"{key}: output changed ({expected['fingerprint']} -> {current['fingerprint']})")
+        # Gate on best-of-N: the minimum is far less sensitive to scheduler noise than the median
+        limit = expected['min_ms'] * (1 + threshold)
+        if current['min_ms'] > limit and current['min_ms'] - expected['min_ms'] > min_delta_ms:
+            slowdown = (f"{key}: {current['min_ms']:.2f}ms vs baseline {expected['min_ms']:.2f}ms "
+                        f"(+{(current['min_ms'] / expected['min_ms'] - 1) * 100:.0f}%)")
+            if gate_timings:
+                failures.append(slowdown)
+            else:
+                logger.warning(f"⚠️ {slowdown}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Plot generator microbenchmarks with regression gates")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument('--update-baseline', action='store_true', help="Write results as the new baseline")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown fraction (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument('--only', help="Only run benchmarks whose name contains this string")
+    args = parser.parse_args(argv)
+
+    baseline_path = os.path.abspath(args.baseline)
+    baseline = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    if not args.update_baseline:
+        # A missing or stale baseline must fail the gate, not silently become the new baseline
+        if baseline is None:
+            logger.error(f"❌ No baseline at {baseline_path}; record one with --update-baseline")
+            return 2
+        if baseline.get('fixtures') != _canonical_fixtures():
+            logger.error(f"❌ The baseline at {baseline_path} was recorded for different FIXTURES; "
+                         f"re-record it with --update-baseline")
+            return 2
+
+    host = host_info()
+    same_host = baseline is not None and baseline.get('host') == host
+
+    logger.info("🏁 Starting plot generator microbenchmarks")
+    results = run_benchmarks(repeat=args.repeat, only=args.only)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        existing = {}
+        # Other entries are kept only if they were measured on this host for the same fixtures
+        if same_host and baseline.get('fixtures') == _canonical_fixtures():
+            existing = baseline.get('results', {})
+        existing.update(results)
+        with open(baseline_path, 'w') as f:
+            json.dump({'fixtures': FIXTURES, 'host': host, 'results': existing},
+                      f, indent=2, sort_keys=True, default=list)
+        logger.info(f"💾 Baseline written to {baseline_path}")
+        return 0
+
+    if not same_host:
+        logger.warning(f"⚠️ Baseline timings were recorded on another host ({baseline.get('host')}); "
+                       f"only output fingerprints are gated")
+    failures = compare_to_baseline(results, baseline, args.threshold, args.min_delta_ms, gate_timings=same_host)
+    if failures:
+        logger.error(f"❌ {len(failures)} regression(s):")
+        for failure in failures:
+            logger.error(f"   {failure}")
+        return 1
+    if same_host:
+        logger.info(f"✅ All {len(results)} benchmarks within {args.threshold * 100:.0f}% of baseline")
+    else:
+        logger.info(f"✅ All {len(results)} benchmark outputs match the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
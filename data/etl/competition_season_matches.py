@@ -1,9 +1,17 @@
-from app import app, db
+from app import create_app
+from utils.db import db
 from models import Competition, Season, Match
-from statsbombpy import sb
+from data.etl.open_data_mirror import OpenDataMirror, open_data_dir
 
-def load_data():
-    with app.app_context():
+def load_data(open_data: str = None):
+    """Load competitions, seasons and matches from the live API, or a local open-data mirror"""
+    open_data = open_data or open_data_dir()
+    if open_data:
+        sb = OpenDataMirror(open_data)
+    else:
+        from statsbombpy import sb
+
+    with create_app().app_context():
         competitions = sb.competitions()
         for _, row in competitions.iterrows():
             comp = Competition(id=row['competition_id'], name=row['competition_name'])
@@ -25,7 +33,8 @@ def load_data():
                     season_id=season_id,
                     home_team=match['home_team'],
                     away_team=match['away_team'],
-                    scoreline=f"{match['home_score']}-{match['away_score']}"
+                    scoreline=f"{match['home_score']}-{match['away_score']}",
+                    match_date=match.get('match_date')
                 )
                 db.session.merge(m)
 
@@ -1,11 +1,8 @@
 import json
 import logging
 import pandas as pd
-import plotly.io as pio
 import warnings
-from statsbombpy import sb
-from flask import Flask
-from app import app
+from app import create_app
 from utils.db import db
 from models import Match, MatchPlot, Season
 from utils.plots.match_plots.xG_per_game import generate_match_graph_plot
@@ -27,9 +24,8 @@ logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.WARNING)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("create_match_plots")
 
-print(f"Using DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
-
 def safe_plotly_json(fig):
+    import plotly.io as pio
     return pio.to_json(fig, pretty=True, engine="json", validate=False)
 
 
@@ -37,6 +33,10 @@ def safe_plotly_json(fig):
 
 
 def create_all_match_plots():
+    from statsbombpy import sb
+
+    app = create_app()
+    logger.info(f"Using DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
     with app.app_context():
         matches = Match.query.all()
 
@@ -1,35 +1,37 @@
-import json
+import argparse
 import logging
+import sys
 import pandas as pd
-import numpy as np
 import asyncio
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+import zlib
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+from typing import List, Dict, Any, Callable
 import warnings
-from statsbombpy import sb
 from flask import Flask
-from app import app
+from app import create_app
 from utils.db import db
-from models import Match, MatchPlot, Season
+from utils import fast_json
+from models import (Match, MatchPlot, Season, MatchCountGrid, MatchEventArrays, MatchXgSeries,
+                    PlayerMatchStats, EtlMatchRun)
+from data.etl.etl_telemetry import TelemetryWriter, default_path as default_telemetry_path
+from data.etl.open_data_mirror import OpenDataMirror, open_data_dir
+from data.etl.statsbomb_async import AsyncStatsBombClient
+from data.etl.season_aggregates import apply_match_totals, replace_match_totals
+from data.etl.sharding import Shard, format_shard, parse_shard, shard_matches
+from data.etl.team_form import apply_match_form
+from utils.event_codes import codebook, encode_events
+from utils.analytics.match_analytics.match_analysis_utils import match_player_stats, match_team_totals
+from utils.plots.match_plots.momentum_per_game import momentum_totals
+from utils.plots.match_plots.xG_per_game import match_xg_series
 from utils.plots.plot_factory import MatchDataProcessor, generate_all_plots_async, generate_all_plots_sync
+from utils.plots.match_plots.unified_heatmap import TEAM_HEATMAP_BINS
+from utils.plots.season_heatmaps import GRID_PHASES, pack_count_grids
+from utils.plots.event_arrays import compact_events, pack_event_arrays
 
 
-class NumpyEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles numpy data types"""
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif pd.isna(obj):
-            return None
-        return super().default(obj)
-
 # Suppress common warning spam
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -44,91 +46,241 @@ logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.WARNING)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("create_match_plots_optimized")
 
-print(f"Using DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
+
+def fetch_statsbomb_events(match_id: int) -> pd.DataFrame:
+    """Default events source: the live StatsBomb API"""
+    from statsbombpy import sb  # heavy import, only needed when actually fetching
+    return sb.events(match_id)
 
 
 class MatchPlotProcessor:
     """Optimized match plot processor with batching and concurrency"""
     
-    def __init__(self, batch_size: int = 10, max_workers: int = 4):
+    def __init__(self, batch_size: int = 10, max_workers: int = 4,
+                 events_fetcher: Callable[[int], pd.DataFrame] = None,
+                 max_retries: int = 2, retry_backoff: float = 1.0,
+                 telemetry: TelemetryWriter = None,
+                 async_client: Callable[[], AsyncStatsBombClient] = None,
+                 shard: Shard = None, run_id: str = None):
         self.batch_size = batch_size
         self.max_workers = max_workers
+        # Pluggable so benchmarks/tests can run against synthetic or local data
+        self.events_fetcher = events_fetcher or fetch_statsbomb_events
+        # Client factory for the async path; by default the live source is fetched natively,
+        # while a custom events_fetcher keeps running in the executor
+        if async_client is None and events_fetcher is None:
+            async_client = lambda: AsyncStatsBombClient(concurrency=max_workers, max_retries=max_retries,  # noqa: E731
+                                                        retry_backoff=retry_backoff)
+        self.async_client = async_client
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.telemetry = telemetry
+        # Sharded runs process only their bucket of matches and leave the cross-match
+        # aggregates to the merge step (data.etl.sharding), which needs the run id
+        self.shard = shard
+        self.run_id = run_id
         self.processed_count = 0
         self.failed_count = 0
         self.start_time = None
     
+    @staticmethod
+    def _prepare_processor(events: pd.DataFrame, timings: Dict[str, float]) -> MatchDataProcessor:
+        """Build the shared preprocessing object from raw events"""
+        start = time.perf_counter()
+        match_df = encode_events(pd.DataFrame(events.fillna(-999)))
+        processor = MatchDataProcessor(match_df)
+        timings['prep'] = time.perf_counter() - start
+        return processor
+    
+    @staticmethod
+    def _team_totals(processor: MatchDataProcessor, timings: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Per-team match totals for the season aggregate table and form series"""
+        # Momentum (and the xT it sums) is charged to its own feature:* stages; the plots reuse it
+        momentum = processor.feature('momentum', timings)
+        start = time.perf_counter()
+        totals = match_team_totals(processor.match_df, momentum_totals(momentum))
+        timings['team_totals'] = time.perf_counter() - start
+        return totals
+    
+    @staticmethod
+    def _player_stats(processor: MatchDataProcessor, timings: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Per-player match totals for the player event index"""
+        start = time.perf_counter()
+        stats = match_player_stats(processor.match_df)
+        timings['player_stats'] = time.perf_counter() - start
+        return stats
+    
+    @staticmethod
+    def _count_grids(processor: MatchDataProcessor, timings: Dict[str, float]) -> Dict[str, bytes]:
+        """Packed raw heatmap counts per team (reuses the grids the team heatmaps were built from)"""
+        start = time.perf_counter()
+        grids = {}
+        if processor.home_team != processor.away_team:
+            for team_prefix, team in (('home_team', processor.home_team), ('away_team', processor.away_team)):
+                grids[str(team)] = pack_count_grids(
+                    {phase: processor.count_grids(team_prefix, phase) for phase in GRID_PHASES})
+        timings['count_grids'] = time.perf_counter() - start
+        return grids
+    
+    @staticmethod
+    def _event_arrays(processor: MatchDataProcessor, timings: Dict[str, float]) -> bytes:
+        """Compact located-event arrays behind the on-demand /api/heatmap endpoint"""
+        start = time.perf_counter()
+        arrays = None
+        if processor.home_team != processor.away_team:
+            arrays = pack_event_arrays(compact_events(processor.match_df, [processor.home_team, processor.away_team]))
+        timings['event_arrays'] = time.perf_counter() - start
+        return arrays
+    
+    @staticmethod
+    def _xg_series(processor: MatchDataProcessor, timings: Dict[str, float]) -> str:
+        """Compact cumulative xG series behind the /api/compare/xg endpoint"""
+        start = time.perf_counter()
+        series = None
+        if processor.home_team != processor.away_team:
+            series = fast_json.dumps(match_xg_series(processor.match_df, processor.home_team, processor.away_team))
+        timings['xg_series'] = time.perf_counter() - start
+        return series
+    
+    @staticmethod
+    def _serialize_plots(all_plots: Dict[str, Any], timings: Dict[str, float]) -> Dict[str, str]:
+        """Convert plots to JSON strings for database storage"""
+        start = time.perf_counter()
+        plot_dict = {}
+        for plot_type, plot_data in all_plots.items():
+            plot_dict[plot_type] = fast_json.dumps(plot_data)
+        timings['serialize'] = time.perf_counter() - start
+        return plot_dict
+    
+    def _fetch_events(self, match_id: int, meta: Dict[str, Any]) -> pd.DataFrame:
+        """Fetch events with exponential backoff; the retry count is recorded in ``meta``"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.events_fetcher(match_id)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                meta['retries'] = attempt + 1
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"⚠️  Fetch failed for match {match_id} ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    @staticmethod
+    def _success(match_id: int, processor: MatchDataProcessor, plots: Dict[str, str],
+                 timings: Dict[str, float], meta: Dict[str, Any],
+                 team_totals: List[Dict[str, Any]] = None,
+                 count_grids: Dict[str, bytes] = None,
+                 player_stats: List[Dict[str, Any]] = None,
+                 event_arrays: bytes = None,
+                 xg_series: str = None) -> Dict[str, Any]:
+        return {
+            'match_id': match_id,
+            'plots': plots,
+            'team_totals': team_totals or [],
+            'count_grids': count_grids or {},
+            'player_stats': player_stats or [],
+            'event_arrays': event_arrays,
+            'xg_series': xg_series,
+            # Values without a code yet; the batch commit allocates them (workers may be other processes)
+            'new_codes': codebook.take_unseen(),
+            'success': True,
+            'event_count': len(processor.match_df),
+            # Serialized JSON is UTF-8 and may contain non-ASCII names
+            'payload_bytes': {plot_type: len(plot_json.encode('utf-8')) for plot_type, plot_json in plots.items()},
+            'timings': timings,
+            'retries': meta['retries'],
+            'duration': time.perf_counter() - meta['start']
+        }
+    
+    @staticmethod
+    def _failure(match_id: int, error: Exception, timings: Dict[str, float] = None,
+                 meta: Dict[str, Any] = None) -> Dict[str, Any]:
+        result = {
+            'match_id': match_id,
+            'plots': {},
+            'success': False,
+            'error': str(error),
+            'timings': timings or {},
+            'retries': meta['retries'] if meta else 0
+        }
+        if meta:
+            result['duration'] = time.perf_counter() - meta['start']
+        return result
+    
+    def _record_result(self, result: Dict[str, Any]):
+        """Update counters and emit the match's telemetry record"""
+        if result['success']:
+            self.processed_count += 1
+        else:
+            self.failed_count += 1
+        if self.telemetry is not None:
+            self.telemetry.record_match(result)
+    
     def process_single_match(self, match: Match) -> Dict[str, Any]:
         """Process a single match and return plot data"""
+        timings = {}
+        meta = {'retries': 0, 'start': time.perf_counter()}
         try:
             logger.debug(f"Processing match {match.id}...")
             
             # Fetch events data
-            events = sb.events(match.id).fillna(-999)
-            match_df = pd.DataFrame(events)
+            start = time.perf_counter()
+            events = self._fetch_events(match.id, meta)
+            timings['fetch'] = time.perf_counter() - start
             
             # Create processor for shared data preprocessing
-            processor = MatchDataProcessor(match_df)
+            processor = self._prepare_processor(events, timings)
+            team_totals = self._team_totals(processor, timings)
+            player_stats = self._player_stats(processor, timings)
             
             # Generate all plots using the factory
-            all_plots = generate_all_plots_sync(processor)
+            all_plots = generate_all_plots_sync(processor, timings)
             
-            # Convert to JSON strings for database storage
-            plot_dict = {}
-            for plot_type, plot_data in all_plots.items():
-                plot_dict[plot_type] = json.dumps(plot_data, cls=NumpyEncoder)
-            
-            return {
-                'match_id': match.id,
-                'plots': plot_dict,
-                'success': True
-            }
+            count_grids = self._count_grids(processor, timings)
+            event_arrays = self._event_arrays(processor, timings)
+            xg_series = self._xg_series(processor, timings)
+            plots = self._serialize_plots(all_plots, timings)
+            return self._success(match.id, processor, plots, timings, meta, team_totals, count_grids,
+                                 player_stats, event_arrays, xg_series)
             
         except Exception as e:
             logger.error(f"❌ Failed to process match {match.id}: {e}")
-            return {
-                'match_id': match.id,
-                'plots': {},
-                'success': False,
-                'error': str(e)
-            }
+            return self._failure(match.id, e, timings, meta)
     
-    async def process_single_match_async(self, match: Match) -> Dict[str, Any]:
-        """Async version of single match processing"""
+    async def process_single_match_async(self, match: Match, client: AsyncStatsBombClient = None) -> Dict[str, Any]:
+        """Async version of single match processing; ``client`` fetches natively instead of in the executor"""
+        timings = {}
+        meta = {'retries': 0, 'start': time.perf_counter()}
         try:
             logger.debug(f"Processing match {match.id} (async)...")
             
             # Fetch events data (this is the main I/O bottleneck)
-            loop = asyncio.get_event_loop()
-            events = await loop.run_in_executor(
-                None, lambda: sb.events(match.id).fillna(-999)
-            )
-            match_df = pd.DataFrame(events)
+            start = time.perf_counter()
+            if client is not None:
+                events = await client.events_frame(match.id, meta)
+            else:
+                loop = asyncio.get_event_loop()
+                events = await loop.run_in_executor(None, self._fetch_events, match.id, meta)
+            timings['fetch'] = time.perf_counter() - start
             
             # Create processor for shared data preprocessing
-            processor = MatchDataProcessor(match_df)
+            processor = self._prepare_processor(events, timings)
+            team_totals = self._team_totals(processor, timings)
+            player_stats = self._player_stats(processor, timings)
             
             # Generate all plots concurrently
-            all_plots = await generate_all_plots_async(processor)
+            all_plots = await generate_all_plots_async(processor, timings)
             
-            # Convert to JSON strings for database storage
-            plot_dict = {}
-            for plot_type, plot_data in all_plots.items():
-                plot_dict[plot_type] = json.dumps(plot_data, cls=NumpyEncoder)
-            
-            return {
-                'match_id': match.id,
-                'plots': plot_dict,
-                'success': True
-            }
+            count_grids = self._count_grids(processor, timings)
+            event_arrays = self._event_arrays(processor, timings)
+            xg_series = self._xg_series(processor, timings)
+            plots = self._serialize_plots(all_plots, timings)
+            return self._success(match.id, processor, plots, timings, meta, team_totals, count_grids,
+                                 player_stats, event_arrays, xg_series)
             
         except Exception as e:
             logger.error(f"❌ Failed to process match {match.id}: {e}")
-            return {
-                'match_id': match.id,
-                'plots': {},
-                'success': False,
-                'error': str(e)
-            }
+            return self._failure(match.id, e, timings, meta)
     
     def batch_update_database(self, results: List[Dict[str, Any]]):
         """Efficiently update database with batch of results"""
@@ -164,6 +316,69 @@ class MatchPlotProcessor:
                         )
                         inserts.append(new_plot)
             
+            # Raw heatmap counts, summed later for season heatmaps
+            for result in results:
+                if not result['success']:
+                    continue
+                for team, counts in result.get('count_grids', {}).items():
+                    db.session.merge(MatchCountGrid(match_id=result['match_id'], team=team,
+                                                    bins_y=TEAM_HEATMAP_BINS[0], bins_x=TEAM_HEATMAP_BINS[1],
+                                                    counts=counts))
+                if result.get('event_arrays'):
+                    db.session.merge(MatchEventArrays(match_id=result['match_id'],
+                                                      checksum=zlib.crc32(result['event_arrays']),
+                                                      data=result['event_arrays']))
+                if result.get('xg_series'):
+                    db.session.merge(MatchXgSeries(match_id=result['match_id'], data=result['xg_series']))
+            
+            succeeded = [r for r in results if r['success']]
+            new_codes = {}
+            for result in succeeded:
+                for kind, values in result.get('new_codes', {}).items():
+                    new_codes.setdefault(kind, set()).update(values)
+            added = codebook.persist(new_codes)
+            if added:
+                logger.debug(f"🔤 Stored {added} new event codes")
+            matches = {
+                match_id: (season_id, match_date)
+                for match_id, season_id, match_date in
+                db.session.query(Match.id, Match.season_id, Match.match_date)
+                .filter(Match.id.in_([r['match_id'] for r in succeeded]))
+                .all()
+            } if succeeded else {}
+            
+            # Player event index: a reprocessed match replaces its rows
+            with_players = [r for r in succeeded if r.get('player_stats') and r['match_id'] in matches]
+            if with_players:
+                PlayerMatchStats.query.filter(
+                    PlayerMatchStats.match_id.in_([r['match_id'] for r in with_players])
+                ).delete(synchronize_session=False)
+                db.session.bulk_insert_mappings(PlayerMatchStats, [
+                    {**stats, 'match_id': result['match_id'], 'season_id': matches[result['match_id']][0]}
+                    for result in with_players for stats in result['player_stats']
+                ])
+            
+            # Season aggregates and form series move by the difference to the match's previous totals.
+            # Shards share those rows, so a sharded run only replaces its matches' totals and the
+            # merge step rebuilds the aggregates once every shard is done.
+            for result in succeeded:
+                if result.get('team_totals') and result['match_id'] in matches:
+                    if self.shard is not None:
+                        replace_match_totals(result['match_id'], result['team_totals'])
+                        continue
+                    season_id, match_date = matches[result['match_id']]
+                    apply_match_totals(result['match_id'], season_id, result['team_totals'])
+                    apply_match_form(result['match_id'], season_id, match_date, result['team_totals'])
+            
+            # Per-match outcome for the run, committed with the match's rows
+            if self.run_id is not None:
+                finished_at = time.time()
+                shard = format_shard(self.shard) if self.shard is not None else None
+                for result in results:
+                    db.session.merge(EtlMatchRun(run_id=self.run_id, match_id=result['match_id'], shard=shard,
+                                                 succeeded=result['success'], error=result.get('error'),
+                                                 finished_at=finished_at))
+            
             # Bulk operations
             if inserts:
                 db.session.bulk_save_objects(inserts)
@@ -189,9 +404,10 @@ class MatchPlotProcessor:
         results = []
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
+            # Submit all tasks. Ids are read here: after a batch commit the Match rows are
+            # expired and refreshing them from a worker thread fails outside the app context
             future_to_match = {
-                executor.submit(self.process_single_match, match): match 
+                executor.submit(self.process_single_match, SimpleNamespace(id=match.id)): match 
                 for match in matches
             }
             
@@ -200,23 +416,50 @@ class MatchPlotProcessor:
                 match = future_to_match[future]
                 try:
                     result = future.result()
-                    results.append(result)
-                    
                     if result['success']:
-                        self.processed_count += 1
                         logger.debug(f"✅ Completed match {match.id}")
-                    else:
-                        self.failed_count += 1
                         
                 except Exception as e:
                     logger.error(f"❌ Exception processing match {match.id}: {e}")
-                    self.failed_count += 1
-                    results.append({
-                        'match_id': match.id,
-                        'plots': {},
-                        'success': False,
-                        'error': str(e)
-                    })
+                    result = self._failure(match.id, e)
+                
+                self._record_result(result)
+                results.append(result)
+        
+        return results
+    
+    def process_matches_sequential(self, matches: List[Match]) -> List[Dict[str, Any]]:
+        """Process matches one after another in this thread"""
+        results = []
+        for match in matches:
+            result = self.process_single_match(match)
+            self._record_result(result)
+            results.append(result)
+        return results
+    
+    def process_matches_multiprocess(self, matches: List[Match]) -> List[Dict[str, Any]]:
+        """Process matches in worker processes (sidesteps the GIL for the CPU-bound plot generation)"""
+        results = []
+        
+        # Workers encode events with the codes known here; their unseen values come back in the results
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(codebook.snapshot(),)) as executor:
+            future_to_match = {
+                executor.submit(_process_match_in_worker, match.id, self.events_fetcher,
+                                self.max_retries, self.retry_backoff): match
+                for match in matches
+            }
+            
+            for future in as_completed(future_to_match):
+                match = future_to_match[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Exception processing match {match.id}: {e}")
+                    result = self._failure(match.id, e)
+                
+                self._record_result(result)
+                results.append(result)
         
         return results
     
@@ -224,42 +467,39 @@ class MatchPlotProcessor:
         """Process matches asynchronously"""
         semaphore = asyncio.Semaphore(self.max_workers)
         
-        async def process_with_semaphore(match):
-            async with semaphore:
-                return await self.process_single_match_async(match)
-        
-        # Process all matches concurrently with semaphore limiting
-        tasks = [process_with_semaphore(match) for match in matches]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async with (self.async_client() if self.async_client else nullcontext()) as client:
+            async def process_with_semaphore(match):
+                async with semaphore:
+                    return await self.process_single_match_async(match, client)
+            
+            # Process all matches concurrently with semaphore limiting
+            tasks = [process_with_semaphore(match) for match in matches]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Handle exceptions
         processed_results = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 logger.error(f"❌ Exception processing match {matches[i].id}: {result}")
-                self.failed_count += 1
-                processed_results.append({
-                    'match_id': matches[i].id,
-                    'plots': {},
-                    'success': False,
-                    'error': str(result)
-                })
-            else:
-                if result['success']:
-                    self.processed_count += 1
-                else:
-                    self.failed_count += 1
-                processed_results.append(result)
+                result = self._failure(matches[i].id, result)
+            self._record_result(result)
+            processed_results.append(result)
         
         return processed_results
     
-    def create_all_match_plots(self, use_async: bool = True):
+    def create_all_match_plots(self, use_async: bool = True, app: Flask = None):
         """Main method to create all match plots with optimizations"""
+        app = app or create_app()
+        logger.info(f"Using DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
         with app.app_context():
             self.start_time = time.time()
+            codebook.load()
             
-            # Get all matches
-            matches = Match.query.all()
+            # Get all matches (in id order, so a shard's batches are the same on every run)
+            matches = Match.query.order_by(Match.id).all()
+            if self.shard is not None:
+                matches = shard_matches(matches, self.shard)
+                logger.info(f"🧩 Shard {format_shard(self.shard)} of run {self.run_id}")
             total_matches = len(matches)
             logger.info(f"🚀 Starting optimized processing of {total_matches} matches...")
             logger.info(f"📊 Configuration: batch_size={self.batch_size}, max_workers={self.max_workers}, async={use_async}")
@@ -282,7 +522,10 @@ class MatchPlotProcessor:
                         results = self.process_matches_concurrent(batch)
                     
                     # Update database with batch results
+                    write_start = time.perf_counter()
                     self.batch_update_database(results)
+                    if self.telemetry is not None:
+                        self.telemetry.record_stage('db_write', time.perf_counter() - write_start)
                     
                     batch_time = time.time() - batch_start
                     avg_time_per_match = batch_time / len(batch)
@@ -307,22 +550,81 @@ class MatchPlotProcessor:
             logger.info(f"❌ Failed matches: {self.failed_count}")
             logger.info(f"💾 Total plots in database: {total_processed}")
             logger.info(f"🚀 Average speed: {total_matches/total_time:.2f} matches/second")
+            
+            if self.telemetry is not None:
+                self.telemetry.write_summary(total_matches=total_matches, use_async=use_async,
+                                             batch_size=self.batch_size, max_workers=self.max_workers,
+                                             shard=format_shard(self.shard) if self.shard is not None else None)
+                logger.info(f"🧾 Telemetry written to {self.telemetry.path} (run {self.telemetry.run_id})")
+
+
+def _init_worker(codes: Dict[str, Dict[str, int]]):
+    """Process-pool initializer: seed the worker's code book, which has no database session"""
+    codebook.merge(codes)
+
+
+def _process_match_in_worker(match_id: int, events_fetcher: Callable[[int], pd.DataFrame],
+                             max_retries: int, retry_backoff: float) -> Dict[str, Any]:
+    """Process-pool entry point; only the match id and a picklable fetcher cross the process boundary"""
+    processor = MatchPlotProcessor(events_fetcher=events_fetcher, max_retries=max_retries,
+                                   retry_backoff=retry_backoff)
+    return processor.process_single_match(SimpleNamespace(id=match_id))
+
 
+def create_all_match_plots_optimized(batch_size: int = 10, max_workers: int = 4, use_async: bool = True,
+                                     telemetry_path: str = None, open_data: str = None,
+                                     shard: Shard = None, run_id: str = None):
+    """
+    Entry point for optimized match plot creation; ``open_data`` reads events from a local mirror
 
-def create_all_match_plots_optimized(batch_size: int = 10, max_workers: int = 4, use_async: bool = True):
-    """Entry point for optimized match plot creation"""
-    processor = MatchPlotProcessor(batch_size=batch_size, max_workers=max_workers)
+    With ``shard=(i, N)`` only the i-th of N disjoint sets of matches is processed, so N
+    machines can rebuild concurrently against the same database; ``run_id`` (required then)
+    ties their outcomes together for ``python -m data.etl.sharding --merge``.
+    """
+    if shard is not None and not run_id:
+        raise ValueError("a sharded run needs a run_id shared by all of its shards")
+    telemetry = TelemetryWriter(telemetry_path, run_id=run_id) if telemetry_path else None
+    events_fetcher = OpenDataMirror(open_data).events if open_data else None
+    processor = MatchPlotProcessor(batch_size=batch_size, max_workers=max_workers, telemetry=telemetry,
+                                   events_fetcher=events_fetcher, shard=shard, run_id=run_id)
     processor.create_all_match_plots(use_async=use_async)
 
 
-if __name__ == "__main__":
-    # Configuration - adjust these based on your system
-    BATCH_SIZE = 10      # Number of matches to process in each batch
-    MAX_WORKERS = 4      # Number of concurrent workers
-    USE_ASYNC = False    # Use sync processing for Heroku compatibility
-    
+def _shard_arg(value: str) -> Shard:
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main(argv=None) -> int:
+    # Defaults suit a single Heroku dyno: sync processing, 10-match batches, 4 workers
+    parser = argparse.ArgumentParser(description="Create the match plots and derived tables")
+    parser.add_argument('--batch-size', type=int, default=10, help="Matches per database commit")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent workers")
+    parser.add_argument('--async', dest='use_async', action='store_true', help="Use the asyncio pipeline")
+    parser.add_argument('--telemetry', default=default_telemetry_path(),
+                        help="Per-match JSON-lines records (ETL_TELEMETRY_PATH, default data/etl_telemetry.jsonl)")
+    parser.add_argument('--open-data', default=open_data_dir(),
+                        help="Local open-data checkout (STATSBOMB_OPEN_DATA_DIR); default: the live API")
+    parser.add_argument('--shard', type=_shard_arg, default=None, metavar='i/N',
+                        help="Process only shard i of N (0-based); run one per machine, then merge")
+    parser.add_argument('--run-id', default=None, help="Id shared by every shard of a run (required with --shard)")
+    args = parser.parse_args(argv)
+    if args.shard is not None and not args.run_id:
+        parser.error("--shard needs --run-id")
+
     create_all_match_plots_optimized(
-        batch_size=BATCH_SIZE,
-        max_workers=MAX_WORKERS,
-        use_async=USE_ASYNC
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        use_async=args.use_async,
+        telemetry_path=args.telemetry,
+        open_data=args.open_data,
+        shard=args.shard,
+        run_id=args.run_id
     )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,15 @@
-import json
 import logging
 import pandas as pd
-import numpy as np
 import time
 from typing import List, Dict, Any
 import warnings
-from statsbombpy import sb
-from flask import Flask
-from app import app
+from app import create_app
 from utils.db import db
+from utils import fast_json
 from models import Match, MatchPlot, Season
 from utils.plots.plot_factory import MatchDataProcessor, generate_all_plots_sync
 
 
-class NumpyEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles numpy data types"""
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif pd.isna(obj):
-            return None
-        return super().default(obj)
-
 # Suppress common warning spam
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -42,8 +24,6 @@ logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.WARNING)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("create_match_plots_simple")
 
-print(f"Using DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
-
 
 def process_single_match(match: Match) -> Dict[str, Any]:
     """Process a single match and return plot data"""
@@ -51,6 +31,7 @@ def process_single_match(match: Match) -> Dict[str, Any]:
         logger.info(f"Processing match {match.id}...")
         
         # Fetch events data
+        from statsbombpy import sb
         events = sb.events(match.id).fillna(-999)
         match_df = pd.DataFrame(events)
         
@@ -64,7 +45,7 @@ def process_single_match(match: Match) -> Dict[str, Any]:
         plot_dict = {}
         for plot_type, plot_data in all_plots.items():
             try:
-                plot_dict[plot_type] = json.dumps(plot_data, cls=NumpyEncoder)
+                plot_dict[plot_type] = fast_json.dumps(plot_data)
             except Exception as json_error:
                 logger.error(f"JSON serialization failed for {plot_type}: {json_error}")
                 raise
@@ -123,6 +104,8 @@ def update_database_with_plots(match_id: int, plots: Dict[str, str]):
 
 def create_all_match_plots_simple():
     """Simple, robust version of match plot creation"""
+    app = create_app()
+    logger.info(f"Using DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
     with app.app_context():
         start_time = time.time()
         
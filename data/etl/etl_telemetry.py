@@ -0,0 +1,237 @@
+"""
+Structured per-match ETL telemetry.
+
+``TelemetryWriter`` appends one JSON object per line: a ``match`` record for
+every processed match and a ``summary`` record at the end of each run. The
+report command aggregates those files into percentiles and lists the slowest
+matches and plots, so pathological matches can be found.
+
+The ETL writes to ``data/etl_telemetry.jsonl`` (git-ignored) unless
+``ETL_TELEMETRY_PATH`` or ``--telemetry`` says otherwise.
+
+Usage:
+    python -m data.etl.etl_telemetry
+    python -m data.etl.etl_telemetry data/etl_telemetry.jsonl --top 20 --run <run_id>
+    python -m data.etl.etl_telemetry --json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Next to the other generated data rather than in whatever directory the ETL runs from
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl_telemetry.jsonl")
+
+
+def default_path() -> str:
+    return os.environ.get("ETL_TELEMETRY_PATH", DEFAULT_PATH)
+
+
+class TelemetryWriter:
+    """Thread-safe JSON-lines writer for ETL telemetry records"""
+
+    def __init__(self, path: str, run_id: str = None):
+        self.path = path
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._stages = defaultdict(float)
+        self._payload_bytes = 0
+        self._matches = 0
+        self._succeeded = 0
+        self._retries = 0
+        self._started = time.time()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, record: Dict[str, Any]):
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def record_match(self, result: Dict[str, Any]):
+        """Write the telemetry record for one ETL result dict"""
+        stages = {stage: round(seconds, 6) for stage, seconds in result.get('timings', {}).items()}
+        payload = result.get('payload_bytes', {})
+        record = {
+            'record': 'match',
+            'run_id': self.run_id,
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'match_id': result['match_id'],
+            'outcome': 'success' if result['success'] else 'failed',
+            'error': result.get('error'),
+            'event_count': result.get('event_count'),
+            'retries': result.get('retries', 0),
+            'duration_s': round(result.get('duration', sum(stages.values())), 6),
+            'stages_s': stages,
+            'payload_bytes': payload,
+            'payload_bytes_total': sum(payload.values()),
+        }
+        with self._lock:
+            self._matches += 1
+            self._succeeded += int(result['success'])
+            self._retries += record['retries']
+            self._payload_bytes += record['payload_bytes_total']
+            for stage, seconds in stages.items():
+                self._stages[stage] += seconds
+        self._write(record)
+
+    def record_stage(self, stage: str, seconds: float):
+        """Add time for a run-level stage that isn't attributable to one match (e.g. db_write)"""
+        with self._lock:
+            self._stages[stage] += seconds
+
+    def write_summary(self, **extra):
+        """Write the run summary record"""
+        with self._lock:
+            record = {
+                'record': 'summary',
+                'run_id': self.run_id,
+                'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+                'matches': self._matches,
+                'succeeded': self._succeeded,
+                'failed': self._matches - self._succeeded,
+                'retries': self._retries,
+                'wall_s': round(time.time() - self._started, 3),
+                'stages_s': {stage: round(seconds, 3) for stage, seconds in self._stages.items()},
+                'payload_bytes_total': self._payload_bytes,
+            }
+        record.update(extra)
+        self._write(record)
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read every record from a telemetry file, skipping torn/partial lines"""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    stats['max'] = max(values) if values else 0.0
+    stats['mean'] = sum(values) / len(values) if values else 0.0
+    stats['count'] = len(values)
+    return stats
+
+
+def build_report(records: Iterable[Dict[str, Any]], top: int = 10, run_id: str = None) -> Dict[str, Any]:
+    """Aggregate match records into percentiles and slowest matches/plots"""
+    matches = [r for r in records if r.get('record') == 'match' and (run_id is None or r.get('run_id') == run_id)]
+    succeeded = [r for r in matches if r['outcome'] == 'success']
+
+    stage_values = defaultdict(list)
+    payload_values = defaultdict(list)
+    plot_samples = []
+    for r in succeeded:
+        for stage, seconds in r.get('stages_s', {}).items():
+            stage_values[stage].append(seconds)
+            if stage.startswith('plot:'):
+                plot_samples.append({'match_id': r['match_id'], 'plot': stage[5:], 'seconds': seconds})
+        for plot_type, size in r.get('payload_bytes', {}).items():
+            payload_values[plot_type].append(size)
+
+    return {
+        'runs': sorted({r.get('run_id') for r in matches if r.get('run_id')}),
+        'matches': len(matches),
+        'failed': len(matches) - len(succeeded),
+        'retries': sum(r.get('retries', 0) for r in matches),
+        'duration_s': _distribution([r['duration_s'] for r in succeeded]),
+        'event_count': _distribution([r['event_count'] for r in succeeded if r.get('event_count') is not None]),
+        'payload_bytes_total': _distribution([r['payload_bytes_total'] for r in succeeded]),
+        'stages_s': {stage: _distribution(values) for stage, values in sorted(stage_values.items())},
+        'largest_payloads': sorted(
+            ({'plot_type': plot_type, **_distribution(values)} for plot_type, values in payload_values.items()),
+            key=lambda item: -item['mean'])[:top],
+        'slowest_matches': [
+            {'match_id': r['match_id'], 'duration_s': r['duration_s'], 'event_count': r.get('event_count'),
+             'retries': r.get('retries', 0),
+             'slowest_stage': max(r['stages_s'].items(), key=lambda item: item[1])[0] if r.get('stages_s') else None}
+            for r in sorted(succeeded, key=lambda r: -r['duration_s'])[:top]
+        ],
+        'slowest_plots': sorted(plot_samples, key=lambda item: -item['seconds'])[:top],
+        'failures': [{'match_id': r['match_id'], 'error': r.get('error'), 'retries': r.get('retries', 0)}
+                     for r in matches if r['outcome'] != 'success'][:top],
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human readable rendering of ``build_report`` output"""
+    lines = [
+        f"📊 {report['matches']} matches ({report['failed']} failed, {report['retries']} retries) "
+        f"across {len(report['runs'])} run(s)",
+        "",
+        f"{'':<24}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+    ]
+
+    def row(label, stats, scale=1.0, unit=''):
+        values = ''.join(f"{stats[key] * scale:>10.1f}" for key in ('p50', 'p90', 'p95', 'p99', 'max'))
+        lines.append(f"{label + unit:<24}{values}")
+
+    row('match duration', report['duration_s'], 1000, ' (ms)')
+    row('events', report['event_count'])
+    row('payload', report['payload_bytes_total'], 1 / 1024, ' (KB)')
+    for stage, stats in report['stages_s'].items():
+        row(stage, stats, 1000, ' (ms)')
+
+    lines += ["", "🐢 Slowest matches:"]
+    for item in report['slowest_matches']:
+        lines.append(f"   {item['match_id']:<12} {item['duration_s'] * 1000:9.1f}ms  {item['event_count']} events  "
+                     f"slowest stage: {item['slowest_stage']}  retries: {item['retries']}")
+    lines += ["", "🐢 Slowest plots:"]
+    for item in report['slowest_plots']:
+        lines.append(f"   {item['match_id']:<12} {item['plot']:<20} {item['seconds'] * 1000:9.1f}ms")
+    lines += ["", "📦 Largest payloads (mean per match):"]
+    for item in report['largest_payloads']:
+        lines.append(f"   {item['plot_type']:<32} {item['mean'] / 1024:9.1f}KB  (max {item['max'] / 1024:.1f}KB)")
+    if report['failures']:
+        lines += ["", "❌ Failures:"]
+        for item in report['failures']:
+            lines.append(f"   {item['match_id']:<12} retries={item['retries']}  {item['error']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report on ETL telemetry JSON-lines files")
+    parser.add_argument('paths', nargs='*', help="Telemetry .jsonl file(s) (default: the ETL's telemetry file)")
+    parser.add_argument('--top', type=int, default=10, help="How many slowest matches/plots to list")
+    parser.add_argument('--run', help="Only include records from this run id")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    records = []
+    for path in args.paths or [default_path()]:
+        records.extend(load_records(path))
+    report = build_report(records, top=args.top, run_id=args.run)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Export each season's events as memory-mappable numpy columns.
+
+Writes ``<EVENT_COLUMNS_DIR>/<season_id>/`` with one ``.npy`` per column of
+``utils.event_columns.COLUMN_DTYPES``, the per-match ``offsets.npy`` /
+``match_ids.npy`` index and ``meta.json`` (the type, team and player
+vocabularies). Codes are the global ones from ``utils.event_codes``, so they
+agree across seasons and with the ETL's encoded frames; the exporter stores
+codes for values it sees first. Matches are ordered by date then id and events by their
+StatsBomb index. The directory is built next to the old one and swapped in
+with a rename, so readers never see a half-written season.
+
+Usage:
+    python -m data.etl.event_columns --season 9-42
+    python -m data.etl.event_columns --all --workers 8
+    python -m data.etl.event_columns --all --open-data /data/open-data/data
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from utils.event_codes import codebook
+from utils.event_columns import COLUMN_DTYPES, columns_root, season_path
+
+logger = logging.getLogger("event_columns")
+
+
+def _points(events: pd.DataFrame, column: str) -> np.ndarray:
+    """(n, 2) float32 array of the first two coordinates of a list column; NaN where missing"""
+    points = np.full((len(events), 2), np.nan, dtype=np.float32)
+    if column in events.columns:
+        for i, value in enumerate(events[column].to_numpy()):
+            if isinstance(value, (list, tuple)) and len(value) >= 2:
+                points[i] = value[:2]
+    return points
+
+
+def match_columns(events: pd.DataFrame, player_names: Dict[int, str]) -> Dict[str, np.ndarray]:
+    """
+    Typed columns for one match's raw events (NaN for missing values, as returned by sb.events)
+
+    Values without a global code yet encode as ``UNKNOWN``; ``export_season``
+    stores their codes and encodes the match again.
+    """
+    if 'index' in events.columns:
+        events = events.sort_values('index')
+    start = _points(events, 'location')
+    end = _points(events, 'pass_end_location')
+    for column in ('carry_end_location', 'shot_end_location'):
+        fill = np.isnan(end[:, 0])
+        end[fill] = _points(events, column)[fill]
+
+    player_ids = events['player_id'] if 'player_id' in events.columns else pd.Series(np.nan, index=events.index)
+    xg = events['shot_statsbomb_xg'] if 'shot_statsbomb_xg' in events.columns else pd.Series(np.nan, index=events.index)
+    named = events.loc[player_ids.notna(), ['player_id', 'player']].drop_duplicates('player_id')
+    for player_id, name in named.itertuples(index=False):
+        player_names.setdefault(int(player_id), name)
+
+    columns = {
+        'x': start[:, 0],
+        'y': start[:, 1],
+        'end_x': end[:, 0],
+        'end_y': end[:, 1],
+        'type': codebook.encode('type', events['type']),
+        'team': codebook.encode('team', events['team']),
+        'player': codebook.encode('player', player_ids),
+        'period': events['period'].to_numpy(),
+        'minute': events['minute'].to_numpy(),
+        'xg': pd.to_numeric(xg, errors='coerce').to_numpy(),
+    }
+    return {name: np.asarray(values).astype(COLUMN_DTYPES[name]) for name, values in columns.items()}
+
+
+def _season_matches(season_id: str) -> List[int]:
+    from utils.db import db
+    from models import Match
+
+    rows = (db.session.query(Match.id).filter(Match.season_id == season_id)
+            .order_by(Match.match_date, Match.id).all())
+    return [match_id for match_id, in rows]
+
+
+def _write_atomically(path: str, columns: Dict[str, np.ndarray], match_ids: List[int], offsets: np.ndarray,
+                      meta: Dict):
+    staging = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, values in columns.items():
+        np.save(os.path.join(staging, f'{name}.npy'), values)
+    np.save(os.path.join(staging, 'match_ids.npy'), np.asarray(match_ids, dtype=np.int64))
+    np.save(os.path.join(staging, 'offsets.npy'), offsets)
+    with open(os.path.join(staging, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    # Open memory maps of the old files stay valid after the swap
+    retired = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, retired)
+    os.rename(staging, path)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def export_season(season_id: str, events_fetcher: Callable[[int], pd.DataFrame] = None, root: str = None,
+                  max_workers: int = 4, match_ids: List[int] = None) -> Dict:
+    """Fetch every match of a season and write its column directory; returns the meta dict (needs an app context)"""
+    from utils.db import db
+
+    if events_fetcher is None:
+        from data.etl.create_match_plots_optimized import fetch_statsbomb_events
+        events_fetcher = fetch_statsbomb_events
+    match_ids = match_ids if match_ids is not None else _season_matches(season_id)
+    start = time.perf_counter()
+
+    def fetch(match_id):
+        try:
+            return match_id, events_fetcher(match_id)
+        except Exception as e:
+            logger.error(f"❌ Skipping match {match_id}: {e}")
+            return match_id, None
+
+    codebook.load()
+    player_names = {}
+    parts, exported = [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map keeps the season order, so offsets are deterministic
+        for match_id, events in executor.map(fetch, match_ids):
+            if events is None or events.empty:
+                continue
+            columns = match_columns(events, player_names)
+            unseen = codebook.take_unseen()
+            if unseen:
+                codebook.persist(unseen)
+                db.session.commit()
+                columns = match_columns(events, player_names)
+            parts.append(columns)
+            exported.append(match_id)
+
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(part['x']) for part in parts])
+    columns = {
+        name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0, dtype=dtype)
+        for name, dtype in COLUMN_DTYPES.items()
+    }
+    players = [None if player_id is None else int(player_id) for player_id in codebook.values('player')]
+    meta = {
+        'season_id': season_id,
+        'events': int(offsets[-1]),
+        'matches': len(exported),
+        'columns': {name: np.dtype(dtype).str for name, dtype in COLUMN_DTYPES.items()},
+        'vocab': {
+            'type': codebook.values('type'),
+            'team': codebook.values('team'),
+            'player': players,
+        },
+        'player_names': [player_names.get(player_id) for player_id in players],
+        'exported_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    _write_atomically(season_path(season_id, root), columns, exported, offsets, meta)
+    logger.info(f"✅ Season {season_id}: {meta['events']} events from {meta['matches']} matches "
+                f"in {time.perf_counter() - start:.1f}s")
+    return meta
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export per-season memory-mappable event columns")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--season', action='append', help="Season id (e.g. 9-42); repeatable")
+    target.add_argument('--all', action='store_true', help="Every season in the database")
+    parser.add_argument('--root', default=None, help=f"Output directory (default {columns_root()})")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent event fetches")
+    parser.add_argument('--open-data', default=None,
+                        help="Read events from a local open-data checkout (default $STATSBOMB_OPEN_DATA_DIR)")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from models import Season
+    from data.etl.open_data_mirror import OpenDataMirror, open_data_dir
+
+    open_data = args.open_data or open_data_dir()
+    events_fetcher = OpenDataMirror(open_data).events if open_data else None
+
+    with create_app().app_context():
+        seasons = args.season or [season.id for season in Season.query.order_by(Season.id).all()]
+        for season_id in seasons:
+            export_season(season_id, events_fetcher, root=args.root, max_workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
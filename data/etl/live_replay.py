@@ -0,0 +1,168 @@
+"""
+Replay a finished match through the live plot engine.
+
+``LocalFeed`` stands in for a live provider: it hands out a stored match's raw
+events in feed order (by ``index``), a batch at a time, from a local
+open-data checkout or a synthetic match. Each batch is flattened like
+``sb.events`` and folded into a ``LiveMatchEngine``, which emits only the
+plots that changed. ``--verify`` checks the final plots against the batch
+build of the same events, so the engine can be tested without a live match.
+
+Usage:
+    python -m data.etl.live_replay --synthetic 7 --batch-size 25 --verify
+    python -m data.etl.live_replay --match-id 3895302 --open-data /data/open-data/data --verify
+"""
+import argparse
+import bisect
+import logging
+import math
+import statistics
+import sys
+import time
+import warnings
+from typing import Any, Dict, Iterator, List
+
+import orjson
+import pandas as pd
+
+from data.etl.open_data_mirror import OpenDataMirror, flatten_events, open_data_dir
+from utils.event_codes import encode_events
+from utils.plots.live_match import LIVE_PLOT_TYPES, LiveMatchEngine
+from utils.plots.plot_factory import MatchDataProcessor, generate_all_plots_sync
+
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("live_replay")
+
+
+class LocalFeed:
+    """Serves a stored match's raw events in feed order, ``batch_size`` at a time"""
+
+    def __init__(self, events: List[Dict[str, Any]], match_id: int, batch_size: int = 50, interval: float = 0.0):
+        self.events = sorted(events, key=lambda event: event['index'])
+        self.match_id = match_id
+        self.batch_size = batch_size
+        self.interval = interval  # seconds between batches, to pace a replay like a live match
+        self.position = 0
+
+    @classmethod
+    def from_open_data(cls, root: str, match_id: int, **kwargs) -> 'LocalFeed':
+        with open(f"{OpenDataMirror(root).root}/events/{match_id}.json", 'rb') as f:
+            return cls(orjson.loads(f.read()), match_id, **kwargs)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """The next batch of raw events; empty once the match is over"""
+        batch = self.events[self.position:self.position + self.batch_size]
+        self.position += len(batch)
+        return batch
+
+    def frames(self) -> Iterator[pd.DataFrame]:
+        """Batches flattened like ``sb.events``, kept in feed order"""
+        while True:
+            batch = self.poll()
+            if not batch:
+                return
+            yield flatten_events(batch, self.match_id).sort_values('index', kind='stable').reset_index(drop=True)
+            if self.interval:
+                time.sleep(self.interval)
+
+
+def replay(feed: LocalFeed, engine: LiveMatchEngine = None) -> Dict[str, Any]:
+    """Feed every batch to ``engine``; returns it with per-batch timings and emitted plot counts"""
+    engine = engine or LiveMatchEngine()
+    durations, emitted = [], []
+    for frame in feed.frames():
+        start = time.perf_counter()
+        changed = engine.update(frame)
+        durations.append(time.perf_counter() - start)
+        emitted.append(len(changed))
+    return {'engine': engine, 'batches': len(durations), 'events': engine.events,
+            'durations': durations, 'emitted': emitted}
+
+
+def _same(a, b, path: str = '') -> List[str]:
+    """Paths where two figures differ (floats to 1e-9)"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a.keys() != b.keys():
+            return [f"{path}: keys {sorted(a.keys() ^ b.keys())}"]
+        return [diff for key in a for diff in _same(a[key], b[key], f"{path}.{key}")]
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return [f"{path}: length {len(a)} != {len(b)}"]
+        return [diff for i, (x, y) in enumerate(zip(a, b)) for diff in _same(x, y, f"{path}[{i}]")]
+    if isinstance(a, float) or isinstance(b, float):
+        if a is None or b is None or not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12):
+            return [f"{path}: {a!r} != {b!r}"]
+        return []
+    return [] if a == b else [f"{path}: {a!r} != {b!r}"]
+
+
+def _step_values(trace: Dict[str, Any]) -> Dict[int, float]:
+    """A step trace's value at the end of each minute"""
+    return {minute: trace['y'][bisect.bisect_right(trace['x'], minute) - 1] for minute in set(trace['x'])}
+
+
+def verify(engine: LiveMatchEngine, events: pd.DataFrame) -> List[str]:
+    """Differences between the engine's plots and the batch build of ``events`` (the full ``sb.events`` frame)"""
+    expected = generate_all_plots_sync(MatchDataProcessor(encode_events(pd.DataFrame(events.fillna(-999)))))
+    actual = engine.plots()
+    differences = [f"{plot_type}: missing" for plot_type in LIVE_PLOT_TYPES if plot_type not in actual]
+    for plot_type, figure in actual.items():
+        if plot_type == 'xg_graph':
+            # Rows of one minute may sit in another order in the batch frame; the drawn steps are the same
+            differences += _same(figure['layout'], expected[plot_type]['layout'], f"{plot_type}.layout")
+            for i, (trace, expected_trace) in enumerate(zip(figure['data'][:4], expected[plot_type]['data'][:4])):
+                differences += _same(_step_values(trace), _step_values(expected_trace), f"{plot_type}.data[{i}]")
+        else:
+            differences += _same(figure, expected[plot_type], plot_type)
+    return differences
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a stored match through the live plot engine")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--match-id', type=int, help="Match to replay from the open-data checkout")
+    source.add_argument('--synthetic', type=int, metavar='SEED', help="Replay a seeded synthetic match")
+    parser.add_argument('--open-data', default=None,
+                        help="Open-data checkout (default $STATSBOMB_OPEN_DATA_DIR)")
+    parser.add_argument('--batch-size', type=int, default=50, help="Events per feed batch")
+    parser.add_argument('--interval', type=float, default=0.0, help="Seconds between batches")
+    parser.add_argument('--verify', action='store_true', help="Compare the final plots with the batch build")
+    args = parser.parse_args(argv)
+
+    if args.synthetic is not None:
+        from utils.synthetic_statsbomb import generate_match_events, raw_events
+
+        frame = generate_match_events(seed=args.synthetic)
+        feed = LocalFeed(raw_events(frame), int(frame['match_id'].iloc[0]), args.batch_size, args.interval)
+    else:
+        feed = LocalFeed.from_open_data(args.open_data or open_data_dir(), args.match_id,
+                                        batch_size=args.batch_size, interval=args.interval)
+
+    logger.info(f"▶️  Replaying match {feed.match_id}: {len(feed.events)} events in batches of {args.batch_size}")
+    result = replay(feed)
+    durations = [seconds * 1000 for seconds in result['durations']]
+    logger.info(f"⏱️  {result['batches']} batches: median {statistics.median(durations):.2f}ms, "
+                f"max {max(durations):.2f}ms, total {sum(durations):.0f}ms per match")
+    logger.info(f"📤 {sum(result['emitted'])} plot updates emitted "
+                f"({statistics.mean(result['emitted']):.1f} per batch of {len(LIVE_PLOT_TYPES)} maintained)")
+
+    if args.verify:
+        events = flatten_events(feed.events, feed.match_id)
+        start = time.perf_counter()
+        differences = verify(result['engine'], events)
+        logger.info(f"🔁 Batch rebuild of the full match: {(time.perf_counter() - start) * 1000:.0f}ms")
+        if differences:
+            logger.error(f"❌ {len(differences)} difference(s) from the batch build:")
+            for difference in differences[:20]:
+                logger.error(f"   {difference}")
+            return 1
+        logger.info("✅ Final plots match the batch build")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Read competitions, matches, lineups and events from a local open-data checkout.
+
+Point it at the ``data`` directory of a clone of
+https://github.com/statsbomb/open-data (or set ``STATSBOMB_OPEN_DATA_DIR``)
+and the ETL runs without network access. Files are decoded with ``orjson``
+and events are flattened straight into columns, skipping statsbombpy's
+per-event-type DataFrames and concat, while giving the same frame as
+``sb.events`` (same rows, order, columns and dtypes).
+
+Usage:
+    mirror = OpenDataMirror('/data/open-data/data')
+    events = mirror.events(3895302)
+    for match_id, events in mirror.iter_events(match_ids, max_workers=8):
+        ...
+
+    STATSBOMB_OPEN_DATA_DIR=/data/open-data/data python data/etl/create_match_plots_optimized.py
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+
+# Attributes whose {'id', 'name'} object also yields an ``<attribute>_id`` column (as in statsbombpy)
+_ID_ATTRIBUTES = {'possession_team', 'player', 'team', 'pass_recipient', 'substitution_outcome',
+                  'substitution_replacement'}
+
+
+def open_data_dir() -> str:
+    """Mirror root from ``STATSBOMB_OPEN_DATA_DIR``, or None to use the live API"""
+    return os.environ.get('STATSBOMB_OPEN_DATA_DIR') or None
+
+
+def _type_key(type_name: str) -> str:
+    return 'goalkeeper' if type_name == 'Goal Keeper' else type_name.lower().replace(' ', '_').replace('*', '')
+
+
+def flatten_events(events: List[Dict[str, Any]], match_id: int) -> pd.DataFrame:
+    """
+    Raw event JSON to the ``sb.events`` frame, built column by column
+
+    Follows ``statsbombpy.helpers.flatten_event``: the event type's attributes
+    are lifted to ``<type>_<attribute>``, ``{'id', 'name'}`` objects become the
+    name (plus ``<key>_id`` for a few keys), rows are grouped by event type in
+    order of first appearance and the columns are sorted.
+    """
+    if not events:
+        return pd.DataFrame()
+    groups: Dict[str, List[int]] = {}
+    for i, event in enumerate(events):
+        groups.setdefault(event['type']['name'], []).append(i)
+
+    n = len(events)
+    columns: Dict[str, list] = {'match_id': [match_id] * n}
+
+    def put(key, value, row):
+        if type(value) is dict and 'name' in value:
+            if key in _ID_ATTRIBUTES:
+                put(f'{key}_id', value['id'], row)
+            value = value['name']
+        column = columns.get(key)
+        if column is None:
+            column = columns[key] = [np.nan] * n
+        column[row] = value
+
+    row = 0
+    for type_name, indices in groups.items():
+        type_key = _type_key(type_name)
+        for i in indices:
+            for key, value in events[i].items():
+                if key == type_key and type(value) is dict:
+                    for attribute, attribute_value in value.items():
+                        put(f'{type_key}_{attribute}', attribute_value, row)
+                else:
+                    put(key, value, row)
+            row += 1
+    # Same per-column dtype inference as building the frame from records
+    return pd.DataFrame({key: columns[key] for key in sorted(columns)})
+
+
+class OpenDataMirror:
+    """Source adapter over a local open-data ``data`` directory (same layout as the GitHub raw URLs)"""
+
+    def __init__(self, root: str = None):
+        self.root = root or open_data_dir()
+        if not self.root or not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Open-data directory not found: {self.root}")
+
+    def _load(self, *parts: str) -> Any:
+        with open(os.path.join(self.root, *parts), 'rb') as f:
+            return orjson.loads(f.read())
+
+    def competitions(self) -> pd.DataFrame:
+        """One row per competition season, as ``sb.competitions``"""
+        return pd.DataFrame(self._load('competitions.json'))
+
+    def matches(self, competition_id: int, season_id: int) -> pd.DataFrame:
+        """
+        Matches of a competition season
+
+        Has the ``sb.matches`` columns the loaders use (match_id, match_date,
+        kick_off, competition, season, home/away team and score, match_status,
+        match_week, competition_stage) rather than every nested field.
+        """
+        rows = []
+        for match in self._load('matches', str(competition_id), f'{season_id}.json'):
+            competition = match.get('competition', {})
+            rows.append({
+                'match_id': match['match_id'],
+                'match_date': match.get('match_date'),
+                'kick_off': match.get('kick_off'),
+                'competition': f"{competition.get('country_name')} - {competition.get('competition_name')}",
+                'season': match.get('season', {}).get('season_name'),
+                'home_team': match['home_team']['home_team_name'],
+                'away_team': match['away_team']['away_team_name'],
+                'home_team_id': match['home_team']['home_team_id'],
+                'away_team_id': match['away_team']['away_team_id'],
+                'home_score': match.get('home_score'),
+                'away_score': match.get('away_score'),
+                'match_status': match.get('match_status'),
+                'match_week': match.get('match_week'),
+                'competition_stage': (match.get('competition_stage') or {}).get('name'),
+            })
+        return pd.DataFrame(rows)
+
+    def lineups(self, match_id: int) -> Dict[str, pd.DataFrame]:
+        """Team name -> lineup frame, as ``sb.lineups``"""
+        lineups = {}
+        for lineup in self._load('lineups', f'{match_id}.json'):
+            frame = pd.DataFrame(lineup['lineup'])
+            if 'country' in frame.columns:
+                frame['country'] = frame['country'].apply(lambda c: c['name'] if isinstance(c, dict) else 'Unknown')
+            lineups[lineup['team_name']] = frame
+        return lineups
+
+    def events(self, match_id: int) -> pd.DataFrame:
+        """Events of one match, identical to ``sb.events(match_id)``"""
+        return flatten_events(self._load('events', f'{match_id}.json'), match_id)
+
+    def iter_events(self, match_ids: Iterable[int], max_workers: int = 4) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """(match_id, events) in ``match_ids`` order, decoded and flattened in worker processes"""
+        match_ids = list(match_ids)
+        if max_workers <= 1:
+            for match_id in match_ids:
+                yield match_id, self.events(match_id)
+            return
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            yield from zip(match_ids, executor.map(self.events, match_ids, chunksize=4))
@@ -0,0 +1,115 @@
+"""
+Incremental per-(season, team) aggregates.
+
+The ETL stores each match's per-team totals in ``match_team_stats`` and adds
+them to the running ``season_team_stats`` row. Reprocessing a match first
+subtracts its previous totals, so the aggregate stays exact without ever
+rescanning a season. ``--rebuild`` recomputes the aggregates from the
+per-match rows (e.g. after editing them by hand).
+
+Usage:
+    python -m data.etl.season_aggregates --rebuild
+    python -m data.etl.season_aggregates --rebuild --season 9-42
+"""
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List
+
+from utils.db import db
+from models import Match, MatchTeamStats, SeasonTeamStats, TEAM_TOTAL_FIELDS
+
+logger = logging.getLogger("season_aggregates")
+
+
+def _empty_aggregate(season_id: str, team: str) -> SeasonTeamStats:
+    aggregate = SeasonTeamStats(season_id=season_id, team=team, **{field: 0 for field in TEAM_TOTAL_FIELDS})
+    db.session.add(aggregate)
+    return aggregate
+
+
+def _apply(aggregate: SeasonTeamStats, totals: Dict[str, Any], sign: int):
+    for field in TEAM_TOTAL_FIELDS:
+        setattr(aggregate, field, getattr(aggregate, field) + sign * totals[field])
+
+
+def apply_match_totals(match_id: int, season_id: str, team_totals: List[Dict[str, Any]]):
+    """Replace a match's per-team rows and move the season aggregates by the difference (no commit)"""
+    previous = {row.team: row for row in MatchTeamStats.query.filter_by(match_id=match_id).all()}
+
+    for totals in team_totals:
+        team = totals['team']
+        aggregate = db.session.get(SeasonTeamStats, (season_id, team)) or _empty_aggregate(season_id, team)
+        row = previous.pop(team, None)
+        if row is None:
+            row = MatchTeamStats(match_id=match_id, team=team)
+            db.session.add(row)
+        else:
+            _apply(aggregate, row.totals(), -1)
+        row.opponent = totals['opponent']
+        for field in TEAM_TOTAL_FIELDS:
+            setattr(row, field, totals[field])
+        _apply(aggregate, totals, 1)
+
+    # A team no longer present in the match's events (e.g. a renamed side)
+    for row in previous.values():
+        aggregate = db.session.get(SeasonTeamStats, (season_id, row.team))
+        if aggregate is not None:
+            _apply(aggregate, row.totals(), -1)
+        db.session.delete(row)
+
+    # Later matches in the same batch must see these rows
+    db.session.flush()
+
+
+def replace_match_totals(match_id: int, team_totals: List[Dict[str, Any]]):
+    """Replace a match's per-team rows only (no commit); the aggregates are rebuilt afterwards"""
+    MatchTeamStats.query.filter_by(match_id=match_id).delete(synchronize_session=False)
+    for totals in team_totals:
+        db.session.add(MatchTeamStats(match_id=match_id, team=totals['team'], opponent=totals['opponent'],
+                                      **{field: totals[field] for field in TEAM_TOTAL_FIELDS}))
+    db.session.flush()
+
+
+def rebuild_season_aggregates(season_id: str = None) -> int:
+    """Recompute season aggregates from the per-match rows; returns the number of aggregate rows"""
+    sums = [db.func.sum(getattr(MatchTeamStats, field)).label(field) for field in TEAM_TOTAL_FIELDS]
+    query = (
+        db.session.query(Match.season_id, MatchTeamStats.team, *sums)
+        .join(Match, Match.id == MatchTeamStats.match_id)
+        .group_by(Match.season_id, MatchTeamStats.team)
+    )
+    stale = SeasonTeamStats.query
+    if season_id is not None:
+        query = query.filter(Match.season_id == season_id)
+        stale = stale.filter_by(season_id=season_id)
+
+    rows = query.all()
+    stale.delete(synchronize_session=False)
+    for row in rows:
+        db.session.add(SeasonTeamStats(season_id=row.season_id, team=row.team,
+                                       **{field: getattr(row, field) for field in TEAM_TOTAL_FIELDS}))
+    db.session.commit()
+    return len(rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the per-(season, team) aggregate table")
+    parser.add_argument('--rebuild', action='store_true', help="Recompute aggregates from match_team_stats")
+    parser.add_argument('--season', help="Only this season id (e.g. 9-42)")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    from app import create_app
+
+    with create_app().app_context():
+        db.create_all()
+        count = rebuild_season_aggregates(args.season)
+    logger.info(f"✅ Rebuilt {count} season/team aggregate rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Deterministic match sharding for running the ETL on several machines.
+
+``--shard i/N`` (0 <= i < N) gives each node the matches whose stable hash
+(blake2b of the id, not Python's salted ``hash``) falls in its bucket, so the
+split is the same on every machine and every run. Every node writes only its
+own matches' rows, each match's writes replace the previous ones, and an
+``etl_match_runs`` row records each match's outcome under the shared
+``--run-id``. The cross-match season aggregates and form series are skipped
+by the shards. They are rebuilt once by the merge step, after it has checked that every
+match succeeded in the run.
+
+Usage:
+    python -m data.etl.create_match_plots_optimized --shard 0/4 --run-id rebuild-2024-06-01   # on each node
+    python -m data.etl.sharding --run-id rebuild-2024-06-01 --shards 4 --verify
+    python -m data.etl.sharding --run-id rebuild-2024-06-01 --shards 4 --merge
+"""
+import argparse
+import hashlib
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger("sharding")
+
+Shard = Tuple[int, int]
+
+
+def parse_shard(value: str) -> Shard:
+    """``"i/N"`` -> ``(i, N)``; raises ValueError unless 0 <= i < N"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {value!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard index must be in [0, {count}), got {value!r}")
+    return index, count
+
+
+def format_shard(shard: Shard) -> str:
+    return f"{shard[0]}/{shard[1]}"
+
+
+def shard_of(match_id: int, count: int) -> int:
+    """Bucket of a match among ``count`` shards; identical in every process and on every machine"""
+    digest = hashlib.blake2b(str(int(match_id)).encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count
+
+
+def shard_matches(matches: Iterable[Any], shard: Shard) -> List[Any]:
+    """The matches (anything with an ``id``) that belong to ``shard``, in their original order"""
+    index, count = shard
+    return [match for match in matches if shard_of(match.id, count) == index]
+
+
+def coverage(run_id: str, count: int) -> Dict[str, Any]:
+    """Which matches ``run_id`` processed successfully, per shard (needs an app context)"""
+    from utils.db import db
+    from models import EtlMatchRun, Match, MatchPlot
+
+    match_ids = [match_id for match_id, in db.session.query(Match.id).order_by(Match.id)]
+    outcomes = dict(db.session.query(EtlMatchRun.match_id, EtlMatchRun.succeeded).filter_by(run_id=run_id))
+    # Shard counts the nodes actually ran with; unsharded runs (no suffix) fit any split
+    shard_counts = sorted({parse_shard(shard)[1] for shard, in
+                           db.session.query(EtlMatchRun.shard).filter_by(run_id=run_id).distinct() if shard})
+    duplicate_plots = (db.session.query(MatchPlot.match_id, MatchPlot.plot_type)
+                       .group_by(MatchPlot.match_id, MatchPlot.plot_type)
+                       .having(db.func.count(MatchPlot.id) > 1).count())
+
+    shards = [{'shard': format_shard((index, count)), 'matches': 0, 'succeeded': 0, 'failed': [], 'missing': []}
+              for index in range(count)]
+    for match_id in match_ids:
+        entry = shards[shard_of(match_id, count)]
+        entry['matches'] += 1
+        outcome = outcomes.get(match_id)
+        if outcome:
+            entry['succeeded'] += 1
+        elif outcome is None:
+            entry['missing'].append(match_id)
+        else:
+            entry['failed'].append(match_id)
+
+    succeeded = sum(entry['succeeded'] for entry in shards)
+    shard_mismatch = any(recorded != count for recorded in shard_counts)
+    return {
+        'run_id': run_id,
+        'matches': len(match_ids),
+        'succeeded': succeeded,
+        'complete': succeeded == len(match_ids) and not shard_mismatch,
+        'shard_counts': shard_counts,
+        'shard_mismatch': shard_mismatch,
+        'duplicate_plots': duplicate_plots,
+        'shards': shards,
+    }
+
+
+def dedupe_plots() -> int:
+    """Keep only the newest row per (match, plot type); returns the number removed (no commit)"""
+    from utils.db import db
+    from models import MatchPlot
+
+    newest = (db.session.query(db.func.max(MatchPlot.id))
+              .group_by(MatchPlot.match_id, MatchPlot.plot_type))
+    return MatchPlot.query.filter(MatchPlot.id.notin_(newest)).delete(synchronize_session=False)
+
+
+def merge(run_id: str, count: int, force: bool = False) -> Dict[str, Any]:
+    """Verify coverage, then dedupe plots and rebuild the season aggregates and form series once"""
+    from utils.db import db
+    from data.etl.season_aggregates import rebuild_season_aggregates
+    from data.etl.team_form import rebuild_team_form
+
+    report = coverage(run_id, count)
+    if not report['complete'] and not force:
+        return report
+    report['duplicate_plots_removed'] = dedupe_plots()
+    db.session.commit()
+    report['season_rows'] = rebuild_season_aggregates()
+    report['form_rows'] = rebuild_team_form()
+    report['merged'] = True
+    return report
+
+
+def _log_report(report: Dict[str, Any]):
+    for entry in report['shards']:
+        status = '✅' if entry['succeeded'] == entry['matches'] else '❌'
+        logger.info(f"{status} Shard {entry['shard']}: {entry['succeeded']}/{entry['matches']} succeeded, "
+                    f"{len(entry['failed'])} failed, {len(entry['missing'])} missing")
+        for label in ('failed', 'missing'):
+            if entry[label]:
+                logger.info(f"   {label}: {', '.join(str(match_id) for match_id in entry[label][:20])}"
+                            f"{' …' if len(entry[label]) > 20 else ''}")
+    if report['shard_mismatch']:
+        logger.error(f"❌ Run {report['run_id']} was recorded with "
+                     f"{', '.join(f'{count} shards' for count in report['shard_counts'])}, "
+                     f"not the {len(report['shards'])} given with --shards")
+    if report['duplicate_plots']:
+        logger.warning(f"⚠️ {report['duplicate_plots']} (match, plot type) pairs have duplicate rows")
+    logger.info(f"📊 Run {report['run_id']}: {report['succeeded']}/{report['matches']} matches covered")
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Verify and merge a sharded ETL run")
+    parser.add_argument('--run-id', required=True, help="Run id the shards were started with")
+    parser.add_argument('--shards', type=int, required=True, help="Number of shards (N in --shard i/N)")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--verify', action='store_true', help="Report coverage per shard")
+    action.add_argument('--merge', action='store_true',
+                        help="Verify, then rebuild season aggregates and form series (refused if incomplete)")
+    parser.add_argument('--force', action='store_true', help="Merge even if some matches are not covered")
+    args = parser.parse_args(argv)
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+
+    from app import create_app
+    from utils.db import db
+
+    with create_app().app_context():
+        db.create_all()
+        report = merge(args.run_id, args.shards, args.force) if args.merge else coverage(args.run_id, args.shards)
+    _log_report(report)
+    if args.merge:
+        if not report.get('merged'):
+            logger.error("❌ Not merged: the run does not cover every match or its shard count differs "
+                         "(use --force to merge anyway)")
+            return 1
+        logger.info(f"🔗 Merged: {report['season_rows']} season aggregate rows, {report['form_rows']} form rows, "
+                    f"{report['duplicate_plots_removed']} duplicate plot rows removed")
+        return 0
+    return 0 if report['complete'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
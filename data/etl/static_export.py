@@ -0,0 +1,186 @@
+"""
+Export the site as static files for a read-only deployment without Flask or a database.
+
+Every API response the match and competition pages read is requested through
+the app's own routes and written under ``<out>/data/`` with a content-hashed
+name, next to gzip (and, with the optional ``brotli`` package, brotli)
+pre-compressed copies:
+
+- ``/api/competitions``
+- ``/api/matches/<season_id>`` and ``/api/competition-data/<season_id>`` per season
+- ``/api/plots/<match_id>`` per match with stored plots
+
+``data/manifest.json`` maps each API path to its file and is written last, so
+a server never sees a manifest pointing at missing files. Unchanged responses
+keep their names (and are not rewritten); ``--prune`` removes files the new
+manifest no longer references. The pages are rendered to ``index.html`` files
+in static mode and ``static/`` is copied alongside, so ``<out>`` can be served
+as it is by any static file server or CDN.
+
+Usage:
+    python -m data.etl.static_export --out dist
+    python -m data.etl.static_export --out dist --prune --workers 8
+"""
+import argparse
+import gzip
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from utils.fast_json import content_hash
+
+logger = logging.getLogger("static_export")
+
+DATA_DIR = 'data'
+MANIFEST = 'manifest.json'
+PAGES = {
+    '/match-analysis': 'match-analysis/index.html',
+    '/competition-analysis': 'competition-analysis/index.html',
+}
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def export_name(api_path: str, body: bytes) -> str:
+    """``/api/plots/123`` -> ``plots/123.<hash>.json``; the name changes whenever the body does"""
+    parts = api_path.strip('/').split('/')[1:]  # drop the leading "api"
+    return '/'.join(parts) + f".{content_hash(body)}.json"
+
+
+def _write_atomically(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = f"{path}.tmp-{os.getpid()}"
+    with open(staging, 'wb') as f:
+        f.write(data)
+    os.replace(staging, path)
+
+
+def write_response(data_root: str, name: str, body: bytes, brotli=None) -> bool:
+    """Write ``body`` and its pre-compressed copies; returns False when the hashed file already exists"""
+    path = os.path.join(data_root, name)
+    if os.path.exists(path):
+        return False
+    # mtime=0 keeps the gzip bytes identical between runs
+    _write_atomically(f"{path}.gz", gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomically(f"{path}.br", brotli.compress(body))
+    _write_atomically(path, body)  # written last: its presence means the set is complete
+    return True
+
+
+def api_paths(season_ids: Iterable[str], match_ids: Iterable[int]) -> List[str]:
+    paths = ['/api/competitions']
+    for season_id in season_ids:
+        paths += [f"/api/matches/{season_id}", f"/api/competition-data/{season_id}"]
+    paths += [f"/api/plots/{match_id}" for match_id in match_ids]
+    return paths
+
+
+def _fetch(app, api_path: str) -> Tuple[str, Optional[bytes]]:
+    with app.test_client() as client:
+        response = client.get(api_path)
+        if response.status_code != 200:
+            logger.warning(f"⚠️ Skipping {api_path}: HTTP {response.status_code}")
+            return api_path, None
+        return api_path, response.get_data()
+
+
+def _prune(data_root: str, keep: set) -> int:
+    """Remove exported responses (and their compressed copies) not referenced by ``keep``"""
+    removed = 0
+    for directory, _, files in os.walk(data_root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, data_root).replace(os.sep, '/')
+            base = name[:-3] if name.endswith(('.gz', '.br')) else name
+            if base != MANIFEST and base.endswith('.json') and base not in keep:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def export_pages(app, out: str, data_url: str):
+    """Render the pages in static mode and copy the static assets next to them"""
+    app.config['STATIC_DATA_ROOT'] = data_url
+    with app.test_client() as client:
+        for route, filename in PAGES.items():
+            html = client.get(route).get_data()
+            _write_atomically(os.path.join(out, filename), html)
+            if route == '/match-analysis':
+                _write_atomically(os.path.join(out, 'index.html'), html)
+    shutil.copytree(app.static_folder, os.path.join(out, 'static'), dirs_exist_ok=True)
+
+
+def export_site(app, out: str, max_workers: int = 4, prune: bool = False, data_url: str = None) -> Dict:
+    """Export every API response, the manifest and the pages under ``out``; returns the manifest"""
+    from models import MatchPlot, Season
+    from utils.db import db
+
+    start = time.perf_counter()
+    data_root = os.path.join(out, DATA_DIR)
+    data_url = data_url or f"/{DATA_DIR}"
+    brotli = _brotli()
+    if brotli is None:
+        logger.info("ℹ️  brotli not installed: writing gzip copies only")
+
+    with app.app_context():
+        season_ids = [season_id for season_id, in db.session.query(Season.id).order_by(Season.id)]
+        match_ids = [match_id for match_id, in
+                     db.session.query(MatchPlot.match_id).distinct().order_by(MatchPlot.match_id)]
+
+    files, written = {}, 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for api_path, body in executor.map(lambda path: _fetch(app, path), api_paths(season_ids, match_ids)):
+            if body is None:
+                continue
+            name = export_name(api_path, body)
+            written += write_response(data_root, name, body, brotli)
+            files[api_path] = name
+
+    manifest = {
+        'version': 1,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'compression': ['gzip'] + (['br'] if brotli is not None else []),
+        'files': files,
+    }
+    _write_atomically(os.path.join(data_root, MANIFEST), orjson.dumps(manifest, option=orjson.OPT_SORT_KEYS))
+    removed = _prune(data_root, set(files.values())) if prune else 0
+
+    export_pages(app, out, data_url)
+    logger.info(f"✅ Exported {len(files)} responses ({written} new, {len(files) - written} unchanged, "
+                f"{removed} pruned) to {data_root} in {time.perf_counter() - start:.1f}s")
+    return manifest
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Export the API responses and pages as static files")
+    parser.add_argument('--out', required=True, help="Output directory (the static site root)")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent response exports")
+    parser.add_argument('--prune', action='store_true', help="Delete exported files the new manifest does not use")
+    parser.add_argument('--data-url', default=None,
+                        help=f"URL the pages fetch the exported data from (default /{DATA_DIR})")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+
+    # Each response is requested once: caching them would only hold the whole export in memory
+    app = create_app({'CACHE_TYPE': 'NullCache'})
+    export_site(app, args.out, max_workers=args.workers, prune=args.prune, data_url=args.data_url)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
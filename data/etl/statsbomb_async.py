@@ -0,0 +1,116 @@
+"""
+Native asyncio client for the StatsBomb open-data JSON files.
+
+Replaces pushing the blocking ``sb.events`` call onto the default executor:
+one ``aiohttp`` session per client keeps a bounded pool of keep-alive
+connections, a semaphore caps the requests in flight and failed requests
+(connection errors, timeouts, 429 and 5xx) are retried with exponential
+backoff. The base URL is pluggable, so the ETL can run against a local
+HTTP stand-in serving the open-data layout, e.g.
+
+    python -m http.server 8000 --directory /path/to/open-data/data
+    STATSBOMB_BASE_URL=http://127.0.0.1:8000 ...
+
+``events_frame`` gives the same frame as ``sb.events`` (bodies are decoded
+with ``orjson`` and flattened by ``open_data_mirror.flatten_events``).
+
+Usage:
+    async with AsyncStatsBombClient(concurrency=8) as client:
+        events = await client.events_frame(3895302)
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List
+
+import orjson
+import pandas as pd
+
+from data.etl.open_data_mirror import flatten_events
+
+logger = logging.getLogger("statsbomb_async")
+
+DEFAULT_BASE_URL = 'https://raw.githubusercontent.com/statsbomb/open-data/master/data'
+# Responses worth retrying; anything else (e.g. 404 for a match without events) fails at once
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def base_url() -> str:
+    return os.environ.get('STATSBOMB_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+class AsyncStatsBombClient:
+    """
+    Pooled, retrying fetcher for competitions, matches, lineups and events
+
+    Must be entered (``async with``) inside the event loop that uses it.
+    """
+
+    def __init__(self, base: str = None, concurrency: int = 8, pool_size: int = None,
+                 max_retries: int = 2, retry_backoff: float = 1.0, timeout: float = 60.0,
+                 keepalive_timeout: float = 30.0):
+        self.base_url = (base or base_url()).rstrip('/')
+        self.concurrency = concurrency
+        self.pool_size = pool_size or concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.requests = self.retries = 0
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self) -> 'AsyncStatsBombClient':
+        import aiohttp  # only the ETL needs it
+
+        connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size,
+                                         keepalive_timeout=self.keepalive_timeout)
+        self._session = aiohttp.ClientSession(connector=connector,
+                                              timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    async def get_json(self, path: str, meta: Dict[str, Any] = None) -> Any:
+        """Decoded JSON at ``<base_url>/<path>``; the retry count is recorded in ``meta['retries']``"""
+        import aiohttp
+
+        url = f"{self.base_url}/{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    async with self._session.get(url) as response:
+                        response.raise_for_status()
+                        body = await response.read()
+                return orjson.loads(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retriable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+                if not retriable or attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                if meta is not None:
+                    meta['retries'] = attempt + 1
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"⚠️  Fetch failed for {path} ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def competitions(self) -> List[Dict[str, Any]]:
+        return await self.get_json('competitions.json')
+
+    async def matches(self, competition_id: int, season_id: int) -> List[Dict[str, Any]]:
+        return await self.get_json(f'matches/{competition_id}/{season_id}.json')
+
+    async def lineups(self, match_id: int) -> List[Dict[str, Any]]:
+        return await self.get_json(f'lineups/{match_id}.json')
+
+    async def events(self, match_id: int, meta: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        return await self.get_json(f'events/{match_id}.json', meta)
+
+    async def events_frame(self, match_id: int, meta: Dict[str, Any] = None) -> pd.DataFrame:
+        """Events as ``sb.events`` returns them; flattening runs off the event loop"""
+        events = await self.events(match_id, meta)
+        return await asyncio.get_running_loop().run_in_executor(None, flatten_events, events, match_id)
@@ -0,0 +1,155 @@
+"""
+Incremental per-team form series.
+
+Each processed match appends a ``team_form`` row per team holding running
+totals of ``FORM_FIELDS`` in chronological order (match date, then id). A
+k-match rolling window is ``cum[i] - cum[i - k]``, so serving 5/10-match form
+lines never touches events, and adding a match is O(1) when it is the latest
+one. A match processed out of order shifts only the rows after it with one
+UPDATE. ``--rebuild`` recomputes the series from ``match_team_stats``.
+The read side (per-match values, rolling windows) lives in
+``utils.analytics.team_analytics.team_aggregates``.
+
+Usage:
+    python -m data.etl.team_form --rebuild
+    python -m data.etl.team_form --rebuild --team "Bayer Leverkusen"
+"""
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List
+
+from utils.db import db
+from models import FORM_FIELDS, Match, MatchTeamStats, TeamFormPoint
+from utils.analytics.team_analytics.team_aggregates import cumulative_totals
+
+logger = logging.getLogger("team_form")
+
+
+def sort_key(match_date: str, match_id: int) -> str:
+    """Chronological order; undated matches sort first, ties broken by match id"""
+    return f"{match_date or '0000-00-00'}:{int(match_id):012d}"
+
+
+def _previous(point: TeamFormPoint) -> TeamFormPoint:
+    return (TeamFormPoint.query
+            .filter(TeamFormPoint.team == point.team, TeamFormPoint.sort_key < point.sort_key)
+            .order_by(TeamFormPoint.sort_key.desc())
+            .first())
+
+
+def _shift_after(team: str, key: str, delta: Dict[str, float], positions: int = 0):
+    """Add ``delta`` to the running totals (and ``positions`` to the position) of every later row"""
+    changes = {getattr(TeamFormPoint, f"cum_{field}"): getattr(TeamFormPoint, f"cum_{field}") + value
+               for field, value in delta.items() if value}
+    if positions:
+        changes[TeamFormPoint.position] = TeamFormPoint.position + positions
+    if changes:
+        (TeamFormPoint.query
+         .filter(TeamFormPoint.team == team, TeamFormPoint.sort_key > key)
+         .update(changes, synchronize_session='fetch'))
+
+
+def _remove(point: TeamFormPoint):
+    before = cumulative_totals(_previous(point))
+    own = cumulative_totals(point)
+    _shift_after(point.team, point.sort_key, {field: before[field] - own[field] for field in FORM_FIELDS}, -1)
+    db.session.delete(point)
+
+
+def apply_form_point(match_id: int, season_id: str, match_date: str, totals: Dict[str, Any]):
+    """Insert or replace one team's match in its form series (no commit)"""
+    team, key = totals['team'], sort_key(match_date, match_id)
+    values = {field: totals[field] for field in FORM_FIELDS}
+
+    point = db.session.get(TeamFormPoint, (team, match_id))
+    if point is not None and point.sort_key != key:
+        # The match date changed, so the match moves within the series
+        _remove(point)
+        db.session.flush()
+        point = None
+
+    if point is None:
+        previous = (TeamFormPoint.query
+                    .filter(TeamFormPoint.team == team, TeamFormPoint.sort_key < key)
+                    .order_by(TeamFormPoint.sort_key.desc())
+                    .first())
+        base = cumulative_totals(previous)
+        _shift_after(team, key, values, 1)
+        point = TeamFormPoint(team=team, match_id=match_id, sort_key=key,
+                              position=previous.position + 1 if previous is not None else 0)
+        db.session.add(point)
+    else:
+        base = cumulative_totals(_previous(point))
+        own = cumulative_totals(point)
+        _shift_after(team, key, {field: values[field] - (own[field] - base[field]) for field in FORM_FIELDS})
+
+    point.season_id = season_id
+    point.match_date = match_date
+    point.opponent = totals['opponent']
+    for field in FORM_FIELDS:
+        setattr(point, f"cum_{field}", base[field] + values[field])
+
+
+def apply_match_form(match_id: int, season_id: str, match_date: str, team_totals: List[Dict[str, Any]]):
+    """Add both teams of a match to their form series"""
+    teams = [totals['team'] for totals in team_totals]
+    # A team no longer present in the match's events (e.g. a renamed side)
+    for point in TeamFormPoint.query.filter(TeamFormPoint.match_id == match_id,
+                                            TeamFormPoint.team.notin_(teams)).all():
+        _remove(point)
+    for totals in team_totals:
+        apply_form_point(match_id, season_id, match_date, totals)
+    # Later matches in the same batch must see these rows
+    db.session.flush()
+
+
+def rebuild_team_form(team: str = None) -> int:
+    """Recompute the running totals from match_team_stats; returns the number of rows"""
+    query = (db.session.query(MatchTeamStats, Match.season_id, Match.match_date)
+             .join(Match, Match.id == MatchTeamStats.match_id))
+    stale = TeamFormPoint.query
+    if team is not None:
+        query = query.filter(MatchTeamStats.team == team)
+        stale = stale.filter_by(team=team)
+
+    by_team = {}
+    for stats, season_id, match_date in query.all():
+        by_team.setdefault(stats.team, []).append((sort_key(match_date, stats.match_id), stats, season_id, match_date))
+
+    stale.delete(synchronize_session=False)
+    count = 0
+    for team_name, rows in by_team.items():
+        running = {field: 0 for field in FORM_FIELDS}
+        for position, (key, stats, season_id, match_date) in enumerate(sorted(rows, key=lambda row: row[0])):
+            for field in FORM_FIELDS:
+                running[field] += getattr(stats, field)
+            db.session.add(TeamFormPoint(team=team_name, match_id=stats.match_id, season_id=season_id,
+                                         opponent=stats.opponent, match_date=match_date, sort_key=key,
+                                         position=position,
+                                         **{f"cum_{field}": value for field, value in running.items()}))
+            count += 1
+    db.session.commit()
+    return count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the per-team form series")
+    parser.add_argument('--rebuild', action='store_true', help="Recompute the series from match_team_stats")
+    parser.add_argument('--team', help="Only this team")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    from app import create_app
+
+    with create_app().app_context():
+        db.create_all()
+        count = rebuild_team_form(args.team)
+    logger.info(f"✅ Rebuilt {count} team form rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
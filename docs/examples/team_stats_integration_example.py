@@ -58,26 +58,17 @@ def generate_team_stats_table(match_data: pd.DataFrame, team_name: str) -> dict:
     }
 
 
-# Add this to utils/plots/plot_factory.py in the PlotFactory class
+# Register the tables in utils/plots/plot_factory.py, next to the other register_plot calls.
+# generate_all_plots_sync()/_async() pick them up, and generate_plots(processor, ['home_team_stats'])
+# builds only this plot.
 
-@staticmethod
-def generate_team_stats_tables(processor: MatchDataProcessor) -> Dict[str, Any]:
+def _team_stats_tables(match_df: pd.DataFrame, home_team: str, away_team: str) -> Dict[str, Any]:
     """Generate stats tables for both teams using existing calculate_team_stats function"""
     return {
-        'home_team_stats': generate_team_stats_table(processor.match_df, processor.home_team),
-        'away_team_stats': generate_team_stats_table(processor.match_df, processor.away_team)
+        'home_team_stats': generate_team_stats_table(match_df, home_team),
+        'away_team_stats': generate_team_stats_table(match_df, away_team)
     }
 
 
-# Update generate_all_plots_sync() in plot_factory.py to include:
-
-def generate_all_plots_sync(processor: MatchDataProcessor) -> Dict[str, Any]:
-    """Synchronous version for compatibility"""
-    return {
-        'xg_graph': PlotFactory.generate_xg_plot(processor),
-        'momentum_graph': PlotFactory.generate_momentum_plot(processor),
-        'match_summary': PlotFactory.generate_match_summary(processor),
-        **PlotFactory.generate_dominance_heatmaps(processor),
-        **PlotFactory.generate_team_heatmaps(processor),
-        **PlotFactory.generate_team_stats_tables(processor)  # Add this line
-    }
+register_plot('team_stats', _team_stats_tables, ('match_df', 'home_team', 'away_team'),
+              ('home_team_stats', 'away_team_stats'))
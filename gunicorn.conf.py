@@ -0,0 +1,28 @@
+# Loaded automatically by gunicorn from the working directory.
+import glob
+import os
+
+
+def on_starting(server):
+    # Prometheus multiprocess mode: drop samples left over from a previous run
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+            os.remove(path)
+
+
+def post_worker_init(worker):
+    # Build the typeahead index before the worker takes traffic
+    from utils.search_index import catalog_search
+    try:
+        with worker.wsgi.app_context():
+            catalog_search.refresh(force=True)
+    except Exception as e:
+        worker.log.warning(f"Search index not built at start-up: {e}")
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
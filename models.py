@@ -16,6 +16,7 @@ class Match(db.Model):
     home_team = db.Column(db.String(100))
     away_team = db.Column(db.String(100))
     scoreline = db.Column(db.String(20))
+    match_date = db.Column(db.String(10))  # ISO date from sb.matches; orders the team form series
 
 class MatchPlot(db.Model):
     __tablename__ = 'match_plots'
@@ -26,3 +27,184 @@ class MatchPlot(db.Model):
     plot_json = db.Column(db.Text, nullable=False)
 
     match = db.relationship("Match", backref=db.backref("plots", lazy=True))
+
+
+# Additive per-team totals shared by the per-match rows and the per-season aggregate
+TEAM_TOTAL_FIELDS = (
+    'matches', 'wins', 'draws', 'losses', 'points',
+    'goals_for', 'goals_against', 'xg_for', 'xg_against',
+    'shots', 'shots_against', 'shots_on_target', 'passes', 'passes_completed',
+    'yellow_cards', 'red_cards', 'fouls', 'corners', 'xt_for', 'xt_against',
+)
+
+
+class TeamTotalsMixin:
+    matches = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    draws = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    goals_for = db.Column(db.Integer, nullable=False, default=0)
+    goals_against = db.Column(db.Integer, nullable=False, default=0)
+    xg_for = db.Column(db.Float, nullable=False, default=0.0)
+    xg_against = db.Column(db.Float, nullable=False, default=0.0)
+    shots = db.Column(db.Integer, nullable=False, default=0)
+    shots_against = db.Column(db.Integer, nullable=False, default=0)
+    shots_on_target = db.Column(db.Integer, nullable=False, default=0)
+    passes = db.Column(db.Integer, nullable=False, default=0)
+    passes_completed = db.Column(db.Integer, nullable=False, default=0)
+    yellow_cards = db.Column(db.Integer, nullable=False, default=0)
+    red_cards = db.Column(db.Integer, nullable=False, default=0)
+    fouls = db.Column(db.Integer, nullable=False, default=0)
+    corners = db.Column(db.Integer, nullable=False, default=0)
+    xt_for = db.Column(db.Float, nullable=False, default=0.0)
+    xt_against = db.Column(db.Float, nullable=False, default=0.0)
+
+    def totals(self) -> dict:
+        return {field: getattr(self, field) for field in TEAM_TOTAL_FIELDS}
+
+
+class MatchTeamStats(TeamTotalsMixin, db.Model):
+    """One team's totals for one match; kept so a reprocessed match can be subtracted from its season"""
+    __tablename__ = 'match_team_stats'
+
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    team = db.Column(db.String(100), primary_key=True)
+    opponent = db.Column(db.String(100))
+
+
+class SeasonTeamStats(TeamTotalsMixin, db.Model):
+    """Running per-(season, team) totals, updated incrementally by the ETL"""
+    __tablename__ = 'season_team_stats'
+
+    season_id = db.Column(db.String, db.ForeignKey('season.id'), primary_key=True)
+    team = db.Column(db.String(100), primary_key=True, index=True)
+
+
+# Per-match values whose running totals make up the team form series
+FORM_FIELDS = ('points', 'goals_for', 'goals_against', 'xg_for', 'xg_against',
+               'shots', 'shots_against', 'xt_for', 'xt_against')
+
+
+class TeamFormPoint(db.Model):
+    """
+    One match in a team's chronological series, with running totals of FORM_FIELDS
+
+    Any rolling window is the difference of two running totals, so appending a
+    match is O(1) and a late (out of order) match only shifts the rows after it.
+    """
+    __tablename__ = 'team_form'
+
+    team = db.Column(db.String(100), primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    season_id = db.Column(db.String, db.ForeignKey('season.id'), nullable=False)
+    opponent = db.Column(db.String(100))
+    match_date = db.Column(db.String(10))
+    sort_key = db.Column(db.String(24), nullable=False)  # "<date>:<zero-padded match id>"
+    position = db.Column(db.Integer, nullable=False)
+    cum_points = db.Column(db.Integer, nullable=False, default=0)
+    cum_goals_for = db.Column(db.Integer, nullable=False, default=0)
+    cum_goals_against = db.Column(db.Integer, nullable=False, default=0)
+    cum_xg_for = db.Column(db.Float, nullable=False, default=0.0)
+    cum_xg_against = db.Column(db.Float, nullable=False, default=0.0)
+    cum_shots = db.Column(db.Integer, nullable=False, default=0)
+    cum_shots_against = db.Column(db.Integer, nullable=False, default=0)
+    cum_xt_for = db.Column(db.Float, nullable=False, default=0.0)
+    cum_xt_against = db.Column(db.Float, nullable=False, default=0.0)
+
+    __table_args__ = (db.Index('ix_team_form_team_sort_key', 'team', 'sort_key'),)
+
+
+class MatchCountGrid(db.Model):
+    """Unsmoothed heatmap counts of one team in one match, packed by utils.plots.season_heatmaps"""
+    __tablename__ = 'match_count_grids'
+
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    team = db.Column(db.String(100), primary_key=True, index=True)
+    bins_y = db.Column(db.Integer, nullable=False)
+    bins_x = db.Column(db.Integer, nullable=False)
+    counts = db.Column(db.LargeBinary, nullable=False)
+
+
+# Additive per-player totals for one match; season profiles and leaderboards sum them
+PLAYER_STAT_FIELDS = (
+    'minutes', 'starts', 'sub_appearances', 'goals', 'assists', 'shots', 'shots_on_target', 'xg',
+    'key_passes', 'passes', 'passes_completed', 'dribbles', 'dribbles_completed',
+    'fouls_committed', 'yellow_cards', 'red_cards',
+)
+
+
+class PlayerMatchStats(db.Model):
+    """One player's event index for one match (lineup players and anyone who acted on the ball)"""
+    __tablename__ = 'player_match_stats'
+
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    player_id = db.Column(db.Integer, primary_key=True)
+    season_id = db.Column(db.String, db.ForeignKey('season.id'), nullable=False)
+    player = db.Column(db.String(100), nullable=False)
+    team = db.Column(db.String(100))
+    position = db.Column(db.String(50))  # Starting position; None for substitutes
+    minutes = db.Column(db.Integer, nullable=False, default=0)
+    starts = db.Column(db.Integer, nullable=False, default=0)
+    sub_appearances = db.Column(db.Integer, nullable=False, default=0)
+    goals = db.Column(db.Integer, nullable=False, default=0)
+    assists = db.Column(db.Integer, nullable=False, default=0)
+    shots = db.Column(db.Integer, nullable=False, default=0)
+    shots_on_target = db.Column(db.Integer, nullable=False, default=0)
+    xg = db.Column(db.Float, nullable=False, default=0.0)
+    key_passes = db.Column(db.Integer, nullable=False, default=0)
+    passes = db.Column(db.Integer, nullable=False, default=0)
+    passes_completed = db.Column(db.Integer, nullable=False, default=0)
+    dribbles = db.Column(db.Integer, nullable=False, default=0)
+    dribbles_completed = db.Column(db.Integer, nullable=False, default=0)
+    fouls_committed = db.Column(db.Integer, nullable=False, default=0)
+    yellow_cards = db.Column(db.Integer, nullable=False, default=0)
+    red_cards = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_player_match_stats_season_player', 'season_id', 'player_id'),
+        db.Index('ix_player_match_stats_player', 'player_id'),
+    )
+
+    def totals(self) -> dict:
+        return {field: getattr(self, field) for field in PLAYER_STAT_FIELDS}
+
+
+class MatchEventArrays(db.Model):
+    """Compact heatmap event arrays of one match (utils.plots.event_arrays); checksum versions the payload"""
+    __tablename__ = 'match_event_arrays'
+
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    checksum = db.Column(db.BigInteger, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+
+class MatchXgSeries(db.Model):
+    """Compact cumulative xG/goals step series of one match (xG_per_game.match_xg_series), JSON"""
+    __tablename__ = 'match_xg_series'
+
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+
+
+class EtlMatchRun(db.Model):
+    """Outcome of one match in one ETL run; sharded runs are checked for full coverage against it"""
+    __tablename__ = 'etl_match_runs'
+
+    run_id = db.Column(db.String(64), primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    shard = db.Column(db.String(16))  # "i/N", None for an unsharded run
+    succeeded = db.Column(db.Boolean, nullable=False)
+    error = db.Column(db.Text)
+    finished_at = db.Column(db.Float, nullable=False)  # Unix time of the batch commit
+
+
+class EventCode(db.Model):
+    """Dictionary encoding of event types, outcomes, teams and players (utils.event_codes)"""
+    __tablename__ = 'event_codes'
+
+    kind = db.Column(db.String(10), primary_key=True)  # 'type', 'outcome', 'team' or 'player' (StatsBomb id)
+    code = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.String(100), nullable=False)
+
+    __table_args__ = (db.UniqueConstraint('kind', 'value', name='uq_event_codes_kind_value'),)
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, render_template
 from utils.extensions import cache
 from utils.db import db
 from models import Competition, Season
+from utils.analytics.team_analytics.team_aggregates import season_table
 
 competition_bp = Blueprint('competition_bp', __name__)
 
@@ -53,3 +54,15 @@ def api_seasons(competition_id):
     return jsonify(data)
 
 
+@competition_bp.route('/api/competition-data/<season_id>')
+@cache.cached(timeout=3600)
+def api_competition_data(season_id):
+    """Season table straight from the ETL-maintained per-(season, team) aggregates"""
+    rows = season_table(season_id)
+
+    teams = [
+        {'position': position, 'team': row.team, **row.totals()}
+        for position, row in enumerate(rows, 1)
+    ]
+
+    return jsonify({'season_id': season_id, 'teams': teams})
@@ -1,13 +1,25 @@
-from flask import Blueprint, jsonify, render_template
+from flask import Blueprint, current_app, jsonify, render_template, request
+from utils import fast_json
 from utils.extensions import cache
 from utils.db import db
-from models import Match, MatchPlot
-import json
+from utils.lru import LRUCache
+from utils.swr_cache import StaleWhileRevalidate
+from utils.plots.xg_compare import compare_xg_figure, match_label
+from models import Match, MatchPlot, MatchEventArrays, MatchXgSeries
 import logging
+import re
 
 match_bp = Blueprint('match', __name__)
 logger = logging.getLogger(__name__)
 
+# Per-worker memoization for /api/heatmap, keyed by the stored arrays' checksum
+_event_arrays_cache = LRUCache(maxsize=32)
+_heatmap_cache = LRUCache(maxsize=256)
+_COLORSCALE_NAME = re.compile(r'^[A-Za-z]{2,20}(_r)?$')
+MAX_COMPARE_MATCHES = 20
+# Plot bundles: fresh for an hour, then served stale for 10 minutes while one request per worker refreshes them
+_plots_cache = StaleWhileRevalidate(cache, timeout=3600, stale_timeout=600)
+
 @match_bp.route('/match-analysis')
 def match_analysis():
     return render_template('match_analysis.html')
@@ -26,21 +38,158 @@ def get_matches(season_id):
     ]
     return jsonify(simplified)
 
-@match_bp.route('/api/plots/<int:match_id>')
-@cache.cached(timeout=3600)
-def get_match_plots(match_id):
+def _match_plots_body(match_id: int):
+    """The match's plots as one JSON object string with its content hash, or None when it has none"""
     plots = MatchPlot.query.filter_by(match_id=match_id).all()
-
     if not plots:
+        return None
+    # The stored plots already are JSON: splice them into the response instead of parsing and re-encoding
+    body = '{' + ','.join(f'{fast_json.dumps(plot.plot_type)}:{plot.plot_json}' for plot in plots) + '}'
+    return body, fast_json.content_hash(body)
+
+
+@match_bp.route('/api/plots/<int:match_id>')
+def get_match_plots(match_id):
+    entry = _plots_cache.get_or_compute(f"match_plots/{match_id}", lambda: _match_plots_body(match_id))
+    if entry is None:
         return jsonify({"error": "No plot data found for this match."}), 404
+    body, etag = entry
+    # The ETag is the bundle's content hash: clients holding it get a 304 and keep their stored copy
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def _heatmap_params(args) -> dict:
+    """Validated /api/heatmap query args; raises ValueError with a client-facing message"""
+    params = {
+        'type': args.get('type', 'dominance'),
+        'half': args.get('half', 'full'),
+        'team': args.get('team', 'home'),
+        'bins': None,
+        'sigma': None,
+        'colorscale': args.get('colorscale') or None,
+    }
+    if params['type'] not in ('dominance', 'possession', 'attack', 'defense'):
+        raise ValueError("type must be dominance, possession, attack or defense.")
+    if params['half'] not in ('full', 'first', 'second'):
+        raise ValueError("half must be full, first or second.")
+    if params['team'] not in ('home', 'away'):
+        raise ValueError("team must be home or away.")
+    if args.get('bins'):
+        try:
+            bins = tuple(int(value) for value in args['bins'].split(','))
+        except ValueError:
+            bins = ()
+        if len(bins) != 2 or not all(4 <= value <= 120 for value in bins):
+            raise ValueError("bins must be 'length,width' with values between 4 and 120.")
+        params['bins'] = bins
+    if args.get('sigma'):
+        try:
+            params['sigma'] = float(args['sigma'])
+        except ValueError:
+            params['sigma'] = -1
+        if not 0 < params['sigma'] <= 10:
+            raise ValueError("sigma must be a number in (0, 10].")
+    if params['colorscale'] and not _COLORSCALE_NAME.match(params['colorscale']):
+        raise ValueError("colorscale must be a Plotly colorscale name.")
+    return params
+
+
+@match_bp.route('/api/heatmap/<int:match_id>')
+def get_match_heatmap(match_id):
+    """
+    Heatmap with custom parameters, rebuilt from the match's compact event arrays
+
+    Query args: type (dominance|possession|attack|defense), team (home|away), half (full|first|second),
+    bins ("length,width"), sigma, colorscale (Plotly colorscale name)
+    """
+    try:
+        params = _heatmap_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    checksum = db.session.query(MatchEventArrays.checksum).filter_by(match_id=match_id).scalar()
+    if checksum is None:
+        return jsonify({"error": "No heatmap data found for this match."}), 404
 
+    # numpy/scipy stay out of worker start-up until a heatmap is requested
+    from utils.plots.event_arrays import heatmap_from_arrays, unpack_event_arrays
+
+    def load_arrays():
+        data = db.session.query(MatchEventArrays.data).filter_by(match_id=match_id).scalar()
+        return unpack_event_arrays(data)
+
+    def build():
+        arrays = _event_arrays_cache.get_or_compute((match_id, checksum), load_arrays)
+        return heatmap_from_arrays(arrays, params['type'], params['half'],
+                                   team=0 if params['team'] == 'home' else 1,
+                                   bins=params['bins'], sigma=params['sigma'], colorscale=params['colorscale'])
+
+    key = (match_id, checksum) + tuple(sorted(params.items()))
+    try:
+        figure = _heatmap_cache.get_or_compute(key, build)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 422
+    return jsonify(figure)
+
+
+def _compare_match_ids(args) -> list:
+    """Sorted, de-duplicated ?match_ids=; raises ValueError with a client-facing message"""
+    raw = args.get('match_ids', '')
+    try:
+        match_ids = sorted({int(part) for part in raw.split(',') if part.strip()})
+    except ValueError:
+        raise ValueError("match_ids must be comma separated integers.")
+    if not match_ids:
+        raise ValueError("match_ids is required.")
+    if len(match_ids) > MAX_COMPARE_MATCHES:
+        raise ValueError(f"At most {MAX_COMPARE_MATCHES} matches can be compared.")
+    return match_ids
+
+
+def _compare_cache_key(*args, **kwargs) -> str:
+    # The same set of matches shares one entry whatever order (or repeats) the ids came in
+    try:
+        match_ids = ','.join(map(str, _compare_match_ids(request.args)))
+    except ValueError:
+        match_ids = 'invalid'
+    return f"compare_xg/{match_ids}/{request.args.get('team', '')}"
+
+
+@match_bp.route('/api/compare/xg')
+@cache.cached(timeout=3600, make_cache_key=_compare_cache_key)
+def compare_xg():
+    """
+    Cumulative xG of several matches overlaid in one figure, from the stored per-match series
+
+    Query args: match_ids (comma separated, at most MAX_COMPARE_MATCHES), team (only draw this team's lines)
+    """
     try:
-        result = {}
-        for plot in plots:
-            result[plot.plot_type] = json.loads(plot.plot_json)
+        match_ids = _compare_match_ids(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    team = request.args.get('team') or None
 
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"Error parsing plot data for match {match_id}: {e}", exc_info=True)
-        return jsonify({"error": "Failed to parse plot data"}), 500
+    rows = (db.session.query(MatchXgSeries.match_id, MatchXgSeries.data, Match.home_team, Match.away_team,
+                             Match.scoreline, Match.match_date)
+            .join(Match, Match.id == MatchXgSeries.match_id)
+            .filter(MatchXgSeries.match_id.in_(match_ids))
+            .order_by(Match.match_date, Match.id)
+            .all())
+    if not rows:
+        return jsonify({"error": "No xG series found for these matches."}), 404
 
+    matches = [
+        {
+            'match_id': match_id,
+            'label': match_label(home_team, away_team, scoreline, match_date),
+            'series': fast_json.loads(data),
+        }
+        for match_id, data, home_team, away_team, scoreline, match_date in rows
+    ]
+    figure = compare_xg_figure(matches, team)
+    found = {match['match_id'] for match in matches}
+    figure['matches'] = [{'match_id': match['match_id'], 'label': match['label']} for match in matches]
+    figure['missing'] = [match_id for match_id in match_ids if match_id not in found]
+    return jsonify(figure)
@@ -0,0 +1,136 @@
+from flask import Blueprint, jsonify, request
+from utils.extensions import cache
+from utils.db import db
+from models import Competition, Season, Match, PlayerMatchStats, PLAYER_STAT_FIELDS
+
+player_bp = Blueprint('player', __name__)
+
+_SUMS = [db.func.sum(getattr(PlayerMatchStats, field)).label(field) for field in PLAYER_STAT_FIELDS]
+_APPEARANCES = db.func.sum(db.case((PlayerMatchStats.minutes > 0, 1), else_=0)).label('appearances')
+
+
+def _totals(row) -> dict:
+    totals = {field: getattr(row, field) or 0 for field in PLAYER_STAT_FIELDS}
+    totals['appearances'] = row.appearances or 0
+    totals['xg'] = float(totals['xg'])
+    return totals
+
+
+@player_bp.route('/api/player-data/<int:player_id>')
+@cache.cached(timeout=3600, query_string=True)
+def api_player_data(player_id):
+    """A player's per-season totals; with ?season_id= also the per-match rows of that season"""
+    query = (
+        db.session.query(PlayerMatchStats.season_id, Season.year, Competition.name,
+                         db.func.max(PlayerMatchStats.player).label('player'),
+                         db.func.max(PlayerMatchStats.team).label('team'),
+                         _APPEARANCES, *_SUMS)
+        .join(Season, Season.id == PlayerMatchStats.season_id)
+        .join(Competition, Competition.id == Season.competition_id)
+        .filter(PlayerMatchStats.player_id == player_id)
+        .group_by(PlayerMatchStats.season_id, Season.year, Competition.name)
+    )
+    season_id = request.args.get('season_id')
+    if season_id:
+        query = query.filter(PlayerMatchStats.season_id == season_id)
+
+    rows = query.order_by(Season.year, Competition.name).all()
+    if not rows:
+        return jsonify({"error": f"No data found for player {player_id}."}), 404
+
+    response = {
+        'player_id': player_id,
+        'player': rows[-1].player,
+        'seasons': [
+            {
+                'season_id': row.season_id,
+                'season_name': row.year,
+                'competition_name': row.name,
+                'team': row.team,
+                **_totals(row)
+            }
+            for row in rows
+        ]
+    }
+
+    if season_id:
+        matches = (
+            db.session.query(PlayerMatchStats, Match.match_date, Match.home_team, Match.away_team, Match.scoreline)
+            .join(Match, Match.id == PlayerMatchStats.match_id)
+            .filter(PlayerMatchStats.player_id == player_id, PlayerMatchStats.season_id == season_id)
+            .order_by(Match.match_date, Match.id)
+            .all()
+        )
+        response['matches'] = [
+            {
+                'match_id': stats.match_id,
+                'match_date': match_date,
+                'match_name': f"{home_team} vs {away_team}",
+                'scoreline': scoreline,
+                'team': stats.team,
+                'position': stats.position,
+                **stats.totals()
+            }
+            for stats, match_date, home_team, away_team, scoreline in matches
+        ]
+
+    return jsonify(response)
+
+
+@player_bp.route('/api/player-leaderboard/<season_id>')
+@cache.cached(timeout=3600, query_string=True)
+def api_player_leaderboard(season_id):
+    """
+    Top players of a season by one stat
+
+    Query args: stat (one of PLAYER_STAT_FIELDS, default goals), limit (default 20, max 100),
+    min_minutes (default 0), per90 (1 ranks by the stat per 90 minutes)
+    """
+    stat = request.args.get('stat', 'goals')
+    if stat not in PLAYER_STAT_FIELDS:
+        return jsonify({"error": f"Unknown stat {stat}."}), 400
+    try:
+        limit = min(int(request.args.get('limit', 20)), 100)
+        min_minutes = int(request.args.get('min_minutes', 0))
+    except ValueError:
+        return jsonify({"error": "limit and min_minutes must be integers."}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be at least 1."}), 400
+    per90 = request.args.get('per90') == '1'
+
+    minutes = db.func.sum(PlayerMatchStats.minutes)
+    value = db.func.sum(getattr(PlayerMatchStats, stat))
+    if per90:
+        value = value * 90.0 / db.func.nullif(minutes, 0)
+    rows = (
+        db.session.query(PlayerMatchStats.player_id,
+                         db.func.max(PlayerMatchStats.player).label('player'),
+                         db.func.max(PlayerMatchStats.team).label('team'),
+                         _APPEARANCES, *_SUMS, value.label('value'))
+        .filter(PlayerMatchStats.season_id == season_id)
+        .group_by(PlayerMatchStats.player_id)
+        .having(minutes >= max(min_minutes, 1 if per90 else 0))
+        .order_by(value.desc(), PlayerMatchStats.player_id)
+        .limit(limit)
+        .all()
+    )
+
+    if not rows:
+        return jsonify({"error": f"No player data found for season {season_id}."}), 404
+
+    return jsonify({
+        'season_id': season_id,
+        'stat': stat,
+        'per90': per90,
+        'players': [
+            {
+                'rank': rank,
+                'player_id': row.player_id,
+                'player': row.player,
+                'team': row.team,
+                'value': float(row.value or 0),
+                **_totals(row)
+            }
+            for rank, row in enumerate(rows, start=1)
+        ]
+    })
@@ -0,0 +1,24 @@
+from flask import Blueprint, jsonify, request
+from utils.search_index import SEARCH_KINDS, catalog_search
+
+search_bp = Blueprint('search', __name__)
+
+
+@search_bp.route('/api/search')
+def api_search():
+    """
+    Typeahead over teams, players and fixtures from the in-memory index
+
+    Query args: q (prefix of a name or of any later word), types (comma separated:
+    team, player, match; default all), limit (default 10, max 50)
+    """
+    query = request.args.get('q', '')
+    kinds = [kind for kind in request.args.get('types', ','.join(SEARCH_KINDS)).split(',') if kind]
+    if any(kind not in SEARCH_KINDS for kind in kinds):
+        return jsonify({"error": f"types must be among {', '.join(SEARCH_KINDS)}."}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+
+    return jsonify({'query': query, 'results': catalog_search.search(query, kinds, limit)})
@@ -0,0 +1,109 @@
+from flask import Blueprint, jsonify, request
+from utils.extensions import cache
+from models import Match, MatchCountGrid
+from utils.analytics.team_analytics.team_aggregates import (form_points, match_values, rolling_form,
+                                                               team_seasons, window_bases)
+
+team_bp = Blueprint('team', __name__)
+MAX_HEATMAP_MATCHES = 100
+
+
+@team_bp.route('/api/team-data/<team_name>')
+@cache.cached(timeout=3600, query_string=True)
+def api_team_data(team_name):
+    """A team's per-season aggregates, optionally limited to one season (?season_id=9-42)"""
+    seasons = [
+        {
+            'season_id': stats.season_id,
+            'season_name': season_name,
+            'competition_name': competition_name,
+            **stats.totals()
+        }
+        for stats, season_name, competition_name in team_seasons(team_name, request.args.get('season_id'))
+    ]
+
+    if not seasons:
+        return jsonify({"error": f"No aggregate data found for team {team_name}."}), 404
+
+    return jsonify({'team': team_name, 'seasons': seasons})
+
+
+@team_bp.route('/api/team-heatmap/<team_name>')
+@cache.cached(timeout=3600, query_string=True)
+def api_team_heatmap(team_name):
+    """
+    Season or multi-match heatmap summed from stored count grids
+
+    Query args: season_id, match_ids (comma separated, at most MAX_HEATMAP_MATCHES),
+    phase (possession|attack|defense), half (full|first|second)
+    """
+    # numpy/scipy/plotly stay out of worker start-up until a heatmap is requested
+    from utils.plots.season_heatmaps import GRID_PHASES, season_heatmap, sum_count_grids
+
+    phase = request.args.get('phase', 'possession')
+    half = request.args.get('half', 'full')
+    if phase not in GRID_PHASES or half not in ('full', 'first', 'second'):
+        return jsonify({"error": "Invalid phase or half."}), 400
+
+    query = MatchCountGrid.query.filter(MatchCountGrid.team == team_name)
+    season_id = request.args.get('season_id')
+    if season_id:
+        query = query.join(Match, Match.id == MatchCountGrid.match_id).filter(Match.season_id == season_id)
+    match_ids = request.args.get('match_ids')
+    if match_ids:
+        try:
+            ids = [int(match_id) for match_id in match_ids.split(',') if match_id]
+        except ValueError:
+            return jsonify({"error": "match_ids must be comma separated integers."}), 400
+        if len(set(ids)) > MAX_HEATMAP_MATCHES:
+            return jsonify({"error": f"At most {MAX_HEATMAP_MATCHES} matches can be combined."}), 400
+        query = query.filter(MatchCountGrid.match_id.in_(ids))
+
+    rows = query.with_entities(MatchCountGrid.counts, MatchCountGrid.bins_y, MatchCountGrid.bins_x).all()
+    if not rows:
+        return jsonify({"error": f"No heatmap data found for team {team_name}."}), 404
+
+    # Grids stored with another bin size (an older ETL run) cannot be summed with the rest
+    bins = (rows[0].bins_y, rows[0].bins_x)
+    grids = [row.counts for row in rows if (row.bins_y, row.bins_x) == bins]
+    figure = season_heatmap(sum_count_grids(grids, bins), phase, half)
+    return jsonify({'team': team_name, 'matches': len(grids), 'phase': phase, 'half': half, 'plot': figure})
+
+
+@team_bp.route('/api/team-form/<team_name>')
+@cache.cached(timeout=3600, query_string=True)
+def api_team_form(team_name):
+    """
+    Per-match form line with rolling averages, read from the stored running totals
+
+    Query args: season_id, windows (comma separated match counts, default 5,10)
+    """
+    try:
+        windows = sorted({int(window) for window in request.args.get('windows', '5,10').split(',') if window})
+    except ValueError:
+        return jsonify({"error": "windows must be comma separated integers."}), 400
+    if not windows or windows[0] < 1 or windows[-1] > 50:
+        return jsonify({"error": "windows must be between 1 and 50."}), 400
+
+    # A season's rows plus the few earlier ones its first windows start from, not the whole series
+    points = form_points(team_name, request.args.get('season_id'))
+    bases = window_bases(team_name, points, windows[-1])
+
+    if not points:
+        return jsonify({"error": f"No form data found for team {team_name}."}), 404
+
+    matches = [
+        {
+            'match_id': point.match_id,
+            'season_id': point.season_id,
+            'match_date': point.match_date,
+            'opponent': point.opponent,
+            **value
+        }
+        for point, value in zip(points, match_values(points, bases))
+    ]
+    return jsonify({
+        'team': team_name,
+        'matches': matches,
+        'rolling': {str(window): rolling_form(points, bases, window) for window in windows}
+    })
@@ -1,10 +1,20 @@
 // Application configuration constants
 const AppConfig = {
+    // Data source: the Flask API, or a static export (python -m data.etl.static_export) whose
+    // pages set window.APP_DATA_SOURCE = { mode: 'static', root: '/data' }
+    DATA_SOURCE: window.APP_DATA_SOURCE || { mode: 'api', root: '/data' },
+
     // API endpoints
     API: {
         MATCH_PLOTS: '/api/plots',
+        MATCH_HEATMAP: '/api/heatmap',
+        COMPARE_XG: '/api/compare/xg',
         COMPETITION_DATA: '/api/competition-data',
-        TEAM_DATA: '/api/team-data'
+        TEAM_DATA: '/api/team-data',
+        TEAM_FORM: '/api/team-form',
+        PLAYER_DATA: '/api/player-data',
+        PLAYER_LEADERBOARD: '/api/player-leaderboard',
+        SEARCH: '/api/search'
     },
     
     // Plot types and their configurations
@@ -48,6 +58,15 @@ const AppConfig = {
         HEATMAP_AWAY: 'heatmap-away-plot-container'
     },
     
+    // Persistent plot bundle cache (IndexedDB); bump DB_VERSION when the stored format changes
+    PLOT_CACHE: {
+        DB_NAME: 'football-dashboard',
+        DB_VERSION: 1,
+        STORE: 'plot-bundles',
+        MAX_MATCHES: 40,               // Least recently opened bundles are evicted beyond this
+        PREFETCH_NEIGHBOURS: 1         // Matches prefetched on each side of the selected one
+    },
+    
     // Dropdown configurations
     DROPDOWNS: {
         AUTO_SELECT_DEFAULTS: true,    // Auto-select first available options
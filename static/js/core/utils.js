@@ -164,6 +164,58 @@ const Utils = {
                 setTimeout(() => inThrottle = false, limit);
             }
         };
+    },
+
+    /**
+     * Load the static export's manifest once (retried after a failure)
+     */
+    loadManifest() {
+        if (!this._manifest) {
+            const source = AppConfig.DATA_SOURCE;
+            this._manifest = fetch(`${source.root}/manifest.json`, { cache: 'no-cache' }).then(response => {
+                if (!response.ok) {
+                    throw new Error(`Failed to load data manifest: ${response.status}`);
+                }
+                return response.json();
+            });
+            this._manifest.catch(() => { this._manifest = null; });
+        }
+        return this._manifest;
+    },
+
+    /**
+     * Content hash of an API path's current data when it is known without a request
+     * (static mode: from the manifest's file name); null otherwise
+     */
+    async dataVersion(path) {
+        if (AppConfig.DATA_SOURCE.mode !== 'static') {
+            return null;
+        }
+        const manifest = await this.loadManifest();
+        const file = manifest.files[decodeURIComponent(path)];
+        const match = file && file.match(/\.([0-9a-f]{16})\.json$/);
+        return match ? match[1] : null;
+    },
+
+    /**
+     * Fetch an API path from the configured data source
+     *
+     * In 'static' mode the path is looked up in the export's manifest and the
+     * content-hashed file is fetched instead; paths that were not exported
+     * resolve to a 404 response, like the API would answer.
+     */
+    async fetchData(path, init = undefined) {
+        const source = AppConfig.DATA_SOURCE;
+        if (source.mode !== 'static') {
+            return fetch(path, init);
+        }
+
+        const manifest = await this.loadManifest();
+        const file = manifest.files[decodeURIComponent(path)];
+        if (!file) {
+            return new Response(null, { status: 404, statusText: 'Not exported' });
+        }
+        return fetch(`${source.root}/${file}`, init);
     }
 };
 
@@ -139,12 +139,10 @@ class CompetitionAnalysisPage {
      */
     async loadCompetitionData(competitionName) {
         try {
-            // This would be implemented based on your competition analysis requirements
             Utils.log(`Loading data for competition: ${competitionName}`, 'COMPETITION_PAGE');
             
-            // Example: Load competition statistics, standings, etc.
-            // const competitionData = await this.fetchCompetitionData(competitionName);
-            // this.renderCompetitionCharts(competitionData);
+            // Aggregates are stored per season, so the table is loaded once a season is picked
+            this.clearSeasonData();
             
         } catch (error) {
             Utils.log(`Error loading competition data: ${error.message}`, 'COMPETITION_PAGE', 'error');
@@ -157,17 +155,72 @@ class CompetitionAnalysisPage {
     async loadSeasonData(seasonId) {
         try {
             Utils.log(`Loading data for season: ${seasonId}`, 'COMPETITION_PAGE');
+            Utils.showLoading('season-table-container', 'Loading season table...');
+            
+            const response = await Utils.fetchData(`${AppConfig.API.COMPETITION_DATA}/${encodeURIComponent(seasonId)}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            
+            const seasonData = await response.json();
             
-            // This would be implemented based on your season analysis requirements
-            // Example: Load season statistics, match results, etc.
-            // const seasonData = await this.fetchSeasonData(seasonId);
-            // this.renderSeasonCharts(seasonData);
+            // Ignore responses for a season that is no longer selected
+            if (seasonId === this.currentSeason) {
+                this.renderSeasonTable(seasonData.teams);
+            }
             
         } catch (error) {
             Utils.log(`Error loading season data: ${error.message}`, 'COMPETITION_PAGE', 'error');
+            const container = document.getElementById('season-table-container');
+            if (container) {
+                container.innerHTML = '<div class="stats-loading">Season data not available</div>';
+            }
         }
     }
 
+    /**
+     * Render the season table from per-team aggregates
+     */
+    renderSeasonTable(teams) {
+        const container = document.getElementById('season-table-container');
+        if (!container) return;
+        
+        if (!teams || teams.length === 0) {
+            container.innerHTML = '<div class="stats-loading">No processed matches for this season</div>';
+            return;
+        }
+        
+        const columns = [
+            ['#', t => t.position],
+            ['Team', t => t.team],
+            ['P', t => t.matches],
+            ['W', t => t.wins],
+            ['D', t => t.draws],
+            ['L', t => t.losses],
+            ['GF', t => t.goals_for],
+            ['GA', t => t.goals_against],
+            ['xG', t => Utils.formatNumber(t.xg_for, 2)],
+            ['xGA', t => Utils.formatNumber(t.xg_against, 2)],
+            ['Shots', t => t.shots],
+            ['Pts', t => t.points]
+        ];
+        
+        let tableHTML = '<table class="team-stats-table season-table"><thead><tr>';
+        columns.forEach(([label]) => { tableHTML += `<th>${label}</th>`; });
+        tableHTML += '</tr></thead><tbody>';
+        
+        teams.forEach(team => {
+            tableHTML += '<tr>';
+            columns.forEach(([, value]) => { tableHTML += `<td>${value(team)}</td>`; });
+            tableHTML += '</tr>';
+        });
+        
+        tableHTML += '</tbody></table>';
+        container.innerHTML = tableHTML;
+        
+        Utils.log(`Season table rendered (${teams.length} teams)`, 'COMPETITION_PAGE');
+    }
+
     /**
      * Clear competition data
      */
@@ -181,6 +234,10 @@ class CompetitionAnalysisPage {
      */
     clearSeasonData() {
         // Clear any season-specific visualizations
+        const container = document.getElementById('season-table-container');
+        if (container) {
+            container.innerHTML = '';
+        }
         Utils.log('Season data cleared', 'COMPETITION_PAGE');
     }
 
@@ -2,6 +2,7 @@
 class MatchAnalysisPage {
     constructor() {
         this.plotManager = null;
+        this.plotCache = null;
         this.navigation = null;
         this.heatmapControls = null;
         this.statsTable = null;
@@ -17,6 +18,7 @@ class MatchAnalysisPage {
     initialize() {
         // Initialize services
         this.plotManager = new PlotManager();
+        this.plotCache = new PlotCache();
         
         // Initialize components
         this.navigation = new Navigation(this.plotManager);
@@ -101,50 +103,76 @@ class MatchAnalysisPage {
             // Show loading states
             this.showLoadingStates();
             
-            // Fetch plot data
-            const response = await fetch(`${AppConfig.API.MATCH_PLOTS}/${matchId}`);
-            if (!response.ok) {
-                throw new Error(`Failed to fetch plot data: ${response.status}`);
+            // Plot bundle from the persistent cache when current, else from the network
+            const result = await this.plotCache.load(matchId, plots => {
+                if (this.currentMatchId === matchId) {
+                    Utils.log('Cached plots were out of date, re-rendering', 'MATCH_ANALYSIS');
+                    this.renderMatch(plots);
+                }
+            });
+            if (this.currentMatchId !== matchId) {
+                return;  // Another match was selected while this one loaded
             }
-
-            const result = await response.json();
             Utils.log("Plot data received", 'MATCH_ANALYSIS');
 
-            // Cache plot data
-            this.plotManager.cachePlots(result);
-            
-            // Clear previous renders
-            this.plotManager.clearCache();
-            this.plotManager.cachePlots(result);
+            this.renderMatch(result);
+            this.prefetchNeighbours(matchId);
+
+            Utils.log('Match data loaded successfully', 'MATCH_ANALYSIS');
+
+        } catch (error) {
+            Utils.log(`Failed to load match data: ${error.message}`, 'MATCH_ANALYSIS', 'error');
+            this.showErrorStates();
+        }
+    }
 
-            // Show main containers
-            this.plotManager.showOverviewContainers();
+    /**
+     * Render a match's plot bundle across the page
+     */
+    renderMatch(result) {
+        // Switch the plot manager to this match's plots
+        this.plotManager.setPlots(result);
 
-            // Render main plots
-            this.plotManager.renderMainPlots();
+        // Show main containers
+        this.plotManager.showOverviewContainers();
 
-            // Render default dominance heatmap
-            this.renderDefaultHeatmap();
+        // Render main plots
+        this.plotManager.renderMainPlots();
 
-            // Update match summary
-            this.updateMatchSummary(result.match_summary);
+        // Render default dominance heatmap
+        this.renderDefaultHeatmap();
 
-            // Update team tables
-            this.updateTeamTables(result.match_summary);
+        // Update match summary
+        this.updateMatchSummary(result.match_summary);
 
-            // Load team stats
-            this.statsTable.loadAllTeamStats();
+        // Update team tables
+        this.updateTeamTables(result.match_summary);
 
-            // Reset controls and switch to overview
-            this.heatmapControls.resetToDefaults();
-            this.navigation.switchTab('overview');
+        // Load team stats
+        this.statsTable.loadAllTeamStats();
 
-            Utils.log('Match data loaded successfully', 'MATCH_ANALYSIS');
+        // Reset controls and switch to overview
+        this.heatmapControls.resetToDefaults();
+        this.navigation.switchTab('overview');
+    }
 
-        } catch (error) {
-            Utils.log(`Failed to load match data: ${error.message}`, 'MATCH_ANALYSIS', 'error');
-            this.showErrorStates();
+    /**
+     * Prefetch the matches next to the selected one in the season list while the browser is idle
+     */
+    prefetchNeighbours(matchId) {
+        const matchIds = $('#match-select option')
+            .map((_, option) => option.value)
+            .get()
+            .filter(value => value && value !== 'Select match');
+        const index = matchIds.indexOf(String(matchId));
+        if (index === -1) return;
+
+        const neighbours = [];
+        for (let offset = 1; offset <= AppConfig.PLOT_CACHE.PREFETCH_NEIGHBOURS; offset++) {
+            if (index + offset < matchIds.length) neighbours.push(matchIds[index + offset]);
+            if (index - offset >= 0) neighbours.push(matchIds[index - offset]);
         }
+        this.plotCache.prefetch(neighbours);
     }
 
     /**
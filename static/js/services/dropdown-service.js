@@ -65,7 +65,7 @@ class DropdownService {
         try {
             Utils.log('Loading competitions...', 'DROPDOWN_SERVICE');
             
-            const response = await fetch('/api/competitions');
+            const response = await Utils.fetchData('/api/competitions');
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
@@ -131,7 +131,7 @@ class DropdownService {
                 Utils.log(`✅ Loaded ${filtered.length} seasons for ${competitionName}`, 'DROPDOWN_SERVICE');
             } else {
                 // Fallback to API call
-                const response = await fetch('/api/competitions');
+                const response = await Utils.fetchData('/api/competitions');
                 if (!response.ok) {
                     throw new Error(`HTTP ${response.status}: ${response.statusText}`);
                 }
@@ -186,7 +186,7 @@ class DropdownService {
         try {
             Utils.log(`Loading matches for season ${seasonId}...`, 'DROPDOWN_SERVICE');
             
-            const response = await fetch(`/api/matches/${seasonId}`);
+            const response = await Utils.fetchData(`/api/matches/${seasonId}`);
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
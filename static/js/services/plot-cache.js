@@ -0,0 +1,194 @@
+// Persistent plot bundle cache: IndexedDB records keyed by match id and content hash
+class PlotCache {
+    constructor(config = AppConfig.PLOT_CACHE) {
+        this.config = config;
+        this.dbPromise = null;
+        this.prefetching = new Set();
+    }
+
+    /**
+     * Open (or create/upgrade) the database; resolves to null when IndexedDB is unavailable
+     */
+    open() {
+        if (!this.dbPromise) {
+            this.dbPromise = new Promise(resolve => {
+                if (!window.indexedDB) {
+                    resolve(null);
+                    return;
+                }
+                const request = indexedDB.open(this.config.DB_NAME, this.config.DB_VERSION);
+                request.onupgradeneeded = () => {
+                    // A new version means a new record format: start from an empty store
+                    const db = request.result;
+                    if (db.objectStoreNames.contains(this.config.STORE)) {
+                        db.deleteObjectStore(this.config.STORE);
+                    }
+                    const store = db.createObjectStore(this.config.STORE, { keyPath: ['matchId', 'hash'] });
+                    store.createIndex('matchId', 'matchId');
+                    store.createIndex('usedAt', 'usedAt');
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => {
+                    Utils.log(`Plot cache unavailable: ${request.error}`, 'PLOT_CACHE', 'warn');
+                    resolve(null);
+                };
+                request.onblocked = () => resolve(null);
+            });
+        }
+        return this.dbPromise;
+    }
+
+    /**
+     * Run one request against the store; resolves to its result, or null on any failure
+     */
+    async request(mode, makeRequest) {
+        const db = await this.open();
+        if (!db) return null;
+        return new Promise(resolve => {
+            try {
+                const tx = db.transaction(this.config.STORE, mode);
+                const request = makeRequest(tx.objectStore(this.config.STORE));
+                tx.oncomplete = () => resolve(request.result);
+                tx.onerror = tx.onabort = () => resolve(null);
+            } catch (error) {
+                Utils.log(`Plot cache request failed: ${error.message}`, 'PLOT_CACHE', 'warn');
+                resolve(null);
+            }
+        });
+    }
+
+    /**
+     * Newest stored bundle for a match ({ matchId, hash, plots, usedAt }), or null
+     */
+    async get(matchId) {
+        const records = await this.request('readonly', store => store.index('matchId').getAll(String(matchId)));
+        if (!records || !records.length) return null;
+        return records.reduce((newest, record) => (record.usedAt > newest.usedAt ? record : newest));
+    }
+
+    /**
+     * Store a match's bundle under its content hash, replacing older versions and evicting old matches
+     */
+    async put(matchId, hash, plots) {
+        matchId = String(matchId);
+        await this.request('readwrite', store => {
+            const stale = store.index('matchId').openCursor(IDBKeyRange.only(matchId));
+            stale.onsuccess = () => {
+                const cursor = stale.result;
+                if (!cursor) return;
+                if (cursor.value.hash !== hash) cursor.delete();
+                cursor.continue();
+            };
+            return store.put({ matchId, hash, plots, usedAt: Date.now() });
+        });
+        await this.evict();
+    }
+
+    /**
+     * Mark a bundle as recently used so eviction keeps it (rewrites the record, so at most hourly)
+     */
+    async touch(record) {
+        if (Date.now() - record.usedAt < 3600 * 1000) return;
+        await this.request('readwrite', store => store.put({ ...record, usedAt: Date.now() }));
+    }
+
+    /**
+     * Drop the least recently used bundles beyond MAX_MATCHES
+     */
+    async evict() {
+        const count = await this.request('readonly', store => store.count());
+        let excess = (count || 0) - this.config.MAX_MATCHES;
+        if (excess <= 0) return;
+        await this.request('readwrite', store => {
+            const cursor = store.index('usedAt').openCursor();
+            cursor.onsuccess = () => {
+                if (!cursor.result || excess <= 0) return;
+                cursor.result.delete();
+                excess -= 1;
+                cursor.result.continue();
+            };
+            return cursor;
+        });
+    }
+
+    /**
+     * Fetch a match's bundle and store it; resolves to { hash, plots }, or null when
+     * ``knownHash`` is still current (HTTP 304)
+     */
+    async fetchAndStore(matchId, knownHash = null) {
+        const path = `${AppConfig.API.MATCH_PLOTS}/${matchId}`;
+        const init = knownHash ? { headers: { 'If-None-Match': `"${knownHash}"` } } : undefined;
+        const response = await Utils.fetchData(path, init);
+        if (response.status === 304) return null;
+        if (!response.ok) {
+            throw new Error(`Failed to fetch plot data: ${response.status}`);
+        }
+
+        const plots = await response.json();
+        const etag = (response.headers.get('ETag') || '').replace(/^W\//, '').replace(/"/g, '');
+        const hash = (await Utils.dataVersion(path)) || etag || null;
+        if (hash) {
+            await this.put(matchId, hash, plots);
+        }
+        return { hash, plots };
+    }
+
+    /**
+     * A match's plots, from the cache when current
+     *
+     * With a static export the manifest says which hash is current, so a hit
+     * needs no request. Against the API a stored bundle is returned at once and
+     * revalidated with its ETag; ``onUpdate(plots)`` is called if it changed.
+     */
+    async load(matchId, onUpdate = null) {
+        const path = `${AppConfig.API.MATCH_PLOTS}/${matchId}`;
+        const [cached, version] = await Promise.all([this.get(matchId), Utils.dataVersion(path)]);
+
+        if (cached && (version === null || cached.hash === version)) {
+            Utils.log(`Plots for match ${matchId} served from cache (${cached.hash})`, 'PLOT_CACHE');
+            this.touch(cached);
+            if (version === null) {
+                this.fetchAndStore(matchId, cached.hash)
+                    .then(result => {
+                        if (result && onUpdate) onUpdate(result.plots);
+                    })
+                    .catch(error => Utils.log(`Revalidation failed: ${error.message}`, 'PLOT_CACHE', 'warn'));
+            }
+            return cached.plots;
+        }
+
+        return (await this.fetchAndStore(matchId)).plots;
+    }
+
+    /**
+     * Fetch and store bundles that are not cached yet, one at a time while the browser is idle
+     */
+    prefetch(matchIds) {
+        const idle = window.requestIdleCallback || (callback => setTimeout(callback, AppConfig.UI.LOADING_DELAY));
+        const queue = matchIds.filter(matchId => !this.prefetching.has(matchId));
+        queue.forEach(matchId => this.prefetching.add(matchId));
+
+        const next = () => {
+            const matchId = queue.shift();
+            if (matchId === undefined) return;
+            idle(async () => {
+                try {
+                    const path = `${AppConfig.API.MATCH_PLOTS}/${matchId}`;
+                    const [cached, version] = await Promise.all([this.get(matchId), Utils.dataVersion(path)]);
+                    if (!cached || (version !== null && cached.hash !== version)) {
+                        await this.fetchAndStore(matchId);
+                        Utils.log(`Prefetched plots for match ${matchId}`, 'PLOT_CACHE');
+                    }
+                } catch (error) {
+                    Utils.log(`Prefetch of match ${matchId} failed: ${error.message}`, 'PLOT_CACHE', 'warn');
+                } finally {
+                    this.prefetching.delete(matchId);
+                    next();
+                }
+            });
+        };
+        next();
+    }
+}
+
+window.PlotCache = PlotCache;
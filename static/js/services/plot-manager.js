@@ -34,6 +34,15 @@ class PlotManager {
         window.cachedPlots = this.cachedPlots;
     }
 
+    /**
+     * Switch to another match's plots: replaces the current plots and resets rendered state
+     */
+    setPlots(plotData) {
+        this.cachedPlots = {};
+        this.renderedPlots.clear();
+        this.cachePlots(plotData);
+    }
+
     /**
      * Clear all cached plots and rendered state
      */
@@ -1,29 +1,59 @@
+import numpy as np
 import pandas as pd
 import logging
 
-def cumulative_stats(team_data: pd.DataFrame):
-    team_data['goals'] = team_data['shot_outcome'].apply(lambda x: 1 if x == 'Goal' else 0)
-    team_data.replace(-999, 0, inplace=True)
-    team_data = team_data.sort_values('minute')
-    team_data['cum_goals'] = team_data['goals'].cumsum().astype(float)  # Convert to float for JSON serialization
-    team_data['cum_xg'] = team_data['shot_statsbomb_xg'].cumsum().astype(float)  # Convert to float for JSON serialization
-    return team_data
+from utils.event_codes import outcome_mask, team_mask, type_mask
+
+def cumulative_change_points(team_data: pd.DataFrame) -> dict:
+    """
+    Running xG and goals of one team at the rows where they change (shots and goals)
+
+    Also keeps the first and last row of each period, so a step line (``shape='hv'``)
+    through the points spans the same minutes as the full event series.
+    Returns lists: ``minute``, ``cum_xg`` and ``cum_goals``.
+    """
+    order = np.argsort(team_data['minute'].to_numpy(), kind='stable')
+    minute = team_data['minute'].to_numpy()[order]
+    period = team_data['period'].to_numpy()[order]
+    xg = team_data['shot_statsbomb_xg'].to_numpy(dtype=float)[order]
+    xg[(xg == -999) | np.isnan(xg)] = 0
+    goals = outcome_mask(team_data, 'shot_outcome', 'Goal').to_numpy()[order]
+
+    keep = (xg != 0) | goals
+    _, first = np.unique(period, return_index=True)
+    _, last = np.unique(period[::-1], return_index=True)
+    keep[first] = keep[len(period) - 1 - last] = True
+    return {
+        'minute': minute[keep].tolist(),
+        'cum_xg': np.cumsum(xg)[keep].tolist(),
+        'cum_goals': np.cumsum(goals)[keep].astype(float).tolist(),  # float, as the xG axis
+    }
 
 
 def extract_player_names(row):
     return [player['player']['name'] for player in row['lineup']]
 
 
+# Match summary symbols, in display order
+CONTRIBUTION_SYMBOLS = (
+    ("goals", "⚽"), ("assists", "🅰️"), ("yellow cards", "🟨"),
+    ("red cards", "🟥"), ("subbed on", "🔺"), ("subbed off", "🔻"),
+)
+
+
+def contribution_string(counts) -> str:
+    """Symbols for a player's tally, e.g. ``{'goals': 2, 'subbed off': 1}`` gives ⚽⚽🔻"""
+    return "".join(symbol * int(counts.get(stat, 0)) for stat, symbol in CONTRIBUTION_SYMBOLS)
+
+
 def goal_assist_stats(match_data: pd.DataFrame, home_team: str, away_team: str):
     # Initialize scoring counters
     home_norm = away_norm = home_et = away_et = home_pen = away_pen = 0
 
     # Count goals for both teams first
-    all_goals = match_data[(match_data["type"] == "Shot") & (match_data["shot_outcome"] == "Goal")]
-    for _, goal in all_goals.iterrows():
-        period = goal.get("period", None)
-        is_home = goal["team"] == home_team
-        
+    all_goals = outcome_mask(match_data, "shot_outcome", "Goal")
+    home_rows = team_mask(match_data, home_team)
+    for period, is_home in zip(match_data["period"][all_goals], home_rows[all_goals]):
         if period in (1, 2):
             # Normal time goals
             if is_home:
@@ -44,16 +74,16 @@ def goal_assist_stats(match_data: pd.DataFrame, home_team: str, away_team: str):
                 away_pen += 1
 
     def process_team(team):
-        df = match_data[match_data["team"] == team]
+        df = match_data[team_mask(match_data, team)]
 
         # Starting XI
         starters = []
-        start_rows = df[df["type"] == "Starting XI"]["tactics"]
+        start_rows = df[type_mask(df, "Starting XI")]["tactics"]
         if not start_rows.empty:
             starters = extract_player_names(start_rows.iloc[0])
 
         # Substitutes
-        subs = df[df["type"] == "Substitution"]
+        subs = df[type_mask(df, "Substitution")]
         replacements = subs["substitution_replacement"].dropna().tolist()
         players = starters + replacements
 
@@ -62,7 +92,7 @@ def goal_assist_stats(match_data: pd.DataFrame, home_team: str, away_team: str):
             pm[col] = 0
 
         # Goals (shots with outcome == Goal)
-        goal_shots = df[(df["type"] == "Shot") & (df["shot_outcome"] == "Goal")]
+        goal_shots = df[outcome_mask(df, "shot_outcome", "Goal")]
         for _, shot in goal_shots.iterrows():
             player = shot["player"]
             pm.loc[pm["player"] == player, "goals"] += 1
@@ -76,7 +106,7 @@ def goal_assist_stats(match_data: pd.DataFrame, home_team: str, away_team: str):
         # Cards
         if "bad_behaviour_card" in df.columns:
             for card_type, colname in [("Yellow Card", "yellow cards"), ("Red Card", "red cards")]:
-                card_players = df[df["bad_behaviour_card"] == card_type]["player"].dropna()
+                card_players = df[outcome_mask(df, "bad_behaviour_card", card_type)]["player"].dropna()
                 for player in card_players:
                     pm.loc[pm["player"] == player, colname] += 1
 
@@ -88,14 +118,7 @@ def goal_assist_stats(match_data: pd.DataFrame, home_team: str, away_team: str):
 
         # Ensure ints and build contributions without commas - use regular int for JSON serialization
         pm = pm.fillna(0).astype({c: int for c in pm.columns if c != "player"})
-        pm["contributions"] = (
-            pm["goals"].apply(lambda x: "⚽" * int(x)) +
-            pm["assists"].apply(lambda x: "🅰️" * int(x)) +
-            pm["yellow cards"].apply(lambda x: "🟨" * int(x)) +
-            pm["red cards"].apply(lambda x: "🟥" * int(x)) +
-            pm["subbed on"].apply(lambda x: "🔺" * int(x)) +
-            pm["subbed off"].apply(lambda x: "🔻" * int(x))
-        )
+        pm["contributions"] = [contribution_string(counts) for counts in pm.to_dict("records")]
 
         return pm[["player", "contributions"]]
 
@@ -117,33 +140,32 @@ def generate_team_stats(team_data: pd.DataFrame, team_name: str):
     # Initialize stats
     stats = []
     
+    shot = type_mask(team_data, 'Shot')
+    is_pass = type_mask(team_data, 'Pass')
+    
     # Goals
-    goals = len(team_data[(team_data['type'] == 'Shot') & (team_data['shot_outcome'] == 'Goal')])
+    goals = int(outcome_mask(team_data, 'shot_outcome', 'Goal').sum())
     stats.append({"stat_name": "Goals", "value": goals})
     
     # Total shots
-    total_shots = len(team_data[team_data['type'] == 'Shot'])
+    total_shots = int(shot.sum())
     stats.append({"stat_name": "Total Shots", "value": total_shots})
     
     # Shots on target
-    shots_on_target = len(team_data[(team_data['type'] == 'Shot') & 
-                                   (team_data['shot_outcome'].isin(['Goal', 'Saved']))])
+    shots_on_target = int(outcome_mask(team_data, 'shot_outcome', 'Goal', 'Saved').sum())
     stats.append({"stat_name": "Shots on Target", "value": shots_on_target})
     
-    # xG (Expected Goals)F
-    xg = team_data[team_data['type'] == 'Shot']['shot_statsbomb_xg'].fillna(0).sum()
+    # xG (Expected Goals)
+    xg = team_data.loc[shot, 'shot_statsbomb_xg'].fillna(0).sum()
     stats.append({"stat_name": "xG", "value": f"{xg:.2f}"})
     
     # Passes
-    total_passes = len(team_data[team_data['type'] == 'Pass'])
+    total_passes = int(is_pass.sum())
     stats.append({"stat_name": "Passes", "value": total_passes})
     
-    # Pass accuracy - fix the logic for successful passes
+    # Pass accuracy: completed passes have no outcome (NaN, or -999 after the ETL's fillna)
     if total_passes > 0:
-        # In StatsBomb data, successful passes have NaN in pass_outcome (replaced with -999 in our ETL), failed passes have a value
-        # Since we fill NaN with -999 in create_match_plots.py, successful passes now have -999 instead of NaN
-        successful_passes = len(team_data[(team_data['type'] == 'Pass') & 
-                                         (team_data['pass_outcome'] == -999)])
+        successful_passes = int(outcome_mask(team_data, 'pass_outcome', None).sum())
         pass_accuracy = (successful_passes / total_passes * 100)
     else:
         pass_accuracy = 0
@@ -155,31 +177,23 @@ def generate_team_stats(team_data: pd.DataFrame, team_name: str):
     stats.append({"stat_name": "Possession", "value": f"{possession_pct:.1f}%"})
     
     # Fouls
-    fouls = len(team_data[team_data['type'] == 'Foul Committed'])
+    fouls = int(type_mask(team_data, 'Foul Committed').sum())
     stats.append({"stat_name": "Fouls", "value": fouls})
     
     # Yellow cards
-    if 'bad_behaviour_card' in team_data.columns:
-        yellow_cards = len(team_data[(team_data['type'] == 'Bad Behaviour') & 
-                                    (team_data['bad_behaviour_card'] == 'Yellow Card')])
-    else:
-        yellow_cards = 0
+    yellow_cards = int(outcome_mask(team_data, 'bad_behaviour_card', 'Yellow Card').sum())
     stats.append({"stat_name": "Yellow Cards", "value": yellow_cards})
     
     # Red cards
-    if 'bad_behaviour_card' in team_data.columns:
-        red_cards = len(team_data[(team_data['type'] == 'Bad Behaviour') & 
-                                 (team_data['bad_behaviour_card'] == 'Red Card')])
-    else:
-        red_cards = 0
+    red_cards = int(outcome_mask(team_data, 'bad_behaviour_card', 'Red Card').sum())
     stats.append({"stat_name": "Red Cards", "value": red_cards})
     
-    # Corners
-    corners = len(team_data[team_data['type'] == 'Corner'])
+    # Corners are passes with a Corner pass type (as in match_team_totals)
+    corners = int((is_pass & (_column(team_data, 'pass_type') == 'Corner')).sum())
     stats.append({"stat_name": "Corners", "value": corners})
     
     # Offsides
-    offsides = len(team_data[team_data['type'] == 'Offside'])
+    offsides = int(type_mask(team_data, 'Offside').sum())
     stats.append({"stat_name": "Offsides", "value": offsides})
     
     return {
@@ -188,3 +202,177 @@ def generate_team_stats(team_data: pd.DataFrame, team_name: str):
             "stats": stats
         }
     }
+
+
+def _column(match_data: pd.DataFrame, name: str) -> pd.Series:
+    """Column by name, or an all-missing column when the match has no such events"""
+    if name in match_data.columns:
+        return match_data[name]
+    return pd.Series(-999, index=match_data.index)
+
+
+def _card_masks(match_data: pd.DataFrame):
+    """(yellow, red) card rows; a second yellow counts as a red"""
+    yellow = red = pd.Series(False, index=match_data.index)
+    for column in ('bad_behaviour_card', 'foul_committed_card'):
+        yellow = yellow | outcome_mask(match_data, column, 'Yellow Card')
+        red = red | outcome_mask(match_data, column, 'Red Card', 'Second Yellow')
+    return yellow, red
+
+
+def match_team_totals(match_data: pd.DataFrame, momentum: dict = None) -> list:
+    """
+    Additive per-team totals for one match, one dict per team (see models.TEAM_TOTAL_FIELDS)
+
+    ``momentum`` maps team -> summed momentum xT (``momentum_totals``); missing teams count 0.
+    """
+    momentum = momentum or {}
+    teams = [team for team in match_data['team'].unique() if team != -999 and pd.notna(team)][:2]
+    if len(teams) != 2:
+        return []
+
+    # Shoot-out kicks are neither goals nor xG
+    in_play = match_data[match_data['period'] != 5]
+    shot = type_mask(in_play, 'Shot')
+    is_pass = type_mask(in_play, 'Pass')
+    goal = outcome_mask(in_play, 'shot_outcome', 'Goal') | type_mask(in_play, 'Own Goal For')
+    on_target = outcome_mask(in_play, 'shot_outcome', 'Goal', 'Saved')
+    # Completed passes have no outcome (-999 after the ETL's fillna)
+    completed = outcome_mask(in_play, 'pass_outcome', None)
+    corner = is_pass & (_column(in_play, 'pass_type') == 'Corner')
+    yellow, red = _card_masks(in_play)
+    foul = type_mask(in_play, 'Foul Committed')
+
+    totals = {}
+    for team in teams:
+        own = team_mask(in_play, team)
+        team_shot, team_pass = shot & own, is_pass & own
+        totals[team] = {
+            'goals': int((goal & own).sum()),
+            'xg': float(in_play.loc[team_shot, 'shot_statsbomb_xg'].clip(lower=0).sum()),
+            'shots': int(team_shot.sum()),
+            'shots_on_target': int((on_target & own).sum()),
+            'passes': int(team_pass.sum()),
+            'passes_completed': int((completed & own).sum()),
+            'yellow_cards': int((yellow & own).sum()),
+            'red_cards': int((red & own).sum()),
+            'fouls': int((foul & own).sum()),
+            'corners': int((corner & own).sum()),
+        }
+
+    rows = []
+    for team, opponent in (teams, teams[::-1]):
+        own, other = totals[team], totals[opponent]
+        won, drawn = own['goals'] > other['goals'], own['goals'] == other['goals']
+        rows.append({
+            'team': team,
+            'opponent': opponent,
+            'matches': 1,
+            'wins': int(won),
+            'draws': int(drawn),
+            'losses': int(not won and not drawn),
+            'points': 3 if won else int(drawn),
+            'goals_for': own['goals'],
+            'goals_against': other['goals'],
+            'xg_for': own['xg'],
+            'xg_against': other['xg'],
+            'shots': own['shots'],
+            'shots_against': other['shots'],
+            'shots_on_target': own['shots_on_target'],
+            'passes': own['passes'],
+            'passes_completed': own['passes_completed'],
+            'yellow_cards': own['yellow_cards'],
+            'red_cards': own['red_cards'],
+            'fouls': own['fouls'],
+            'corners': own['corners'],
+            'xt_for': momentum.get(team, 0.0),
+            'xt_against': momentum.get(opponent, 0.0),
+        })
+    return rows
+
+
+def _player_id(value) -> int:
+    return int(value) if pd.notna(value) and value != -999 else None
+
+
+def match_player_stats(match_data: pd.DataFrame) -> list:
+    """
+    Additive per-player totals for one match, one dict per player (see models.PLAYER_STAT_FIELDS)
+
+    Minutes run from kick-off for the Starting XI (or from the substitution for
+    replacements) until substituted, sent off or the last in-play event.
+    Penalty shoot-out events are ignored, as in ``match_team_totals``.
+    """
+    in_play = match_data[match_data['period'] != 5]
+    if in_play.empty:
+        return []
+    clock = in_play['minute'] + _column(in_play, 'second').clip(lower=0) / 60
+    full_time = float(clock.max())
+
+    players = {}
+
+    def player(player_id, name, team):
+        return players.setdefault(player_id, {
+            'player_id': player_id, 'player': name, 'team': team, 'position': None,
+            'on': None, 'off': None, 'starts': 0, 'sub_appearances': 0,
+        })
+
+    for _, row in match_data[type_mask(match_data, 'Starting XI')].iterrows():
+        tactics = row.get('tactics')
+        for slot in tactics.get('lineup', []) if isinstance(tactics, dict) else []:
+            entry = player(int(slot['player']['id']), slot['player']['name'], row['team'])
+            entry.update(position=slot['position']['name'], on=0.0, starts=1)
+
+    subs = in_play[type_mask(in_play, 'Substitution')]
+    for minute, (_, row) in zip(clock[subs.index], subs.iterrows()):
+        outgoing = _player_id(row['player_id'])
+        if outgoing is not None:
+            entry = player(outgoing, row['player'], row['team'])
+            entry['off'] = minute if entry['off'] is None else min(entry['off'], minute)
+        incoming = _player_id(row.get('substitution_replacement_id'))
+        if incoming is not None:
+            entry = player(incoming, row['substitution_replacement'], row['team'])
+            entry.update(on=minute, sub_appearances=1)
+
+    yellow, red = _card_masks(in_play)
+    sent_off = in_play[red]
+    for minute, player_id in zip(clock[sent_off.index], sent_off['player_id']):
+        entry = players.get(_player_id(player_id))
+        if entry is not None:
+            entry['off'] = minute if entry['off'] is None else min(entry['off'], minute)
+
+    acting = in_play['player_id'] != -999
+    shot = type_mask(in_play, 'Shot')
+    is_pass = type_mask(in_play, 'Pass')
+    goal_assist = _column(in_play, 'pass_goal_assist') == True  # noqa: E712 (object column)
+    counts = pd.DataFrame({
+        'goals': outcome_mask(in_play, 'shot_outcome', 'Goal'),
+        'assists': goal_assist,
+        'shots': shot,
+        'shots_on_target': outcome_mask(in_play, 'shot_outcome', 'Goal', 'Saved'),
+        'xg': _column(in_play, 'shot_statsbomb_xg').where(shot, 0).clip(lower=0),
+        'key_passes': is_pass & (goal_assist | (_column(in_play, 'pass_shot_assist') == True)),  # noqa: E712
+        'passes': is_pass,
+        'passes_completed': outcome_mask(in_play, 'pass_outcome', None),
+        'dribbles': type_mask(in_play, 'Dribble'),
+        'dribbles_completed': outcome_mask(in_play, 'dribble_outcome', 'Complete'),
+        'fouls_committed': type_mask(in_play, 'Foul Committed'),
+        'yellow_cards': yellow,
+        'red_cards': red,
+    })[acting]
+    sums = counts.groupby(in_play.loc[acting, 'player_id']).sum()
+    names = in_play[acting].groupby('player_id')[['player', 'team']].first()
+    for player_id, name, team in names.itertuples():
+        player(int(player_id), name, team)
+
+    rows = []
+    for player_id, entry in players.items():
+        totals = sums.loc[player_id] if player_id in sums.index else None
+        on, off = entry.pop('on'), entry.pop('off')
+        minutes = 0 if on is None else max(0, round((full_time if off is None else off) - on))
+        row = {**entry, 'minutes': int(minutes)}
+        for field in counts.columns:
+            value = 0 if totals is None else totals[field]
+            row[field] = float(value) if field == 'xg' else int(value)
+        rows.append(row)
+    return rows
@@ -0,0 +1,95 @@
+"""
+Read-side helpers for the ETL-maintained team tables.
+
+``season_team_stats`` holds per-(season, team) totals and ``team_form`` the
+running totals of each team's matches in date order. The ETL writes both
+(``data.etl.season_aggregates`` and ``data.etl.team_form``); the web routes
+only read them through the queries and series helpers here.
+"""
+from typing import Dict, List, Tuple
+
+from utils.db import db
+from models import Competition, FORM_FIELDS, Season, SeasonTeamStats, TeamFormPoint
+
+
+def season_table(season_id: str) -> List[SeasonTeamStats]:
+    """A season's aggregates in league order: points, goal difference, goals scored, name"""
+    return (
+        SeasonTeamStats.query
+        .filter_by(season_id=season_id)
+        .order_by(
+            SeasonTeamStats.points.desc(),
+            (SeasonTeamStats.goals_for - SeasonTeamStats.goals_against).desc(),
+            SeasonTeamStats.goals_for.desc(),
+            SeasonTeamStats.team
+        )
+        .all()
+    )
+
+
+def team_seasons(team: str, season_id: str = None) -> List[Tuple[SeasonTeamStats, str, str]]:
+    """(aggregate, season name, competition name) for each of a team's seasons, oldest first"""
+    query = (
+        db.session.query(SeasonTeamStats, Season.year, Competition.name)
+        .join(Season, Season.id == SeasonTeamStats.season_id)
+        .join(Competition, Competition.id == Season.competition_id)
+        .filter(SeasonTeamStats.team == team)
+    )
+    if season_id:
+        query = query.filter(SeasonTeamStats.season_id == season_id)
+    return query.order_by(Season.year, Competition.name).all()
+
+
+def form_points(team: str, season_id: str = None) -> List[TeamFormPoint]:
+    """A team's form series in chronological order, optionally only one season's matches"""
+    query = TeamFormPoint.query.filter_by(team=team)
+    if season_id:
+        query = query.filter_by(season_id=season_id)
+    return query.order_by(TeamFormPoint.sort_key).all()
+
+
+def window_bases(team: str, points: List[TeamFormPoint], lookback: int) -> Dict[int, TeamFormPoint]:
+    """
+    ``points`` by position, plus the earlier rows their windows of up to ``lookback`` matches start from
+
+    Only the positions ``points`` does not already cover are read, so the full
+    series needs no second query and a single season reads at most
+    ``lookback`` rows before it (and the other competitions' rows within it).
+    """
+    by_position = {point.position: point for point in points}
+    if points:
+        missing = [position for position in range(max(points[0].position - lookback, 0), points[-1].position)
+                   if position not in by_position]
+        if missing:
+            by_position.update(
+                (point.position, point)
+                for point in TeamFormPoint.query.filter(TeamFormPoint.team == team,
+                                                        TeamFormPoint.position.in_(missing)))
+    return by_position
+
+
+def cumulative_totals(point: TeamFormPoint) -> Dict[str, float]:
+    """Running FORM_FIELDS totals stored on a form row (zeros before the first match)"""
+    if point is None:
+        return {field: 0 for field in FORM_FIELDS}
+    return {field: getattr(point, f"cum_{field}") for field in FORM_FIELDS}
+
+
+def match_values(points: List[TeamFormPoint], bases: Dict[int, TeamFormPoint]) -> List[Dict[str, float]]:
+    """Per-match FORM_FIELDS (each row's running totals minus the previous row's)"""
+    values = []
+    for point in points:
+        current, previous = cumulative_totals(point), cumulative_totals(bases.get(point.position - 1))
+        values.append({field: current[field] - previous[field] for field in FORM_FIELDS})
+    return values
+
+
+def rolling_form(points: List[TeamFormPoint], bases: Dict[int, TeamFormPoint], window: int) -> Dict[str, List[float]]:
+    """Per-match averages of FORM_FIELDS over the team's last ``window`` matches (fewer at the start)"""
+    series = {field: [] for field in FORM_FIELDS}
+    for point in points:
+        current, start = cumulative_totals(point), cumulative_totals(bases.get(point.position - window))
+        matches = min(window, point.position + 1)
+        for field in FORM_FIELDS:
+            series[field].append((current[field] - start[field]) / matches)
+    return series
@@ -0,0 +1,242 @@
+"""
+Persisted dictionary encoding for event types, outcomes, teams and players.
+
+Codes are small dense integers stored in the ``event_codes`` table, so they
+are identical in every process and across seasons. Event types and outcomes
+are seeded in a fixed order; values first seen later (and every team and
+player) get the next free code from the single writer: the ETL's batch
+commit, or the columnar exporter.
+
+At ingest the ETL adds ``type_code``, ``outcome_code`` and ``team_code``
+columns to each events frame (``encode_events``). Filters written with
+``type_mask`` / ``outcome_mask`` / ``team_mask`` then compare integers, and
+fall back to the string columns for frames that were not encoded. A value this
+process has not seen encodes to ``UNKNOWN`` until its code is persisted;
+``MISSING`` marks an empty cell (NaN or the ETL's -999). Worker processes get
+the parent's codes with ``snapshot`` / ``merge``. Player codes are only used
+by the columnar exporter.
+"""
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+MISSING = -1
+UNKNOWN = -2
+
+CODE_KINDS = ('type', 'outcome', 'team', 'player')
+
+EVENT_TYPES = (
+    'Pass', 'Ball Receipt*', 'Carry', 'Pressure', 'Ball Recovery', 'Duel', 'Clearance', 'Block',
+    'Dribble', 'Dribbled Past', 'Interception', 'Miscontrol', 'Dispossessed', 'Foul Committed',
+    'Foul Won', 'Shot', 'Goal Keeper', 'Shield', '50/50', 'Offside', 'Error', 'Own Goal For',
+    'Own Goal Against', 'Bad Behaviour', 'Substitution', 'Tactical Shift', 'Starting XI',
+    'Half Start', 'Half End', 'Injury Stoppage', 'Referee Ball-Drop', 'Player On', 'Player Off',
+    'Camera On', 'Camera off',
+)
+OUTCOMES = (
+    'Complete', 'Incomplete', 'Out', 'Pass Offside', 'Injury Clearance', 'Unknown',
+    'Goal', 'Saved', 'Blocked', 'Off T', 'Post', 'Wayward', 'Saved Off Target', 'Saved to Post',
+    'Won', 'Lost', 'Lost In Play', 'Lost Out', 'Success', 'Success In Play', 'Success Out',
+    'Yellow Card', 'Second Yellow', 'Red Card', 'Tactical', 'Injury',
+)
+_SEEDS = {'type': EVENT_TYPES, 'outcome': OUTCOMES}
+
+# Outcome-like columns folded into ``outcome_code``, with the only event type that fills each
+OUTCOME_COLUMNS = {
+    'pass_outcome': 'Pass',
+    'shot_outcome': 'Shot',
+    'dribble_outcome': 'Dribble',
+    'duel_outcome': 'Duel',
+    'interception_outcome': 'Interception',
+    'goalkeeper_outcome': 'Goal Keeper',
+    'ball_receipt_outcome': 'Ball Receipt*',
+    'bad_behaviour_card': 'Bad Behaviour',
+    'foul_committed_card': 'Foul Committed',
+    'substitution_outcome': 'Substitution',
+}
+
+
+def _is_missing(values: pd.Series) -> np.ndarray:
+    return (values.isna() | (values == -999)).to_numpy()
+
+
+def _key(kind: str, value) -> str:
+    # Players are keyed by StatsBomb id; ids arrive as floats once a frame holds NaN
+    return str(int(value)) if kind == 'player' else str(value)
+
+
+class CodeBook:
+    """In-process view of the code tables; ``load`` refreshes it from the database"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._codes = {kind: {value: code for code, value in enumerate(_SEEDS.get(kind, ()))} for kind in CODE_KINDS}
+        self._unseen = {kind: set() for kind in CODE_KINDS}
+        self._stored = None  # (kind, value) pairs already in the table, once loaded
+
+    def load(self):
+        """Merge the persisted codes (needs an app context)"""
+        from models import EventCode
+
+        rows = EventCode.query.all()
+        with self._lock:
+            for row in rows:
+                self._codes[row.kind][row.value] = row.code
+            self._stored = {(row.kind, row.value) for row in rows}
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """The known codes, to seed another process's code book with ``merge``"""
+        with self._lock:
+            return {kind: dict(codes) for kind, codes in self._codes.items()}
+
+    def merge(self, codes: Dict[str, Dict[str, int]]):
+        """Add codes from ``snapshot`` (e.g. in a worker process without a database session)"""
+        with self._lock:
+            for kind, known in codes.items():
+                self._codes[kind].update(known)
+
+    def code(self, kind: str, value) -> int:
+        return self._codes[kind].get(_key(kind, value), UNKNOWN)
+
+    def values(self, kind: str) -> List[str]:
+        """Values indexed by code (None for unused codes)"""
+        codes = self._codes[kind]
+        values = [None] * (max(codes.values()) + 1 if codes else 0)
+        for value, code in codes.items():
+            values[code] = value
+        return values
+
+    def encode(self, kind: str, values: pd.Series) -> np.ndarray:
+        """int32 codes; unseen values become UNKNOWN and are remembered for ``persist``"""
+        codes = np.full(len(values), MISSING, dtype=np.int32)
+        present = ~_is_missing(values)
+        if present.any():
+            keys = values[present].map(lambda value: _key(kind, value))
+            known = self._codes[kind]
+            mapped = keys.map(known)
+            unseen = mapped.isna().to_numpy()
+            if unseen.any():
+                with self._lock:
+                    self._unseen[kind].update(keys[unseen])
+            codes[present] = mapped.fillna(UNKNOWN).to_numpy(dtype=np.int32)
+        return codes
+
+    def take_unseen(self) -> Dict[str, List[str]]:
+        """Values encoded as UNKNOWN since the last call (to hand to the writer)"""
+        with self._lock:
+            unseen = {kind: sorted(values) for kind, values in self._unseen.items() if values}
+            self._unseen = {kind: set() for kind in CODE_KINDS}
+        return unseen
+
+    def persist(self, new_values: Dict[str, Iterable[str]] = None) -> int:
+        """
+        Allocate and store codes for ``new_values`` plus this process's unseen values (no commit)
+
+        Only one writer may run this at a time; it flushes inside a savepoint and
+        reloads the table when another writer got there first.
+        """
+        from sqlalchemy.exc import IntegrityError
+        from utils.db import db
+        from models import EventCode
+
+        if self._stored is None:
+            self.load()
+        pending = self.take_unseen()
+        for kind, values in (new_values or {}).items():
+            pending.setdefault(kind, [])
+            pending[kind] = sorted(set(pending[kind]) | set(values))
+
+        for attempt in range(2):
+            rows = []
+            with self._lock:
+                # Seeded codes are written once, so the table alone can decode stored data
+                for kind, known in self._codes.items():
+                    rows.extend(EventCode(kind=kind, code=code, value=value) for value, code in known.items()
+                                if (kind, value) not in self._stored)
+                for kind, values in pending.items():
+                    known = self._codes[kind]
+                    next_code = max(known.values(), default=-1) + 1
+                    for value in values:
+                        if value not in known:
+                            rows.append(EventCode(kind=kind, code=next_code, value=value))
+                            next_code += 1
+            if not rows:
+                return 0
+            try:
+                with db.session.begin_nested():
+                    db.session.add_all(rows)
+                break
+            except IntegrityError:
+                if attempt:
+                    raise
+                self.load()
+        with self._lock:
+            for row in rows:
+                self._codes[row.kind][row.value] = row.code
+                self._stored.add((row.kind, row.value))
+        return len(rows)
+
+
+codebook = CodeBook()
+
+
+def encode_events(match_df: pd.DataFrame, book: CodeBook = None) -> pd.DataFrame:
+    """Add the integer code columns to an events frame in place; returns the frame"""
+    book = book or codebook
+    event_type = match_df['type']
+    match_df['type_code'] = book.encode('type', event_type)
+    outcome = np.full(len(match_df), MISSING, dtype=np.int32)
+    types = event_type.to_numpy()
+    for column, column_type in OUTCOME_COLUMNS.items():
+        if column in match_df.columns:
+            rows = types == column_type
+            if rows.any():
+                outcome[rows] = book.encode('outcome', match_df[column][rows])
+    match_df['outcome_code'] = outcome
+    match_df['team_code'] = book.encode('team', match_df['team'])
+    return match_df
+
+
+def type_mask(match_df: pd.DataFrame, *event_types: str) -> pd.Series:
+    """Rows whose event type is one of ``event_types`` (by string when one has no code yet)"""
+    if 'type_code' in match_df.columns:
+        codes = [codebook.code('type', event_type) for event_type in event_types]
+        if UNKNOWN not in codes:
+            return pd.Series(np.isin(match_df['type_code'].to_numpy(), codes), index=match_df.index)
+    return match_df['type'].isin(event_types)
+
+
+def outcome_mask(match_df: pd.DataFrame, column: str, *outcomes) -> pd.Series:
+    """
+    Rows whose ``column`` (one of OUTCOME_COLUMNS) holds one of ``outcomes``
+
+    Pass ``None`` as an outcome to match empty cells, e.g. completed passes.
+    """
+    codes = [MISSING if outcome is None else codebook.code('outcome', outcome) for outcome in outcomes]
+    # An outcome without a code yet would also match every row encoded as UNKNOWN
+    if 'outcome_code' in match_df.columns and UNKNOWN not in codes:
+        matched = np.isin(match_df['outcome_code'].to_numpy(), codes)
+        return type_mask(match_df, OUTCOME_COLUMNS[column]) & matched
+    if column not in match_df.columns:
+        return pd.Series(None in outcomes, index=match_df.index) & type_mask(match_df, OUTCOME_COLUMNS[column])
+    values = match_df[column]
+    matched = values.isin([outcome for outcome in outcomes if outcome is not None])
+    if None in outcomes:
+        matched |= pd.Series(_is_missing(values), index=match_df.index)
+    return matched & type_mask(match_df, OUTCOME_COLUMNS[column])
+
+
+def team_mask(match_df: pd.DataFrame, team: str) -> pd.Series:
+    """Rows of ``team`` (by string when it has no code yet)"""
+    code = codebook.code('team', team)
+    if 'team_code' not in match_df.columns or code == UNKNOWN:
+        return match_df['team'] == team
+    codes = match_df['team_code'].to_numpy()
+    matched = codes == code
+    # Rows encoded before this process learnt the team's code
+    unknown = codes == UNKNOWN
+    if unknown.any():
+        matched[unknown] = match_df['team'].to_numpy()[unknown] == team
+    return pd.Series(matched, index=match_df.index)
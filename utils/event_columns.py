@@ -0,0 +1,96 @@
+"""
+Read side of the per-season columnar event store.
+
+``python -m data.etl.event_columns`` writes one directory per season under
+``EVENT_COLUMNS_DIR`` (default ``data/columns``) holding one ``.npy`` file
+per column, all in match order, plus ``offsets.npy``/``match_ids.npy`` and a
+``meta.json`` with the code vocabularies. The files are opened with
+``mmap_mode='r'``, so every process shares the OS page cache, nothing is
+copied on open and a match or team is an O(1) slice or a vectorised mask.
+
+Coordinates are raw StatsBomb values: every event is recorded from the
+acting team's perspective, attacking towards x=120. Missing values are NaN
+(floats) or -1 (``player``).
+"""
+import json
+import os
+import threading
+from typing import Dict
+
+import numpy as np
+
+COLUMN_DTYPES = {
+    'x': np.float32,
+    'y': np.float32,
+    'end_x': np.float32,
+    'end_y': np.float32,
+    'type': np.uint8,
+    'team': np.uint16,
+    'player': np.int32,
+    'period': np.uint8,
+    'minute': np.uint8,
+    'xg': np.float32,
+}
+
+_open_lock = threading.Lock()
+_open_seasons = {}
+
+
+def columns_root() -> str:
+    return os.environ.get('EVENT_COLUMNS_DIR', os.path.join('data', 'columns'))
+
+
+def season_path(season_id: str, root: str = None) -> str:
+    return os.path.join(root or columns_root(), str(season_id))
+
+
+class SeasonColumns:
+    """Memory-mapped columns of one season; slices are read-only views"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.columns = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in COLUMN_DTYPES}
+        self.match_ids = np.load(os.path.join(path, 'match_ids.npy'))
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'))
+        self._match_rows = {int(match_id): i for i, match_id in enumerate(self.match_ids)}
+        self.vocab = {kind: {value: code for code, value in enumerate(values)}
+                      for kind, values in self.meta['vocab'].items()}
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def match_slice(self, match_id: int) -> slice:
+        i = self._match_rows[int(match_id)]
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def match(self, match_id: int) -> Dict[str, np.ndarray]:
+        """Every column of one match (views into the mapped files)"""
+        rows = self.match_slice(match_id)
+        return {name: column[rows] for name, column in self.columns.items()}
+
+    def code(self, kind: str, value) -> int:
+        """Integer code of a 'type', 'team' or 'player' (player id) value; -1 when absent"""
+        return self.vocab[kind].get(value, -1)
+
+    def decode(self, kind: str, code: int):
+        return self.meta['vocab'][kind][code]
+
+    def team_mask(self, team: str) -> np.ndarray:
+        return self.columns['team'] == self.code('team', team)
+
+
+def open_season(season_id: str, root: str = None) -> SeasonColumns:
+    """Per-process cached SeasonColumns, reopened when the season is re-exported"""
+    path = season_path(season_id, root)
+    stamp = os.stat(os.path.join(path, 'meta.json')).st_mtime_ns
+    with _open_lock:
+        cached = _open_seasons.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, SeasonColumns(path))
+            _open_seasons[path] = cached
+    return cached[1]
@@ -0,0 +1,89 @@
+"""
+Fast JSON serialization with native numpy and NaN support.
+
+One serializer for the ETL (plot JSON stored in ``MatchPlot``) and the web
+app (installed as the Flask JSON provider), backed by ``orjson``:
+
+- numpy scalars and C-contiguous numeric arrays are encoded natively; other
+  arrays go through ``tolist()``
+- NaN/inf floats and pandas missing values become ``null`` (the stdlib
+  encoder wrote bare ``NaN``, which ``JSON.parse`` rejects)
+- non-string dict keys are converted to strings, as ``json.dumps`` does
+- output is compact UTF-8; non-ASCII is not escaped
+"""
+import dataclasses
+import decimal
+import hashlib
+from datetime import date
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """Values orjson does not encode itself"""
+    # numpy arrays orjson cannot encode natively (non-contiguous, object dtype) and other numpy scalars;
+    # duck-typed so the web app does not import numpy just to serialize
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    # pandas NA/NaT and friends, without importing pandas here
+    if type(obj).__name__ in ('NAType', 'NaTType'):
+        return None
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumpb(obj, sort_keys: bool = False) -> bytes:
+    return orjson.dumps(obj, default=_default, option=_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    return dumpb(obj, sort_keys).decode('utf-8')
+
+
+def loads(data):
+    return orjson.loads(data)
+
+
+def content_hash(data) -> str:
+    """Short hex digest of a serialized payload, for ETags and content-addressed file names"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _flask_default(obj):
+    # Flask's default provider sends dates as HTTP dates; keep that for API compatibility
+    if isinstance(obj, date) and type(obj).__name__ != 'NaTType':
+        return http_date(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return _default(obj)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by ``dumps``/``loads``; keys are sorted like Flask's default provider"""
+
+    sort_keys = True
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = _OPTIONS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_flask_default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,106 @@
+"""
+Import-time budget check.
+
+Imports each entry point in a fresh interpreter and fails when it takes longer
+than its budget or pulls in a heavy module it doesn't need (the web app never
+needs pandas/plotly/scipy/statsbombpy; ETL workers only load scipy and
+statsbombpy once they actually build a heatmap or fetch events). This keeps
+gunicorn worker boot and process-pool spawn cheap.
+
+Usage:
+    python -m utils.import_budget
+    python -m utils.import_budget --repeat 5 --scale 2.0   # slower CI machine
+    python -m utils.import_budget --importtime web         # show the slowest imports
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'plotly', 'statsbombpy')
+
+# name -> (code to run, budget in seconds, heavy modules allowed after it ran)
+ENTRY_POINTS = {
+    'web': ("import app; app.create_app()", 1.0, ()),
+    'etl_worker': ("import data.etl.create_match_plots_optimized", 2.0, ('pandas', 'numpy')),
+    'etl_telemetry': ("import data.etl.etl_telemetry", 0.1, ()),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')]))
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    return env
+
+
+def measure(code: str) -> dict:
+    """Run ``code`` in a fresh interpreter; return its import time and the heavy modules it loaded"""
+    probe = _PROBE.format(code=code, heavy=HEAVY_MODULES)
+    completed = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, env=_env(),
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(code: str, top: int = 15) -> list:
+    """Top cumulative entries from ``python -X importtime`` as (microseconds, module)"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=PROJECT_ROOT, env=_env(),
+                               capture_output=True, text=True, check=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), module.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def check(names=None, repeat: int = 3, scale: float = 1.0) -> bool:
+    """Check every entry point; best-of-``repeat`` timing so a noisy run doesn't fail the budget"""
+    ok = True
+    for name in names or ENTRY_POINTS:
+        code, budget, allowed = ENTRY_POINTS[name]
+        runs = [measure(code) for _ in range(repeat)]
+        best = min(run['seconds'] for run in runs)
+        unexpected = sorted(set(runs[0]['modules']) - set(allowed))
+        limit = budget * scale
+        passed = best <= limit and not unexpected
+        ok &= passed
+        status = '✅' if passed else '❌'
+        print(f"{status} {name:<14} {best * 1000:8.1f}ms (budget {limit * 1000:.0f}ms)"
+              + (f"  unexpected imports: {', '.join(unexpected)}" if unexpected else ''))
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check import time of the app and ETL entry points")
+    parser.add_argument('names', nargs='*', help=f"Entry points (default: all of {', '.join(ENTRY_POINTS)})")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply every budget (for slow machines)")
+    parser.add_argument('--importtime', action='store_true', help="List the slowest imports instead of checking")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(ENTRY_POINTS)
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(sorted(unknown))}")
+
+    if args.importtime:
+        for name in args.names or ENTRY_POINTS:
+            print(f"{name}:")
+            for cumulative, module in slowest_imports(ENTRY_POINTS[name][0]):
+                print(f"   {cumulative / 1000:8.1f}ms  {module}")
+        return 0
+    return 0 if check(args.names, repeat=args.repeat, scale=args.scale) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Opt-in Prometheus metrics for the Flask app.
+
+Set ``METRICS_ENABLED=1`` to expose ``/metrics`` in the Prometheus text format:
+
+- ``http_request_duration_seconds``: latency histogram per route and method
+- ``http_requests_total``: request counter per route, method and status
+- ``http_response_size_bytes``: response size histogram per route
+- ``flask_cache_lookups_total``: flask_caching hits/misses per route
+- ``db_queries_per_request`` / ``db_query_seconds_per_request``: SQL statement
+  count and total SQL time per request, plus ``db_queries_total``
+
+Under gunicorn, also set ``PROMETHEUS_MULTIPROC_DIR`` to an empty local
+directory shared by the workers (before the app is imported); each worker
+writes its samples there and a scrape of any worker aggregates all of them.
+``gunicorn.conf.py`` clears the directory on start and marks dead workers.
+"""
+import os
+import time
+
+from flask import Flask, Response, g, has_request_context, request
+
+# Routes are labelled by their rule (e.g. /api/plots/<int:match_id>) to keep cardinality bounded
+_UNMATCHED = 'unmatched'
+_metrics = None
+
+
+def metrics_enabled() -> bool:
+    return os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def _route_label() -> str:
+    return request.url_rule.rule if request.url_rule is not None else _UNMATCHED
+
+
+def _create_metrics() -> dict:
+    """Create the metric objects once per process (re-registering raises in prometheus_client)"""
+    from prometheus_client import Counter, Histogram
+
+    return {
+        'latency': Histogram(
+            'http_request_duration_seconds', 'Request latency', ['route', 'method'],
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)),
+        'requests': Counter(
+            'http_requests_total', 'Requests served', ['route', 'method', 'status']),
+        'response_size': Histogram(
+            'http_response_size_bytes', 'Response body size', ['route'],
+            buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)),
+        'cache': Counter(
+            'flask_cache_lookups_total', 'flask_caching lookups by result', ['route', 'result']),
+        'queries_per_request': Histogram(
+            'db_queries_per_request', 'SQL statements issued per request', ['route'],
+            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)),
+        'query_time_per_request': Histogram(
+            'db_query_seconds_per_request', 'Total SQL execution time per request', ['route'],
+            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)),
+        'queries': Counter(
+            'db_queries_total', 'SQL statements issued while serving requests', ['route']),
+    }
+
+
+def _instrument_cache(cache, metrics: dict):
+    """Count hits/misses of ``cache.get``, which ``@cache.cached`` uses for every lookup"""
+    if getattr(cache, '_metrics_instrumented', False):
+        return
+    original_get = cache.get
+
+    def get(*args, **kwargs):
+        value = original_get(*args, **kwargs)
+        if has_request_context():
+            metrics['cache'].labels(_route_label(), 'miss' if value is None else 'hit').inc()
+        return value
+
+    cache.get = get
+    cache._metrics_instrumented = True
+
+
+def _instrument_sqlalchemy():
+    """Time every statement executed while a request is active"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context() and 'metrics_start' in g:
+        g.metrics_db_queries += 1
+        g.metrics_db_seconds += elapsed
+
+
+def init_metrics(app: Flask, cache=None) -> bool:
+    """Register request hooks and the /metrics route when METRICS_ENABLED is set"""
+    global _metrics
+    if not metrics_enabled():
+        return False
+
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+    if _metrics is None:
+        _metrics = _create_metrics()
+    metrics = _metrics
+    if cache is not None:
+        _instrument_cache(cache, metrics)
+    _instrument_sqlalchemy()
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        g.metrics_db_queries = 0
+        g.metrics_db_seconds = 0.0
+
+    @app.after_request
+    def _record_request_metrics(response):
+        if 'metrics_start' not in g or request.path == '/metrics':
+            return response
+        route = _route_label()
+        metrics['latency'].labels(route, request.method).observe(time.perf_counter() - g.metrics_start)
+        metrics['requests'].labels(route, request.method, str(response.status_code)).inc()
+        if response.content_length is not None:
+            metrics['response_size'].labels(route).observe(response.content_length)
+        metrics['queries_per_request'].labels(route).observe(g.metrics_db_queries)
+        metrics['query_time_per_request'].labels(route).observe(g.metrics_db_seconds)
+        if g.metrics_db_queries:
+            metrics['queries'].labels(route).inc(g.metrics_db_queries)
+        return response
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            # Aggregate the samples every worker wrote to the shared directory
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+    return True
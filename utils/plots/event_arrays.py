@@ -0,0 +1,145 @@
+"""
+Compact per-match event arrays for on-demand heatmaps.
+
+The ETL keeps, per match, only what a heatmap needs: the raw StatsBomb
+location of every located event (float32), its team (0 = first team in the
+events, 1 = second), period, a phase bitmask (attack/defense event types)
+and each team's detected attacking direction per half. Any heatmap type,
+half, bin size, sigma or colorscale can then be rebuilt with a few vectorised
+numpy operations instead of reloading and re-parsing the events frame. The
+results match ``generate_heatmap`` for the same parameters.
+"""
+import io
+from typing import Any, Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.event_codes import type_mask
+from utils.plots.match_plots.unified_heatmap import (
+    _create_bins_and_centers, _determine_team_attacking_directions, _generate_phase_filters,
+    _get_dominance_colorscale, _heatmap_defaults, _heatmap_figure, heatmap_from_counts
+)
+
+PHASE_ATTACK = 1
+PHASE_DEFENSE = 2
+HEATMAP_TYPES = ('dominance', 'possession', 'attack', 'defense')
+
+# Attacking direction per (team, half): 1 = towards x=120, -1 = towards x=0, 0 = not detected
+_RIGHT, _LEFT, _UNKNOWN = 1, -1, 0
+
+
+def compact_events(match_data: pd.DataFrame, teams: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Heatmap arrays for a match; ``teams`` fixes the team codes (home first)"""
+    located = match_data[match_data['location'].apply(lambda loc: isinstance(loc, list) and len(loc) == 2)]
+    team_codes = located['team'].map({team: code for code, team in enumerate(teams)})
+    located, team_codes = located[team_codes.notna()], team_codes.dropna()
+    xy = np.array(located['location'].tolist(), dtype=np.float32).reshape(-1, 2)
+
+    phase = (np.where(type_mask(located, *_generate_phase_filters('attack')), PHASE_ATTACK, 0)
+             | np.where(type_mask(located, *_generate_phase_filters('defense')), PHASE_DEFENSE, 0))
+
+    directions = np.full((len(teams), 2), _UNKNOWN, dtype=np.int8)
+    for team, by_period in _determine_team_attacking_directions(match_data).items():
+        if team in teams:
+            for period in (1, 2):
+                directions[list(teams).index(team), period - 1] = _RIGHT if by_period[period] == 'right' else _LEFT
+
+    return {
+        'x': xy[:, 0],
+        'y': xy[:, 1],
+        'team': team_codes.to_numpy(dtype=np.uint8),
+        'period': located['period'].to_numpy(dtype=np.uint8),
+        'phase': phase.astype(np.uint8),
+        'directions': directions,
+        'teams': np.array(list(teams), dtype=str),
+    }
+
+
+def pack_event_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def unpack_event_arrays(data: bytes) -> Dict[str, np.ndarray]:
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def _attacks_right(period: np.ndarray, directions: np.ndarray, team: int, defaults: tuple) -> np.ndarray:
+    """Per-event direction, falling back to ``defaults`` (period 1, period 2, later periods) when undetected"""
+    right = np.where(period == 1, defaults[0], np.where(period == 2, defaults[1], defaults[2]))
+    if directions is not None:
+        for p in (1, 2):
+            if directions[team, p - 1] != _UNKNOWN:
+                right = np.where(period == p, directions[team, p - 1] == _RIGHT, right)
+    return right
+
+
+def _plot_coordinates(x: np.ndarray, y: np.ndarray, flip: np.ndarray):
+    """StatsBomb (length, width) to vertical plot (width, length), rotating flipped events by 180°"""
+    length = np.where(flip, 120 - x.astype(float), x)
+    width = np.where(flip, 80 - y.astype(float), y)
+    return width, length
+
+
+def heatmap_from_arrays(
+    arrays: Dict[str, np.ndarray],
+    heatmap_type: str,
+    half: str = "full",
+    team: int = 0,
+    bins: tuple = None,
+    sigma: float = None,
+    colorscale: Any = None
+) -> Dict[str, Any]:
+    """
+    Heatmap figure from compact event arrays; same parameters as ``generate_heatmap``
+
+    ``team`` selects the side (0 or 1) for possession/attack/defense maps.
+    """
+    defaults = _heatmap_defaults(heatmap_type)
+    bins = tuple(bins or defaults['bins'])
+    x_bins, y_bins, _, _ = _create_bins_and_centers(bins)
+    period = arrays['period']
+    selected = np.ones(len(period), dtype=bool)
+    if half == "first":
+        selected = period == 1
+    elif half == "second":
+        selected = period == 2
+
+    if heatmap_type != "dominance":
+        selected &= arrays['team'] == team
+        if heatmap_type == "attack":
+            selected &= (arrays['phase'] & PHASE_ATTACK) > 0
+        elif heatmap_type == "defense":
+            selected &= (arrays['phase'] & PHASE_DEFENSE) > 0
+        # Defensive event types include no shots, so generate_heatmap never detects directions for them
+        directions = None if heatmap_type == "defense" else arrays['directions']
+        right = _attacks_right(period[selected], directions, team, (True, False, True))
+        width, length = _plot_coordinates(arrays['x'][selected], arrays['y'][selected], ~right)
+        counts, _, _ = np.histogram2d(length, width, bins=[y_bins, x_bins])
+        return heatmap_from_counts(counts, heatmap_type, half, sigma, colorscale)
+
+    # scipy is slow to import and only needed once a heatmap is actually built
+    from scipy.ndimage import gaussian_filter
+
+    event_teams = arrays['team'][selected]
+    if len(np.unique(event_teams)) != 2:
+        raise ValueError("Expected 2 teams for dominance heatmap")
+    # As in generate_heatmap, the side with the first located event is the "dominant" colour
+    team_a = int(event_teams[0])
+    hists = []
+    for side, defaults_right, flip_when_right in ((team_a, (True, False, True), False),
+                                                  (1 - team_a, (False, True, False), True)):
+        mask = selected & (arrays['team'] == side)
+        right = _attacks_right(period[mask], arrays['directions'], side, defaults_right)
+        width, length = _plot_coordinates(arrays['x'][mask], arrays['y'][mask], right if flip_when_right else ~right)
+        hists.append(np.histogram2d(length, width, bins=[y_bins, x_bins])[0])
+
+    a_hist, b_hist = hists
+    total_actions = a_hist + b_hist
+    dominance_ratio = np.divide(a_hist, total_actions, out=np.full_like(a_hist, 0.5), where=total_actions != 0)
+    heatmap_data = np.clip(gaussian_filter(dominance_ratio, sigma=sigma or defaults['sigma']), 0.0, 1.0)
+    return _heatmap_figure(heatmap_data, 0, 1, bins, colorscale or _get_dominance_colorscale(), half,
+                           defaults['title_prefix'])
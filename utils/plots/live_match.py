@@ -0,0 +1,345 @@
+"""
+Incremental plot state for live or replayed matches.
+
+``LiveMatchEngine`` takes event batches in feed order (``sb.events`` columns,
+chronological) and folds each one into running state instead of rebuilding
+from the whole event list:
+
+- cumulative xG and goals: each team's shot/goal rows and period boundaries
+  (the points of ``cumulative_change_points``)
+- momentum: per-(minute, possession team) xT sums of passes and carries
+- team heatmaps: per-(team, phase, period) count grids for both attacking
+  directions, so a change of detected direction only swaps grids
+- match summary: goals per period and per-player contribution tallies
+
+``update`` returns only the plots whose figure changed. Once every event has
+been fed, the plots equal the ETL's for the same events; momentum bars agree
+to float rounding, since the sums are added in feed order. xT zones are cut
+over the observed range, as in ``momentum_per_minute``, so a batch that
+widens the range re-bins the stored pass/carry coordinates. Dominance
+heatmaps need every located event of both teams and are left to the ETL.
+
+Usage:
+    engine = LiveMatchEngine()
+    for batch in feed:
+        for plot_type, figure in engine.update(batch).items():
+            publish(plot_type, figure)
+"""
+import bisect
+from collections import Counter, defaultdict
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from utils.analytics.match_analytics.match_analysis_utils import contribution_string
+from utils.plots.match_plots.momentum_per_game import generate_momentum_graph_from_minutes, load_xT
+from utils.plots.match_plots.unified_heatmap import (
+    TEAM_HEATMAP_BINS, TEAM_HEATMAP_TYPES, _create_bins_and_centers, _generate_phase_filters,
+    counts_for_half, heatmap_from_counts
+)
+from utils.plots.match_plots.xG_per_game import xg_graph_figure
+from utils.plots.plot_factory import match_summary_plot
+
+TEAM_PREFIXES = ('home_team', 'away_team')
+HALVES = ('full', 'first', 'second')
+
+# Team heatmap plot types -> (team prefix, phase, half), including the older possession aliases
+TEAM_HEATMAP_KEYS = {
+    f"{prefix}_{phase}_{half}": (prefix, phase, half)
+    for prefix in TEAM_PREFIXES for phase in TEAM_HEATMAP_TYPES for half in HALVES
+}
+TEAM_HEATMAP_KEYS.update({
+    f"{prefix}_heatmap{'' if half == 'full' else '_' + half}": (prefix, 'possession', half)
+    for prefix in TEAM_PREFIXES for half in HALVES
+})
+LIVE_PLOT_TYPES = ('xg_graph', 'momentum_graph', 'match_summary') + tuple(TEAM_HEATMAP_KEYS)
+
+
+def _column(batch: pd.DataFrame, name: str) -> pd.Series:
+    """A batch column, or all-NaN when no event of the batch has it"""
+    return batch[name] if name in batch.columns else pd.Series(np.nan, index=batch.index, dtype=object)
+
+
+def _is_point(value, size: int = 2) -> bool:
+    return isinstance(value, list) and len(value) >= size
+
+
+def _heatmap_keys(prefix: str, phase: str, period: int) -> List[str]:
+    """Plot types whose grids include ``period``"""
+    halves = {'full'} | ({'first'} if period == 1 else {'second'} if period == 2 else set())
+    return [key for key, (key_prefix, key_phase, half) in TEAM_HEATMAP_KEYS.items()
+            if key_prefix == prefix and key_phase == phase and half in halves]
+
+
+class LiveMatchEngine:
+    """Running plot state of one match, updated batch by batch"""
+
+    def __init__(self):
+        self.teams: List[str] = []  # home, away: the first two teams in feed order
+        self.events = 0
+        self._plots: Dict[str, Any] = {}
+
+        # xG: per team, sorted (minute, seq, xg, goal) shot/goal rows and each period's first/last (minute, seq)
+        self._periods = set()
+        self._last_minute = 0
+        self._xg_rows = defaultdict(list)
+        self._period_first = defaultdict(dict)
+        self._period_last = defaultdict(dict)
+
+        # Momentum: pass/carry coordinates kept for re-binning, their range and the per-minute sums
+        self._xt = np.asarray(load_xT())
+        self._actions = {name: [] for name in ('minute', 'team', 'sx', 'sy', 'ex', 'ey')}
+        self._ranges = None
+        self._edges = None
+        self._momentum = defaultdict(float)
+
+        # Heatmaps: (team, phase) -> {period: {'right': counts, 'left': counts}}; shot x sums per (team, period)
+        self._grids = defaultdict(dict)
+        self._shot_x = {}
+
+        # Summary: starters, replacements in order, (team, player) tallies and (team, period) of each goal
+        self._starters = {}
+        self._replacements = defaultdict(list)
+        self._tally = defaultdict(Counter)
+        self._goals = []
+
+    @property
+    def home_team(self) -> str:
+        return self.teams[0] if self.teams else "Unknown"
+
+    @property
+    def away_team(self) -> str:
+        return self.teams[1] if len(self.teams) > 1 else self.home_team
+
+    def update(self, batch: pd.DataFrame) -> Dict[str, Any]:
+        """Fold in the next events (feed order); returns the plots whose figure changed"""
+        if batch.empty:
+            return {}
+        for team in batch['team'].dropna().unique():
+            if team not in self.teams and len(self.teams) < 2:
+                self.teams.append(team)
+        seq = np.arange(self.events, self.events + len(batch))
+        self.events += len(batch)
+
+        dirty = {}
+        for keys in (self._update_xg(batch, seq), self._update_momentum(batch),
+                     self._update_grids(batch), self._update_summary(batch)):
+            dirty.update(dict.fromkeys(keys))
+
+        changed = {}
+        for plot_type in dirty:
+            figure = self._render(plot_type)
+            if figure is not None and figure != self._plots.get(plot_type):
+                self._plots[plot_type] = changed[plot_type] = figure
+        return changed
+
+    def plots(self) -> Dict[str, Any]:
+        """Every plot the engine maintains, as of the events fed so far"""
+        plots = {}
+        for plot_type in LIVE_PLOT_TYPES:
+            figure = self._render(plot_type)
+            if figure is not None:
+                plots[plot_type] = figure
+        return plots
+
+    def _render(self, plot_type: str):
+        if plot_type == 'xg_graph':
+            return xg_graph_figure(self._xg_points(self.home_team), self._xg_points(self.away_team),
+                                   self._periods, self._last_minute)
+        if plot_type == 'momentum_graph':
+            return self._momentum_figure()
+        if plot_type == 'match_summary':
+            return self._summary()
+        prefix, phase, half = TEAM_HEATMAP_KEYS[plot_type]
+        team = self.home_team if prefix == 'home_team' else self.away_team
+        grids = {period: counts[self._direction(team, phase, period)]
+                 for period, counts in self._grids[(team, phase)].items()}
+        return heatmap_from_counts(counts_for_half(grids, half), phase, half)
+
+    # Cumulative xG
+
+    def _update_xg(self, batch: pd.DataFrame, seq: np.ndarray) -> List[str]:
+        minute = batch['minute'].to_numpy()
+        period = batch['period'].to_numpy()
+        self._periods.update(period.tolist())
+        self._last_minute = max(self._last_minute, int(minute.max()))
+        xg = pd.to_numeric(_column(batch, 'shot_statsbomb_xg'), errors='coerce').fillna(0).to_numpy(dtype=float)
+        xg[xg == -999] = 0
+        goal = (_column(batch, 'shot_outcome') == 'Goal').to_numpy()
+
+        for i, team in enumerate(batch['team'].to_numpy()):
+            if team not in self.teams:
+                continue
+            key = (int(minute[i]), int(seq[i]))
+            first, last = self._period_first[team], self._period_last[team]
+            p = int(period[i])
+            if p not in first or key < first[p]:
+                first[p] = key
+            if p not in last or key > last[p]:
+                last[p] = key
+            if xg[i] != 0 or goal[i]:
+                # Rows keep feed order within a minute, as the stable sort of the batch build
+                bisect.insort(self._xg_rows[team], key + (xg[i], bool(goal[i])))
+        return ['xg_graph']
+
+    def _xg_points(self, team: str) -> Dict[str, list]:
+        rows = {(minute, seq): (xg, goal) for minute, seq, xg, goal in self._xg_rows[team]}
+        keys = set(rows) | set(self._period_first[team].values()) | set(self._period_last[team].values())
+        points = {'minute': [], 'cum_xg': [], 'cum_goals': []}
+        cum_xg, cum_goals = 0.0, 0
+        for key in sorted(keys):
+            xg, goal = rows.get(key, (0.0, False))
+            cum_xg += xg
+            cum_goals += goal
+            points['minute'].append(key[0])
+            points['cum_xg'].append(cum_xg)
+            points['cum_goals'].append(float(cum_goals))
+        return points
+
+    # Momentum
+
+    def _update_momentum(self, batch: pd.DataFrame) -> List[str]:
+        actions = batch[batch['type'].isin(('Pass', 'Carry'))]
+        if actions.empty:
+            return []
+        end = _column(actions, 'pass_end_location').where(actions['type'] == 'Pass',
+                                                          _column(actions, 'carry_end_location'))
+        located = _column(actions, 'location').map(_is_point).to_numpy() & end.map(_is_point).to_numpy()
+        if not located.any():
+            return []
+        start = np.array(_column(actions, 'location')[located].map(lambda loc: loc[:2]).tolist(), dtype=float)
+        end = np.array(end[located].map(lambda loc: loc[:2]).tolist(), dtype=float)
+        new = {'minute': actions['minute'][located].tolist(), 'team': actions['possession_team'][located].tolist(),
+               'sx': start[:, 0], 'sy': start[:, 1], 'ex': end[:, 0], 'ey': end[:, 1]}
+        for name, values in new.items():
+            self._actions[name].extend(values)
+
+        ranges = {}
+        for dim in ('sx', 'sy', 'ex', 'ey'):
+            low, high = self._ranges[dim] if self._ranges else (np.inf, -np.inf)
+            ranges[dim] = (min(low, new[dim].min()), max(high, new[dim].max()))
+        if ranges != self._ranges:
+            # Zones are cut over the observed range: a wider range moves every edge, so re-bin it all
+            self._ranges = ranges
+            xt_rows, xt_cols = self._xt.shape
+            self._edges = {dim: pd.cut(np.asarray(self._actions[dim]), bins=xt_cols if dim.endswith('x') else xt_rows,
+                                       retbins=True)[1] for dim in ranges}
+            self._momentum.clear()
+            self._add_momentum(self._actions)
+        else:
+            self._add_momentum(new)
+        return ['momentum_graph']
+
+    def _add_momentum(self, actions: Dict[str, Any]):
+        def zone(dim):
+            # pd.cut(..., labels=False) for values inside the range the edges were cut from
+            return np.searchsorted(self._edges[dim], np.asarray(actions[dim]), side='left') - 1
+
+        xt = self._xt[zone('ey'), zone('ex')] - self._xt[zone('sy'), zone('sx')]
+        for minute, team, value in zip(actions['minute'], actions['team'], xt.tolist()):
+            # Actions without a possession team still count towards the zone range
+            if isinstance(team, str):
+                self._momentum[(minute, team)] += value
+
+    def _momentum_figure(self):
+        teams = {team for _, team in self._momentum}
+        if self.home_team not in teams or self.away_team not in teams:
+            return None
+        summed = pd.DataFrame([(minute, team, value) for (minute, team), value in sorted(self._momentum.items())],
+                              columns=['minute', 'possession_team', 'xT'])
+        return generate_momentum_graph_from_minutes(summed, self.home_team, self.away_team)
+
+    # Team heatmaps
+
+    def _direction(self, team: str, phase: str, period: int) -> str:
+        """Attacking direction as ``_determine_team_attacking_directions`` would find it now"""
+        if period not in (1, 2):
+            return 'right'
+        total, count = self._shot_x.get((team, period), (0.0, 0))
+        # Defensive events hold no shots, so that phase always uses the fallback
+        if phase == 'defense' or not count:
+            return 'right' if period == 1 else 'left'
+        return 'right' if total / count > 60 else 'left'
+
+    def _update_grids(self, batch: pd.DataFrame) -> List[str]:
+        dirty = []
+        x_bins, y_bins, _, _ = _create_bins_and_centers(TEAM_HEATMAP_BINS)
+        teams = batch['team'].to_numpy()
+        types = batch['type'].to_numpy()
+        periods = batch['period'].to_numpy()
+        locations = _column(batch, 'location').to_numpy()
+        located = np.array([isinstance(loc, list) and len(loc) == 2 for loc in locations], dtype=bool)
+        located &= ~pd.isna(periods)
+        for prefix, team in zip(TEAM_PREFIXES, self.teams):
+            before = {period: self._direction(team, 'possession', period) for period in (1, 2)}
+            for i in np.flatnonzero((teams == team) & (types == 'Shot') & np.isin(periods, (1, 2))):
+                if _is_point(locations[i]):
+                    period = int(periods[i])
+                    total, count = self._shot_x.get((team, period), (0.0, 0))
+                    self._shot_x[(team, period)] = (total + locations[i][0], count + 1)
+            for period, direction in before.items():
+                if self._direction(team, 'possession', period) != direction:
+                    dirty += _heatmap_keys(prefix, 'possession', period) + _heatmap_keys(prefix, 'attack', period)
+
+            rows = located & (teams == team)
+            if not rows.any():
+                continue
+            points = np.array(locations[rows].tolist(), dtype=float)
+            for phase in TEAM_HEATMAP_TYPES:
+                in_phase = np.ones(len(points), dtype=bool) if phase == 'possession' else \
+                    np.isin(types[rows], _generate_phase_filters(phase))
+                for period in np.unique(periods[rows][in_phase]):
+                    x_sb, y_sb = points[in_phase & (periods[rows] == period)].T
+                    counts = self._grids[(team, phase)].setdefault(
+                        int(period), {'right': np.zeros(TEAM_HEATMAP_BINS), 'left': np.zeros(TEAM_HEATMAP_BINS)})
+                    # Plot coordinates: x = pitch width, y = pitch length; 'left' flips to attack upwards
+                    counts['right'] += np.histogram2d(x_sb, y_sb, bins=[y_bins, x_bins])[0]
+                    counts['left'] += np.histogram2d(120 - x_sb, 80 - y_sb, bins=[y_bins, x_bins])[0]
+                    dirty += _heatmap_keys(prefix, phase, int(period))
+        return dirty
+
+    # Match summary
+
+    def _update_summary(self, batch: pd.DataFrame) -> List[str]:
+        types = batch['type']
+        starting = batch[types == 'Starting XI']
+        for team, tactics in zip(starting['team'], _column(starting, 'tactics')):
+            if team not in self._starters and isinstance(tactics, dict):
+                self._starters[team] = [player['player']['name'] for player in tactics['lineup']]
+
+        tallies = [
+            (batch[(types == 'Shot') & (_column(batch, 'shot_outcome') == 'Goal')], 'player', 'goals'),
+            (batch[_column(batch, 'pass_goal_assist') == True], 'player', 'assists'),  # noqa: E712
+            (batch[_column(batch, 'bad_behaviour_card') == 'Yellow Card'], 'player', 'yellow cards'),
+            (batch[_column(batch, 'bad_behaviour_card') == 'Red Card'], 'player', 'red cards'),
+            (batch[types == 'Substitution'], 'substitution_replacement', 'subbed on'),
+            (batch[types == 'Substitution'], 'player', 'subbed off'),
+        ]
+        changed = bool(len(starting))
+        for rows, column, stat in tallies:
+            for team, player in zip(rows['team'], _column(rows, column)):
+                if isinstance(player, str):
+                    self._tally[(team, player)][stat] += 1
+                    if stat == 'subbed on':
+                        self._replacements[team].append(player)
+                changed = True
+        goals = tallies[0][0]
+        self._goals.extend(zip(goals['team'], goals['period'].astype(int)))
+        return ['match_summary'] if changed else []
+
+    def _summary(self) -> Dict[str, Any]:
+        home, away = self.home_team, self.away_team
+        score = Counter()
+        for team, period in self._goals:
+            phase = 'norm' if period in (1, 2) else 'et' if period in (3, 4) else 'pen' if period == 5 else None
+            score[('home' if team == home else 'away', phase)] += 1
+
+        def rows(team):
+            players = self._starters.get(team, []) + self._replacements[team]
+            return [(player, contribution_string(self._tally.get((team, player), {}))) for player in players]
+
+        return match_summary_plot(rows(home), rows(away), home, away,
+                                  score[('home', 'norm')], score[('away', 'norm')],
+                                  score[('home', 'et')], score[('away', 'et')],
+                                  score[('home', 'pen')], score[('away', 'pen')])
@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
 import logging
 import os
 
+from utils.event_codes import type_mask
+
 def load_xT():
     # Get the directory of the current script
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,28 +20,36 @@ def load_xT():
         raise RuntimeError(f"xT_Grid.csv file not found at: {file_path}") from e
 
 
-def generate_momentum_graph_plot(match_data: pd.DataFrame, home_team: str, away_team: str):
-    match_data = match_data[['minute', 'possession_team', 'type', 'location', 'pass_outcome', 'pass_end_location', 'carry_end_location']]
-    filtered_data = match_data.loc[(match_data['type'] == 'Pass') | (match_data['type'] == 'Carry')]
+def momentum_per_minute(match_data: pd.DataFrame) -> pd.DataFrame:
+    """xT added by passes and carries, summed per (minute, possession_team)"""
+    return momentum_from_actions(action_xt(match_data))
+
+
+def action_xt(match_data: pd.DataFrame) -> pd.DataFrame:
+    """Passes and carries with the xT each one added (``xT`` column)"""
+    is_pass = type_mask(match_data, 'Pass')
+    actions = is_pass | type_mask(match_data, 'Carry')
+    is_pass = is_pass[actions].to_numpy()
+    filtered_data = match_data.loc[actions, ['minute', 'possession_team', 'type', 'location', 'pass_outcome',
+                                             'pass_end_location', 'carry_end_location']]
 
     # Handle pass_outcome for Pass type, and carry_end_location for Carry type
-    filtered_data.loc[filtered_data['type'] == 'Pass', 'pass_outcome'] = filtered_data.loc[
-        filtered_data['type'] == 'Pass', 'pass_outcome'].fillna('Successful')
+    filtered_data.loc[is_pass, 'pass_outcome'] = filtered_data.loc[is_pass, 'pass_outcome'].fillna('Successful')
 
     # Split 'location' into start_x and start_y for all rows
     filtered_data[['start_x', 'start_y']] = pd.DataFrame(filtered_data['location'].tolist(), index=filtered_data.index)
 
     # For Pass type: set end_x and end_y from 'pass_end_location'
-    filtered_data.loc[filtered_data['type'] == 'Pass', 'end_x'] = filtered_data.loc[
-        filtered_data['type'] == 'Pass', 'pass_end_location'].apply(lambda x: x[0] if isinstance(x, list) else None)
-    filtered_data.loc[filtered_data['type'] == 'Pass', 'end_y'] = filtered_data.loc[
-        filtered_data['type'] == 'Pass', 'pass_end_location'].apply(lambda x: x[1] if isinstance(x, list) else None)
+    filtered_data.loc[is_pass, 'end_x'] = filtered_data.loc[
+        is_pass, 'pass_end_location'].apply(lambda x: x[0] if isinstance(x, list) else None)
+    filtered_data.loc[is_pass, 'end_y'] = filtered_data.loc[
+        is_pass, 'pass_end_location'].apply(lambda x: x[1] if isinstance(x, list) else None)
 
     # For Carry type: set end_x and end_y from 'carry_end_location'
-    filtered_data.loc[filtered_data['type'] == 'Carry', 'end_x'] = filtered_data.loc[
-        filtered_data['type'] == 'Carry', 'carry_end_location'].apply(lambda x: x[0] if isinstance(x, list) else None)
-    filtered_data.loc[filtered_data['type'] == 'Carry', 'end_y'] = filtered_data.loc[
-        filtered_data['type'] == 'Carry', 'carry_end_location'].apply(lambda x: x[1] if isinstance(x, list) else None)
+    filtered_data.loc[~is_pass, 'end_x'] = filtered_data.loc[
+        ~is_pass, 'carry_end_location'].apply(lambda x: x[0] if isinstance(x, list) else None)
+    filtered_data.loc[~is_pass, 'end_y'] = filtered_data.loc[
+        ~is_pass, 'carry_end_location'].apply(lambda x: x[1] if isinstance(x, list) else None)
 
 
     xT = load_xT()
@@ -53,14 +62,32 @@ def generate_momentum_graph_plot(match_data: pd.DataFrame, home_team: str, away_
     filtered_data['start_zone_value'] = filtered_data[['x1_bin', 'y1_bin']].apply(lambda x: xT[x[1]][x[0]], axis=1)
     filtered_data['end_zone_value'] = filtered_data[['x2_bin', 'y2_bin']].apply(lambda x: xT[x[1]][x[0]], axis=1)
     filtered_data['xT'] = filtered_data['end_zone_value'] - filtered_data['start_zone_value']
+    return filtered_data
+
+
+def momentum_from_actions(actions: pd.DataFrame) -> pd.DataFrame:
+    """Per-(minute, possession_team) sums of ``action_xt`` output"""
     summed_data = (
-        filtered_data
+        actions
         .groupby(['minute', 'possession_team'])['xT']
         .sum()
         .reset_index()
     )
+    return summed_data
+
+
+def momentum_totals(summed_data: pd.DataFrame) -> dict:
+    """Per-team sum of the momentum bars (positive per-minute xT only)"""
+    positive = summed_data['xT'].clip(lower=0)
+    return {team: float(total) for team, total in positive.groupby(summed_data['possession_team']).sum().items()}
+
+
+def generate_momentum_graph_plot(match_data: pd.DataFrame, home_team: str, away_team: str):
+    return generate_momentum_graph_from_minutes(momentum_per_minute(match_data), home_team, away_team)
 
 
+def generate_momentum_graph_from_minutes(summed_data: pd.DataFrame, home_team: str, away_team: str):
+    """Momentum bar chart from ``momentum_per_minute`` output"""
     home_team_data = summed_data[summed_data['possession_team'] == home_team]
     away_team_data = summed_data[summed_data['possession_team'] == away_team]
 
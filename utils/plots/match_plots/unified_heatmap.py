@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from scipy.ndimage import gaussian_filter
+
+from utils.event_codes import type_mask
 
 
 def _generate_pitch_shapes_vertical():
@@ -35,7 +35,7 @@ def _generate_phase_filters(phase: str):
 
 def _determine_team_attacking_directions(match_data: pd.DataFrame) -> dict:
     """Determine which direction each team attacks in each half based on shot locations"""
-    shot_data = match_data[match_data['type'] == 'Shot'].copy()
+    shot_data = match_data[type_mask(match_data, 'Shot')].copy()
     
     if shot_data.empty:
         # Fallback: assume standard setup if no shots available
@@ -195,173 +195,68 @@ def _normalize_heatmap_data(data: np.ndarray, normalization_type: str = "percent
         return data, None, None
 
 
-def generate_heatmap(
-    match_data: pd.DataFrame,
-    heatmap_type: str,
-    half: str = "full",
-    bins: tuple = None,
-    sigma: float = None,
-    colorscale = None,
-    title_prefix: str = None
-) -> dict:
+TEAM_HEATMAP_TYPES = ('possession', 'attack', 'defense')
+TEAM_HEATMAP_BINS = (48, 32)
+
+
+def _team_location_data(match_data: pd.DataFrame, heatmap_type: str):
+    """Normalized locations for a single-team heatmap (all periods), or None when the phase has no events"""
+    if heatmap_type == "possession" or 'type' not in match_data.columns:
+        # Fallback to all location data if no type column
+        return _preprocess_location_data(match_data)
+
+    # Filter original match data by event type, then preprocess
+    phase_match_data = match_data[type_mask(match_data, *_generate_phase_filters(heatmap_type))]
+    if phase_match_data.empty:
+        return None
+    return _preprocess_location_data(phase_match_data)
+
+
+def team_count_grids(match_data: pd.DataFrame, heatmap_type: str, bins: tuple = TEAM_HEATMAP_BINS) -> dict:
     """
-    Unified heatmap generation function
-    
-    Args:
-        match_data: DataFrame containing match event data
-        heatmap_type: 'dominance', 'possession', 'attack', or 'defense'
-        half: 'full', 'first', or 'second'
-        bins: Custom bin size (y, x). Defaults: dominance=(24,16), possession=(48,32)
-        sigma: Gaussian filter sigma. Defaults: dominance=1.5, possession=2.5
-        colorscale: Custom colorscale. Defaults: dominance=custom, possession='Viridis'
-        title_prefix: Custom title prefix
-    
+    Unsmoothed event counts of one team for a heatmap type, split by period
+
     Returns:
-        Plotly figure as JSON dict
+        {period: (bins[0], bins[1]) array}. Counts are additive, so grids from
+        several periods or matches can be summed before smoothing.
     """
-    
-    # Set defaults based on heatmap type - ALL use dominance colorscale for consistency
+    x_bins, y_bins, _, _ = _create_bins_and_centers(bins)
+    location_data = _team_location_data(match_data, heatmap_type)
+    grids = {}
+    if location_data is None:
+        return grids
+    for period, period_data in location_data.groupby('period'):
+        grids[int(period)], _, _ = np.histogram2d(period_data['y'], period_data['x'], bins=[y_bins, x_bins])
+    return grids
+
+
+def counts_for_half(grids: dict, half: str = "full", bins: tuple = TEAM_HEATMAP_BINS) -> np.ndarray:
+    """Sum per-period count grids for 'full' (every period), 'first' (period 1) or 'second' (period 2)"""
+    periods = {"first": (1,), "second": (2,)}.get(half)
+    counts = np.zeros(bins)
+    for period, grid in grids.items():
+        if periods is None or period in periods:
+            counts += grid
+    return counts
+
+
+def _heatmap_defaults(heatmap_type: str) -> dict:
+    """Default bins/sigma/title/normalization per heatmap type - ALL use dominance colorscale for consistency"""
     if heatmap_type == "dominance":
-        bins = bins or (24, 16)
-        sigma = sigma or 1.5
-        colorscale = colorscale or _get_dominance_colorscale()
-        title_prefix = title_prefix or "Dominant Team Map"
-        normalization_type = "none"  # Dominance already normalized to 0-1
-    elif heatmap_type == "possession":
-        bins = bins or (48, 32)
-        sigma = sigma or 2.5
-        colorscale = colorscale or _get_dominance_colorscale()  # Use dominance colorscale
-        title_prefix = title_prefix or "Possession Map"
-        normalization_type = "percentile"
-    elif heatmap_type == "attack":
-        bins = bins or (48, 32)
-        sigma = sigma or 2.5
-        colorscale = colorscale or _get_dominance_colorscale()  # Use dominance colorscale
-        title_prefix = title_prefix or "Attack Map"
-        normalization_type = "percentile"
-        phase_filter = _generate_phase_filters("attack")
-    elif heatmap_type == "defense":
-        bins = bins or (48, 32)
-        sigma = sigma or 2.5
-        colorscale = colorscale or _get_dominance_colorscale()  # Use dominance colorscale
-        title_prefix = title_prefix or "Defense Map"
-        normalization_type = "percentile"
-        phase_filter = _generate_phase_filters("defense")
-    else:
+        # Dominance already normalized to 0-1
+        return {'bins': (24, 16), 'sigma': 1.5, 'title_prefix': "Dominant Team Map", 'normalization_type': "none"}
+    titles = {"possession": "Possession Map", "attack": "Attack Map", "defense": "Defense Map"}
+    if heatmap_type not in titles:
         raise ValueError(f"Unknown heatmap_type: {heatmap_type}. Must be 'dominance', 'possession', 'attack', or 'defense'")
-    
-    # Create bins and centers
-    x_bins, y_bins, x_centers, y_centers = _create_bins_and_centers(bins)
-    
-    # Generate heatmap data based on type
-    if heatmap_type == "dominance":
-        # For dominance heatmaps, we need to process both teams' data separately with normalization
-        location_data = match_data[['location', 'team', 'period']].dropna()
-        location_data = location_data[location_data['location'].apply(lambda loc: isinstance(loc, list) and len(loc) == 2)]
-        
-        # Extract coordinates
-        location_data[['x', 'y']] = pd.DataFrame(location_data['location'].tolist(), index=location_data.index)
-        
-        # Apply half filter
-        if half == "first":
-            location_data = location_data[location_data['period'] == 1]
-        elif half == "second":
-            location_data = location_data[location_data['period'] == 2]
-        
-        teams = location_data['team'].unique()
-        if len(teams) != 2:
-            raise ValueError(f"Expected 2 teams for dominance heatmap, found {teams}")
-        
-        team_a, team_b = teams
-        
-        # Determine actual attacking directions for both teams
-        attacking_directions = _determine_team_attacking_directions(match_data)
-        team_a_directions = attacking_directions.get(team_a, {1: 'right', 2: 'left'})
-        team_b_directions = attacking_directions.get(team_b, {1: 'left', 2: 'right'})
-        
-        # Normalize coordinates so teams attack in consistent direction for dominance comparison
-        def normalize_dominance(loc, team, period):
-            x_sb, y_sb = loc  # StatsBomb: x = length (0-120), y = width (0-80)
-            
-            # Get the team's actual attacking direction for this period
-            if team == team_a:
-                attacking_direction = team_a_directions.get(period, 'right')
-                # Normalize team_a to always attack towards y=120 (top of pitch)
-                if attacking_direction == 'left':
-                    x_sb = 120 - x_sb  # Flip length coordinate
-                    y_sb = 80 - y_sb   # Flip width coordinate
-            else:  # team_b
-                attacking_direction = team_b_directions.get(period, 'left')
-                # Normalize team_b to always attack towards y=0 (bottom of pitch)
-                if attacking_direction == 'right':
-                    x_sb = 120 - x_sb  # Flip length coordinate
-                    y_sb = 80 - y_sb   # Flip width coordinate
-            
-            # Convert to plot coordinates: x = width (horizontal), y = length (vertical)
-            return [y_sb, x_sb]
-        
-        location_data['normalized_location'] = location_data.apply(
-            lambda row: normalize_dominance([row['x'], row['y']], row['team'], row['period']),
-            axis=1
-        )
-        
-        location_data[['norm_x', 'norm_y']] = pd.DataFrame(location_data['normalized_location'].tolist(), index=location_data.index)
-        
-        team_a_data = location_data[location_data['team'] == team_a]
-        team_b_data = location_data[location_data['team'] == team_b]
-        
-        # Use normalized coordinates for histogram
-        a_hist, _, _ = np.histogram2d(team_a_data['norm_y'], team_a_data['norm_x'], bins=[y_bins, x_bins])
-        b_hist, _, _ = np.histogram2d(team_b_data['norm_y'], team_b_data['norm_x'], bins=[y_bins, x_bins])
-        
-        total_actions = a_hist + b_hist
-        with np.errstate(divide='ignore', invalid='ignore'):
-            dominance_ratio = np.divide(a_hist, total_actions, where=total_actions != 0)
-            dominance_ratio = np.nan_to_num(dominance_ratio, nan=0.5)  # Default to neutral if zero actions
-        
-        heatmap_data = gaussian_filter(dominance_ratio, sigma=sigma)
-        heatmap_data = np.clip(heatmap_data, 0.0, 1.0)
-        zmin, zmax = 0, 1  # Set explicit range for dominance heatmaps
-        
-    else:
-        # For single-team heatmaps (possession, attack, defense), use the preprocessing function
-        location_data = _preprocess_location_data(match_data, half)
-        
-        if heatmap_type == "possession":
-            team_hist, _, _ = np.histogram2d(location_data['y'], location_data['x'], bins=[y_bins, x_bins])
-            raw_heatmap_data = gaussian_filter(team_hist, sigma=sigma)
-        elif heatmap_type == "attack":
-            # Check if we have the required column for filtering
-            if 'type' in match_data.columns:
-                # Filter original match data by event type, then preprocess
-                attack_match_data = match_data[match_data['type'].isin(phase_filter)]
-                if not attack_match_data.empty:
-                    attack_location_data = _preprocess_location_data(attack_match_data, half)
-                    attack_hist, _, _ = np.histogram2d(attack_location_data['y'], attack_location_data['x'], bins=[y_bins, x_bins])
-                else:
-                    attack_hist = np.zeros((len(y_bins)-1, len(x_bins)-1))
-            else:
-                # Fallback to all location data if no type column
-                attack_hist, _, _ = np.histogram2d(location_data['y'], location_data['x'], bins=[y_bins, x_bins])
-            raw_heatmap_data = gaussian_filter(attack_hist, sigma=sigma)
-        elif heatmap_type == "defense":
-            # Check if we have the required column for filtering
-            if 'type' in match_data.columns:
-                # Filter original match data by event type, then preprocess
-                defense_match_data = match_data[match_data['type'].isin(phase_filter)]
-                if not defense_match_data.empty:
-                    defense_location_data = _preprocess_location_data(defense_match_data, half)
-                    defense_hist, _, _ = np.histogram2d(defense_location_data['y'], defense_location_data['x'], bins=[y_bins, x_bins])
-                else:
-                    defense_hist = np.zeros((len(y_bins)-1, len(x_bins)-1))
-            else:
-                # Fallback to all location data if no type column
-                defense_hist, _, _ = np.histogram2d(location_data['y'], location_data['x'], bins=[y_bins, x_bins])
-            raw_heatmap_data = gaussian_filter(defense_hist, sigma=sigma)
-        
-        # Apply normalization to team heatmaps
-        heatmap_data, zmin, zmax = _normalize_heatmap_data(raw_heatmap_data, normalization_type)
-    
+    return {'bins': TEAM_HEATMAP_BINS, 'sigma': 2.5, 'title_prefix': titles[heatmap_type],
+            'normalization_type': "percentile"}
+
+
+def _heatmap_figure(heatmap_data: np.ndarray, zmin, zmax, bins: tuple, colorscale, half: str,
+                    title_prefix: str) -> dict:
+    """Wrap heatmap values in the Plotly figure dict used by every heatmap"""
+    _, _, x_centers, y_centers = _create_bins_and_centers(bins)
+
     # Create Plotly data - ensure all numpy arrays are converted to lists
     heatmap_kwargs = {
         'z': heatmap_data.tolist(),  # Always convert to list
@@ -400,6 +295,142 @@ def generate_heatmap(
     return {"data": data, "layout": layout}
 
 
+def heatmap_from_counts(
+    counts: np.ndarray,
+    heatmap_type: str,
+    half: str = "full",
+    sigma: float = None,
+    colorscale = None,
+    title_prefix: str = None
+) -> dict:
+    """
+    Single-team heatmap figure from an unsmoothed count grid (one match or many summed)
+    
+    Smoothing and normalization happen here, once, so the cost depends on the
+    grid size rather than on the number of events behind it.
+    """
+    # scipy is slow to import and only needed once a heatmap is actually built
+    from scipy.ndimage import gaussian_filter
+
+    defaults = _heatmap_defaults(heatmap_type)
+    raw_heatmap_data = gaussian_filter(counts, sigma=sigma or defaults['sigma'])
+    
+    # Apply normalization to team heatmaps
+    heatmap_data, zmin, zmax = _normalize_heatmap_data(raw_heatmap_data, defaults['normalization_type'])
+    return _heatmap_figure(heatmap_data, zmin, zmax, counts.shape, colorscale or _get_dominance_colorscale(),
+                           half, title_prefix or defaults['title_prefix'])
+
+
+def generate_heatmap(
+    match_data: pd.DataFrame,
+    heatmap_type: str,
+    half: str = "full",
+    bins: tuple = None,
+    sigma: float = None,
+    colorscale = None,
+    title_prefix: str = None
+) -> dict:
+    """
+    Unified heatmap generation function
+    
+    Args:
+        match_data: DataFrame containing match event data
+        heatmap_type: 'dominance', 'possession', 'attack', or 'defense'
+        half: 'full', 'first', or 'second'
+        bins: Custom bin size (y, x). Defaults: dominance=(24,16), possession=(48,32)
+        sigma: Gaussian filter sigma. Defaults: dominance=1.5, possession=2.5
+        colorscale: Custom colorscale. Defaults: dominance=custom, possession='Viridis'
+        title_prefix: Custom title prefix
+    
+    Returns:
+        Plotly figure as JSON dict
+    """
+    defaults = _heatmap_defaults(heatmap_type)
+    bins = bins or defaults['bins']
+
+    if heatmap_type != "dominance":
+        # For single-team heatmaps (possession, attack, defense), count per period then smooth once
+        counts = counts_for_half(team_count_grids(match_data, heatmap_type, bins), half, bins)
+        return heatmap_from_counts(counts, heatmap_type, half, sigma, colorscale, title_prefix)
+
+    return dominance_heatmap(located_events(match_data), _determine_team_attacking_directions(match_data),
+                             half, bins, sigma, colorscale, title_prefix)
+
+
+def located_events(match_data: pd.DataFrame) -> pd.DataFrame:
+    """Events with an (x, y) location, with the coordinates split into ``x``/``y`` columns"""
+    location_data = match_data[['location', 'team', 'period']].dropna()
+    location_data = location_data[location_data['location'].apply(lambda loc: isinstance(loc, list) and len(loc) == 2)]
+    location_data[['x', 'y']] = pd.DataFrame(location_data['location'].tolist(), index=location_data.index)
+    return location_data
+
+
+def dominance_heatmap(
+    location_data: pd.DataFrame,
+    attacking_directions: dict,
+    half: str = "full",
+    bins: tuple = None,
+    sigma: float = None,
+    colorscale = None,
+    title_prefix: str = None
+) -> dict:
+    """Dominance heatmap from ``located_events`` and ``_determine_team_attacking_directions`` output"""
+    # scipy is slow to import and only needed once a heatmap is actually built
+    from scipy.ndimage import gaussian_filter
+
+    defaults = _heatmap_defaults("dominance")
+    bins = bins or defaults['bins']
+    sigma = sigma or defaults['sigma']
+    colorscale = colorscale or _get_dominance_colorscale()
+    title_prefix = title_prefix or defaults['title_prefix']
+    
+    # Create bins and centers
+    x_bins, y_bins, _, _ = _create_bins_and_centers(bins)
+    
+    # Apply half filter
+    if half == "first":
+        location_data = location_data[location_data['period'] == 1]
+    elif half == "second":
+        location_data = location_data[location_data['period'] == 2]
+    
+    teams = location_data['team'].unique()
+    if len(teams) != 2:
+        raise ValueError(f"Expected 2 teams for dominance heatmap, found {teams}")
+    
+    team_a, team_b = teams
+    
+    # Determine actual attacking directions for both teams
+    team_a_directions = attacking_directions.get(team_a, {1: 'right', 2: 'left'})
+    team_b_directions = attacking_directions.get(team_b, {1: 'left', 2: 'right'})
+    
+    # Normalize coordinates so team_a always attacks towards y=120 (top of pitch) and team_b towards y=0:
+    # flip both StatsBomb coordinates (x = length 0-120, y = width 0-80) where the team attacks the other way
+    is_team_a = (location_data['team'] == team_a).to_numpy()
+    periods = location_data['period']
+    flip = np.where(is_team_a,
+                    periods.map(lambda period: team_a_directions.get(period, 'right') == 'left').to_numpy(bool),
+                    periods.map(lambda period: team_b_directions.get(period, 'left') == 'right').to_numpy(bool))
+    x_sb = location_data['x'].to_numpy(float)
+    y_sb = location_data['y'].to_numpy(float)
+    
+    # Plot coordinates: x = width (horizontal), y = length (vertical)
+    norm_x = np.where(flip, 80 - y_sb, y_sb)
+    norm_y = np.where(flip, 120 - x_sb, x_sb)
+    
+    # Use normalized coordinates for histogram
+    a_hist, _, _ = np.histogram2d(norm_y[is_team_a], norm_x[is_team_a], bins=[y_bins, x_bins])
+    b_hist, _, _ = np.histogram2d(norm_y[~is_team_a], norm_x[~is_team_a], bins=[y_bins, x_bins])
+    
+    total_actions = a_hist + b_hist
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Default to neutral if zero actions (without `out`, skipped cells would be uninitialised memory)
+        dominance_ratio = np.divide(a_hist, total_actions, out=np.full_like(a_hist, 0.5), where=total_actions != 0)
+    
+    heatmap_data = gaussian_filter(dominance_ratio, sigma=sigma)
+    heatmap_data = np.clip(heatmap_data, 0.0, 1.0)
+    return _heatmap_figure(heatmap_data, 0, 1, bins, colorscale, half, title_prefix)  # Explicit range for dominance
+
+
 # Backward compatibility wrapper functions
 def generate_dominance_heatmap_json(match_data: pd.DataFrame, half: str = "full") -> dict:
     """Backward compatibility wrapper for dominance heatmaps"""
@@ -1,32 +1,67 @@
-import plotly.graph_objects as go
-from utils.analytics.match_analytics.match_analysis_utils import cumulative_stats
+from utils.analytics.match_analytics.match_analysis_utils import cumulative_change_points
+from utils.event_codes import outcome_mask, team_mask, type_mask
 import pandas as pd
 
 
+def match_xg_series(match_data: pd.DataFrame, home_team: str, away_team: str) -> dict:
+    """
+    Compact cumulative xG and goals per team, stored for the /api/compare/xg endpoint
+
+    One point per shot plus kick-off and the last in-play minute, meant to be
+    drawn as a step line. Penalty shoot-out kicks are left out, as in the match
+    totals.
+    """
+    in_play = match_data[match_data['period'] != 5]
+    end = int(in_play['minute'].max()) if len(in_play) else 0
+    shots = in_play[type_mask(in_play, 'Shot')].sort_values('minute', kind='stable')
+    series = []
+    for team in (home_team, away_team):
+        team_shots = shots[team_mask(shots, team)]
+        xg = team_shots['shot_statsbomb_xg'].replace(-999, 0).astype(float).cumsum().round(4).tolist()
+        goals = outcome_mask(team_shots, 'shot_outcome', 'Goal').cumsum().tolist()
+        series.append({
+            'team': team,
+            'minute': [0] + team_shots['minute'].astype(int).tolist() + [end],
+            'xg': [0.0] + xg + [xg[-1] if xg else 0.0],
+            'goals': [0] + goals + [goals[-1] if goals else 0],
+        })
+    return {'end': end, 'series': series}
+
+
 def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_team: str):
-    # Filter match data for only the required columns
-    match_data = match_data[['team', 'minute', 'shot_outcome', 'shot_statsbomb_xg', 'period']]
+    # Filter match data for only the required columns (and the codes the filters use)
+    columns = ['team', 'type', 'minute', 'shot_outcome', 'shot_statsbomb_xg', 'period']
+    match_data = match_data[columns + [c for c in ('team_code', 'type_code', 'outcome_code') if c in match_data.columns]]
 
     # Separate stats for Team 1 and Team 2
-    team_1 = match_data[match_data['team'] == home_team]
-    team_2 = match_data[match_data['team'] == away_team]
+    team_1 = match_data[team_mask(match_data, home_team)]
+    team_2 = match_data[team_mask(match_data, away_team)]
+
+    # Only shots, goals and period boundaries: the lines are drawn as steps between them
+    team_1_stats = cumulative_change_points(team_1)
+    team_2_stats = cumulative_change_points(team_2)
+    return xg_graph_figure(team_1_stats, team_2_stats, set(match_data['period'].unique()), match_data['minute'].max())
+
 
-    team_1_stats = cumulative_stats(team_1)
-    team_2_stats = cumulative_stats(team_2)
+def xg_graph_figure(team_1_stats: dict, team_2_stats: dict, periods: set, last_minute: int) -> dict:
+    """
+    xG graph from both teams' ``cumulative_change_points``
 
-    # Dynamically determine the max values for x and y axes
-    y_max = max(team_1_stats['cum_xg'].max(), team_1_stats['cum_goals'].max(),
-                team_2_stats['cum_xg'].max(), team_2_stats['cum_goals'].max())
-    x_max = max(team_1_stats['minute'].max(), team_2_stats['minute'].max())
+    ``periods`` and ``last_minute`` cover every event of the match and place
+    the extra time and penalty shading.
+    """
+    # Dynamically determine the max values for x and y axes (the running totals only grow)
+    y_max = max((stats[key][-1] for stats in (team_1_stats, team_2_stats) for key in ('cum_xg', 'cum_goals')
+                 if stats[key]), default=0)
+    x_max = max((stats['minute'][-1] for stats in (team_1_stats, team_2_stats) if stats['minute']), default=0)
 
-    # Convert data to lists here to avoid serialization issues
-    x_team1_stats = team_1_stats['minute'].tolist()
-    y_cum_xg_team1 = team_1_stats['cum_xg'].tolist()
-    y_cum_goals_team1 = team_1_stats['cum_goals'].tolist()
+    x_team1_stats = team_1_stats['minute']
+    y_cum_xg_team1 = team_1_stats['cum_xg']
+    y_cum_goals_team1 = team_1_stats['cum_goals']
 
-    x_team2_stats = team_2_stats['minute'].tolist()
-    y_cum_xg_team2 = team_2_stats['cum_xg'].tolist()
-    y_cum_goals_team2 = team_2_stats['cum_goals'].tolist()
+    x_team2_stats = team_2_stats['minute']
+    y_cum_xg_team2 = team_2_stats['cum_xg']
+    y_cum_goals_team2 = team_2_stats['cum_goals']
 
     # Initialize Plotly traces (data) - convert to dicts for JSON serialization
     data = [
@@ -36,7 +71,7 @@ def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_tea
             'y': y_cum_xg_team1,
             'mode': 'lines',
             'name': '',
-            'line': {'color': 'blue', 'dash': 'dash'},
+            'line': {'color': 'blue', 'dash': 'dash', 'shape': 'hv'},
             'showlegend': False,
             'type': 'scatter'
         },
@@ -45,7 +80,7 @@ def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_tea
             'y': y_cum_goals_team1,
             'mode': 'lines',
             'name': '',
-            'line': {'color': 'blue'},
+            'line': {'color': 'blue', 'shape': 'hv'},
             'showlegend': False,
             'type': 'scatter'
         },
@@ -54,7 +89,7 @@ def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_tea
             'y': y_cum_xg_team2,
             'mode': 'lines',
             'name': '',
-            'line': {'color': 'red', 'dash': 'dash'},
+            'line': {'color': 'red', 'dash': 'dash', 'shape': 'hv'},
             'showlegend': False,
             'type': 'scatter'
         },
@@ -63,7 +98,7 @@ def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_tea
             'y': y_cum_goals_team2,
             'mode': 'lines',
             'name': '',
-            'line': {'color': 'red'},
+            'line': {'color': 'red', 'shape': 'hv'},
             'showlegend': False,
             'type': 'scatter'
         },
@@ -88,12 +123,11 @@ def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_tea
     ]
 
     # Add annotations and shading for extra time and penalties if applicable
-    unique_periods = match_data['period'].unique()
     shapes = []
     annotations = []
 
     # Extra time shading (90–120 mins)
-    if not set(unique_periods).issubset({1, 2}):
+    if not periods.issubset({1, 2}):
         shapes.append(dict(
             type="rect",
             x0=90, x1=x_max, y0=0, y1=y_max + 0.5,
@@ -108,15 +142,15 @@ def generate_match_graph_plot(match_data: pd.DataFrame, home_team: str, away_tea
         ))
 
     # Penalty shootout shading (120+ mins)
-    if match_data['period'].max() == 5:
+    if max(periods, default=None) == 5:
         shapes.append(dict(
             type="rect",
-            x0=120, x1=match_data['minute'].max(), y0=0, y1=y_max + 0.5,
+            x0=120, x1=last_minute, y0=0, y1=y_max + 0.5,
             fillcolor="rgba(255, 0, 0, 0.2)",  # Semi-transparent red fill
             line=dict(color="rgba(255, 0, 0, 0)")
         ))
         annotations.append(dict(
-            x=(120 + match_data['minute'].max()) / 2, y=y_max + 0.5,
+            x=(120 + last_minute) / 2, y=y_max + 0.5,
             text="Penalties",
             showarrow=False,
             font=dict(color="red", size=12)
@@ -1,14 +1,73 @@
 """
 Plot Factory for efficient plot generation with shared data preprocessing
+
+Plots are declared in a registry: each ``PlotSpec`` names the derived
+features it ``requires`` and the stored plot types it ``produces``, and each
+``Feature`` is computed from other features. ``MatchDataProcessor`` computes
+a feature the first time any plot asks for it and shares it from then on, so
+``generate_plots`` only derives what the requested plot types need.
 """
 import pandas as pd
 import asyncio
 import concurrent.futures
-from typing import Dict, Any, Tuple
-from utils.plots.match_plots.xG_per_game import generate_match_graph_plot
-from utils.plots.match_plots.momentum_per_game import generate_momentum_graph_plot
-from utils.plots.match_plots.unified_heatmap import generate_heatmap
-from utils.analytics.match_analytics.match_analysis_utils import goal_assist_stats
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+from utils.analytics.match_analytics.match_analysis_utils import cumulative_change_points, goal_assist_stats
+from utils.event_codes import team_mask
+from utils.plots.match_plots.xG_per_game import xg_graph_figure
+from utils.plots.match_plots.momentum_per_game import action_xt, momentum_from_actions, generate_momentum_graph_from_minutes
+from utils.plots.match_plots.unified_heatmap import (
+    _determine_team_attacking_directions, counts_for_half, dominance_heatmap, heatmap_from_counts, located_events,
+    team_count_grids
+)
+
+TEAM_PREFIXES = ('home_team', 'away_team')
+HEATMAP_PHASES = ('possession', 'attack', 'defense')
+HALVES = ('full', 'first', 'second')
+
+# Seeded by MatchDataProcessor rather than computed
+BASE_FEATURES = ('match_df', 'home_team', 'away_team')
+
+
+class Feature(NamedTuple):
+    """A derived input, computed once per match from the features it ``requires``"""
+    compute: Callable[..., Any]
+    requires: Tuple[str, ...]
+
+
+class PlotSpec(NamedTuple):
+    """Plots built from ``requires`` features; ``build`` returns a dict keyed by the ``produces`` plot types"""
+    build: Callable[..., Dict[str, Any]]
+    requires: Tuple[str, ...]
+    produces: Tuple[str, ...]
+
+
+FEATURES: Dict[str, Feature] = {}
+PLOTS: Dict[str, PlotSpec] = {}
+
+
+def register_feature(name: str, compute: Callable[..., Any], *requires: str) -> None:
+    """Declare a feature; ``compute`` is called with the ``requires`` features in order"""
+    unknown = [dep for dep in requires if dep not in FEATURES and dep not in BASE_FEATURES]
+    if unknown:
+        raise ValueError(f"Feature {name!r} requires unknown features {unknown}")
+    if name in FEATURES or name in BASE_FEATURES:
+        raise ValueError(f"Feature {name!r} is already registered")
+    FEATURES[name] = Feature(compute, tuple(requires))
+
+
+def register_plot(name: str, build: Callable[..., Dict[str, Any]], requires: Iterable[str],
+                  produces: Iterable[str]) -> None:
+    """Declare a plot; ``build`` is called with the ``requires`` features and returns every ``produces`` type"""
+    requires, produces = tuple(requires), tuple(produces)
+    unknown = [dep for dep in requires if dep not in FEATURES and dep not in BASE_FEATURES]
+    if unknown:
+        raise ValueError(f"Plot {name!r} requires unknown features {unknown}")
+    taken = [plot_type for spec in PLOTS.values() for plot_type in spec.produces if plot_type in produces]
+    if name in PLOTS or taken:
+        raise ValueError(f"Plot {name!r} is already registered or produces existing plot types {taken}")
+    PLOTS[name] = PlotSpec(build, requires, produces)
 
 
 class MatchDataProcessor:
@@ -22,154 +81,264 @@ class MatchDataProcessor:
         else:
             self.home_team = self.away_team = self.teams[0] if len(self.teams) > 0 else "Unknown"
         
-        # Pre-filter team data
-        self.home_team_data = match_df[match_df['team'] == self.home_team]
-        self.away_team_data = match_df[match_df['team'] == self.away_team]
+        self._features = {'match_df': match_df, 'home_team': self.home_team, 'away_team': self.away_team}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+    
+    def feature(self, name: str, timings: Dict[str, float] = None) -> Any:
+        """
+        A registered feature, computed on first use (with its dependencies) and cached
         
-        # Pre-compute goal/assist stats once
-        self._goal_assist_data = None
+        Safe to call from the plot threads: each feature is computed once, and
+        its duration is recorded under ``feature:<name>`` when timings are requested.
+        """
+        if name in self._features:
+            return self._features[name]
+        with self._locks_guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._features:
+                spec = FEATURES[name]
+                args = [self.feature(dep, timings) for dep in spec.requires]
+                start = time.perf_counter()
+                self._features[name] = spec.compute(*args)
+                if timings is not None:
+                    timings[f"feature:{name}"] = time.perf_counter() - start
+        return self._features[name]
+    
+    @property
+    def home_team_data(self) -> pd.DataFrame:
+        return self.feature('team_frames')['home_team']
+    
+    @property
+    def away_team_data(self) -> pd.DataFrame:
+        return self.feature('team_frames')['away_team']
     
     @property
     def goal_assist_data(self):
         """Lazy load goal/assist stats"""
-        if self._goal_assist_data is None:
-            self._goal_assist_data = goal_assist_stats(
-                self.match_df, self.home_team, self.away_team
-            )
-        return self._goal_assist_data
+        return self.feature('goal_assist')
+    
+    @property
+    def momentum_data(self) -> pd.DataFrame:
+        """Lazy per-minute xT sums (shared by the momentum plot and the form series)"""
+        return self.feature('momentum')
+    
+    def count_grids(self, team_prefix: str, phase: str) -> Dict[int, Any]:
+        """Lazy per-period count grids for 'home_team'/'away_team' and a heatmap phase"""
+        return self.feature(f"count_grids:{team_prefix}:{phase}")
+
+
+def match_summary_plot(home_rows, away_rows, home_team: str, away_team: str,
+                       home_norm: int, away_norm: int, home_et: int, away_et: int,
+                       home_pen: int, away_pen: int) -> Dict[str, Any]:
+    """Match summary payload from (player, contributions) rows and goals per phase of the match"""
+    home_data = [{"player": player, "contributions": list(contributions)} for player, contributions in home_rows]
+    away_data = [{"player": player, "contributions": list(contributions)} for player, contributions in away_rows]
+    
+    scoreline = f"{home_team} {home_norm} - {away_norm} {away_team}"
+    extra = None
+    if home_et or away_et:
+        extra = f"(ET: {home_et} - {away_et})"
+    if home_pen or away_pen:
+        pens = f"(Pen: {home_pen} - {away_pen})"
+        extra = f"{extra}, {pens}" if extra else pens
+    
+    return {
+        "home": home_data,
+        "away": away_data,
+        "homeTeam": home_team,
+        "awayTeam": away_team,
+        "homeTeamNormalTime": home_norm,
+        "awayTeamNormalTime": away_norm,
+        "homeTeamExtraTime": home_et,
+        "awayTeamExtraTime": away_et,
+        "homeTeamPenalties": home_pen,
+        "awayTeamPenalties": away_pen,
+        "scoreline": scoreline,
+        "extraTimeDetails": extra
+    }
+
+
+
+def _team_frames(match_df: pd.DataFrame, home_team: str, away_team: str) -> Dict[str, pd.DataFrame]:
+    return {'home_team': match_df[team_mask(match_df, home_team)],
+            'away_team': match_df[team_mask(match_df, away_team)]}
+
+
+def _xg_graph(team_frames: Dict[str, pd.DataFrame], match_df: pd.DataFrame) -> Dict[str, Any]:
+    # Only shots, goals and period boundaries: the lines are drawn as steps between them
+    return {'xg_graph': xg_graph_figure(cumulative_change_points(team_frames['home_team']),
+                                        cumulative_change_points(team_frames['away_team']),
+                                        set(match_df['period'].unique()), match_df['minute'].max())}
+
+
+def _momentum_graph(momentum: pd.DataFrame, home_team: str, away_team: str) -> Dict[str, Any]:
+    return {'momentum_graph': generate_momentum_graph_from_minutes(momentum, home_team, away_team)}
+
+
+def _match_summary(goal_assist) -> Dict[str, Any]:
+    (home_df, away_df, home_team, away_team,
+     home_norm, away_norm, home_et, away_et, home_pen, away_pen) = goal_assist
+    return {'match_summary': match_summary_plot(zip(home_df["player"], home_df["contributions"]),
+                                                zip(away_df["player"], away_df["contributions"]),
+                                                home_team, away_team, home_norm, away_norm,
+                                                home_et, away_et, home_pen, away_pen)}
+
+
+def _half_suffix(half: str) -> str:
+    return '' if half == 'full' else f"_{half}"
+
+
+def _dominance_plot(half: str):
+    def build(events: pd.DataFrame, attacking_directions: dict) -> Dict[str, Any]:
+        return {f"dominance_heatmap{_half_suffix(half)}": dominance_heatmap(events, attacking_directions, half)}
+    return build
+
+
+def _team_heatmap_types(team_prefix: str, phase: str) -> Tuple[str, ...]:
+    plot_types = tuple(f"{team_prefix}_{phase}_{half}" for half in HALVES)
+    if phase == 'possession':
+        # Keep backward compatibility keys
+        plot_types += tuple(f"{team_prefix}_heatmap{_half_suffix(half)}" for half in HALVES)
+    return plot_types
+
+
+def _team_heatmaps(team_prefix: str, phase: str):
+    def build(grids: Dict[int, Any]) -> Dict[str, Any]:
+        # Events are counted once per phase; each half just sums its periods
+        heatmaps = {f"{team_prefix}_{phase}_{half}": heatmap_from_counts(counts_for_half(grids, half), phase, half)
+                    for half in HALVES}
+        if phase == 'possession':
+            heatmaps.update({f"{team_prefix}_heatmap{_half_suffix(half)}": heatmaps[f"{team_prefix}_possession_{half}"]
+                             for half in HALVES})
+        return heatmaps
+    return build
+
+
+register_feature('team_frames', _team_frames, 'match_df', 'home_team', 'away_team')
+register_feature('goal_assist', goal_assist_stats, 'match_df', 'home_team', 'away_team')
+register_feature('action_xt', action_xt, 'match_df')
+register_feature('momentum', momentum_from_actions, 'action_xt')
+register_feature('located_events', located_events, 'match_df')
+register_feature('attacking_directions', _determine_team_attacking_directions, 'match_df')
+for _prefix in TEAM_PREFIXES:
+    for _phase in HEATMAP_PHASES:
+        register_feature(f"count_grids:{_prefix}:{_phase}",
+                         lambda frames, prefix=_prefix, phase=_phase: team_count_grids(frames[prefix], phase),
+                         'team_frames')
+
+# Registration order is the run order
+register_plot('xg_graph', _xg_graph, ('team_frames', 'match_df'), ('xg_graph',))
+register_plot('momentum_graph', _momentum_graph, ('momentum', 'home_team', 'away_team'), ('momentum_graph',))
+register_plot('match_summary', _match_summary, ('goal_assist',), ('match_summary',))
+for _half in HALVES:
+    register_plot(f"dominance_heatmap{_half_suffix(_half)}", _dominance_plot(_half),
+                  ('located_events', 'attacking_directions'), (f"dominance_heatmap{_half_suffix(_half)}",))
+for _prefix in TEAM_PREFIXES:
+    for _phase in HEATMAP_PHASES:
+        register_plot(f"{_prefix}_{_phase}", _team_heatmaps(_prefix, _phase),
+                      (f"count_grids:{_prefix}:{_phase}",), _team_heatmap_types(_prefix, _phase))
+
+DOMINANCE_PLOT_TYPES = tuple(f"dominance_heatmap{_half_suffix(half)}" for half in HALVES)
+TEAM_PLOT_TYPES = tuple(plot_type for prefix in TEAM_PREFIXES for phase in HEATMAP_PHASES
+                        for plot_type in _team_heatmap_types(prefix, phase))
+
+
+def plot_types() -> List[str]:
+    """Every plot type the registry produces, in run order"""
+    return [plot_type for spec in PLOTS.values() for plot_type in spec.produces]
+
+
+def plans_for(requested: Iterable[str] = None) -> List[str]:
+    """Names of the plot specs needed for ``requested`` plot types (all when None), in run order"""
+    if requested is None:
+        return list(PLOTS)
+    requested = set(requested)
+    unknown = requested.difference(plot_types())
+    if unknown:
+        raise ValueError(f"Unknown plot types: {sorted(unknown)}")
+    return [name for name, spec in PLOTS.items() if requested.intersection(spec.produces)]
+
+
+def _run_plot(name: str, processor: MatchDataProcessor, timings: Dict[str, float] = None) -> Dict[str, Any]:
+    """Build one plot spec, recording its duration (excluding shared features) under ``plot:<name>``"""
+    spec = PLOTS[name]
+    args = [processor.feature(dep, timings) for dep in spec.requires]
+    start = time.perf_counter()
+    result = spec.build(*args)
+    if timings is not None:
+        timings[f"plot:{name}"] = time.perf_counter() - start
+    return result
+
+
+def _select(results: List[Dict[str, Any]], requested: Iterable[str] = None) -> Dict[str, Any]:
+    """Flatten spec results into the stored plot_type -> plot mapping, keeping only ``requested`` types"""
+    plots = {plot_type: plot for result in results for plot_type, plot in result.items()}
+    if requested is None:
+        return plots
+    return {plot_type: plots[plot_type] for plot_type in requested}
+
+
+def generate_plots(processor: MatchDataProcessor, requested: Iterable[str] = None,
+                   timings: Dict[str, float] = None) -> Dict[str, Any]:
+    """Build the ``requested`` plot types (all when None), deriving only the features they need"""
+    requested = None if requested is None else list(requested)
+    return _select([_run_plot(name, processor, timings) for name in plans_for(requested)], requested)
+
+
+async def generate_plots_async(processor: MatchDataProcessor, requested: Iterable[str] = None,
+                               timings: Dict[str, float] = None) -> Dict[str, Any]:
+    """Concurrent ``generate_plots``; plots that share a feature wait for its single computation"""
+    requested = None if requested is None else list(requested)
+    loop = asyncio.get_event_loop()
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        tasks = [loop.run_in_executor(executor, _run_plot, name, processor, timings) for name in plans_for(requested)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Handle any exceptions
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        
+        return _select(results, requested)
 
 
 class PlotFactory:
-    """Factory for generating plots efficiently with shared preprocessing"""
+    """Plot groups over the registry, kept for callers that build one group at a time"""
     
     @staticmethod
     def generate_xg_plot(processor: MatchDataProcessor) -> Dict[str, Any]:
         """Generate xG plot"""
-        return generate_match_graph_plot(
-            processor.match_df, processor.home_team, processor.away_team
-        )
+        return generate_plots(processor, ['xg_graph'])['xg_graph']
     
     @staticmethod
     def generate_momentum_plot(processor: MatchDataProcessor) -> Dict[str, Any]:
         """Generate momentum plot"""
-        return generate_momentum_graph_plot(
-            processor.match_df, processor.home_team, processor.away_team
-        )
+        return generate_plots(processor, ['momentum_graph'])['momentum_graph']
     
     @staticmethod
     def generate_dominance_heatmaps(processor: MatchDataProcessor) -> Dict[str, Any]:
         """Generate all dominance heatmaps (full, first, second)"""
-        return {
-            'dominance_heatmap': generate_heatmap(processor.match_df, 'dominance', 'full'),
-            'dominance_heatmap_first': generate_heatmap(processor.match_df, 'dominance', 'first'),
-            'dominance_heatmap_second': generate_heatmap(processor.match_df, 'dominance', 'second')
-        }
+        return generate_plots(processor, DOMINANCE_PLOT_TYPES)
     
     @staticmethod
     def generate_team_heatmaps(processor: MatchDataProcessor) -> Dict[str, Any]:
-        """Generate all team heatmap combinations (phase × half)"""
-        phases = ['possession', 'attack', 'defense']
-        halves = ['full', 'first', 'second']
-        
-        heatmaps = {}
-        for team_prefix in ['home_team', 'away_team']:
-            team_data = processor.home_team_data if team_prefix == 'home_team' else processor.away_team_data
-            
-            for phase in phases:
-                for half in halves:
-                    key = f"{team_prefix}_{phase}_{half}"
-                    heatmaps[key] = generate_heatmap(team_data, phase, half)
-        
-        # Keep backward compatibility keys
-        heatmaps.update({
-            'home_team_heatmap': heatmaps['home_team_possession_full'],
-            'home_team_heatmap_first': heatmaps['home_team_possession_first'],
-            'home_team_heatmap_second': heatmaps['home_team_possession_second'],
-            'away_team_heatmap': heatmaps['away_team_possession_full'],
-            'away_team_heatmap_first': heatmaps['away_team_possession_first'],
-            'away_team_heatmap_second': heatmaps['away_team_possession_second']
-        })
-        
-        return heatmaps
+        """Generate all team heatmap combinations (phase × half), with the legacy possession keys"""
+        return generate_plots(processor, TEAM_PLOT_TYPES)
     
     @staticmethod
     def generate_match_summary(processor: MatchDataProcessor) -> Dict[str, Any]:
         """Generate match summary data"""
-        (home_df, away_df, home_team, away_team, 
-         home_norm, away_norm, home_et, away_et, home_pen, away_pen) = processor.goal_assist_data
-        
-        home_data = [{"player": row["player"], "contributions": list(row["contributions"])} 
-                    for _, row in home_df.iterrows()]
-        away_data = [{"player": row["player"], "contributions": list(row["contributions"])} 
-                    for _, row in away_df.iterrows()]
-        
-        scoreline = f"{home_team} {home_norm} - {away_norm} {away_team}"
-        extra = None
-        if home_et or away_et:
-            extra = f"(ET: {home_et} - {away_et})"
-        if home_pen or away_pen:
-            pens = f"(Pen: {home_pen} - {away_pen})"
-            extra = f"{extra}, {pens}" if extra else pens
-        
-        return {
-            "home": home_data,
-            "away": away_data,
-            "homeTeam": home_team,
-            "awayTeam": away_team,
-            "homeTeamNormalTime": home_norm,
-            "awayTeamNormalTime": away_norm,
-            "homeTeamExtraTime": home_et,
-            "awayTeamExtraTime": away_et,
-            "homeTeamPenalties": home_pen,
-            "awayTeamPenalties": away_pen,
-            "scoreline": scoreline,
-            "extraTimeDetails": extra
-        }
-
-
-async def generate_all_plots_async(processor: MatchDataProcessor) -> Dict[str, Any]:
+        return generate_plots(processor, ['match_summary'])['match_summary']
+
+
+async def generate_all_plots_async(processor: MatchDataProcessor, timings: Dict[str, float] = None) -> Dict[str, Any]:
     """Generate all plots concurrently"""
-    loop = asyncio.get_event_loop()
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-        # Submit all plot generation tasks
-        tasks = {
-            'xg_plot': loop.run_in_executor(executor, PlotFactory.generate_xg_plot, processor),
-            'momentum_plot': loop.run_in_executor(executor, PlotFactory.generate_momentum_plot, processor),
-            'dominance_plots': loop.run_in_executor(executor, PlotFactory.generate_dominance_heatmaps, processor),
-            'team_plots': loop.run_in_executor(executor, PlotFactory.generate_team_heatmaps, processor),
-            'match_summary': loop.run_in_executor(executor, PlotFactory.generate_match_summary, processor)
-        }
-        
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
-        
-        # Combine results
-        xg_plot, momentum_plot, dominance_plots, team_plots, match_summary = results
-        
-        # Handle any exceptions
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                raise result
-        
-        # Flatten the results
-        all_plots = {
-            'xg_graph': xg_plot,
-            'momentum_graph': momentum_plot,
-            'match_summary': match_summary
-        }
-        all_plots.update(dominance_plots)
-        all_plots.update(team_plots)
-        
-        return all_plots
+    return await generate_plots_async(processor, timings=timings)
 
 
-def generate_all_plots_sync(processor: MatchDataProcessor) -> Dict[str, Any]:
+def generate_all_plots_sync(processor: MatchDataProcessor, timings: Dict[str, float] = None) -> Dict[str, Any]:
     """Synchronous version for compatibility"""
-    return {
-        'xg_graph': PlotFactory.generate_xg_plot(processor),
-        'momentum_graph': PlotFactory.generate_momentum_plot(processor),
-        'match_summary': PlotFactory.generate_match_summary(processor),
-        **PlotFactory.generate_dominance_heatmaps(processor),
-        **PlotFactory.generate_team_heatmaps(processor)
-    }
+    return generate_plots(processor, timings=timings)
@@ -0,0 +1,56 @@
+"""
+Season (multi-match) team heatmaps from stored per-match count grids.
+
+The ETL stores each team's unsmoothed counts for every heatmap phase and
+period as one compact array: uint16 of shape (phase, period, y bins, x bins),
+zlib-compressed. A season heatmap sums those arrays and smooths once, so it
+costs time proportional to the grid size, not to the number of events.
+"""
+import zlib
+from typing import Dict, Iterable
+
+import numpy as np
+
+from utils.plots.match_plots.unified_heatmap import (
+    TEAM_HEATMAP_BINS, TEAM_HEATMAP_TYPES, counts_for_half, heatmap_from_counts
+)
+
+GRID_PHASES = TEAM_HEATMAP_TYPES
+GRID_PERIODS = (1, 2, 3, 4, 5)
+_GRID_DTYPE = np.dtype('<u2')
+
+
+def pack_count_grids(grids_by_phase: Dict[str, Dict[int, np.ndarray]], bins: tuple = TEAM_HEATMAP_BINS) -> bytes:
+    """Pack {phase: {period: grid}} (from ``team_count_grids``) into compressed bytes"""
+    packed = np.zeros((len(GRID_PHASES), len(GRID_PERIODS)) + tuple(bins), dtype=_GRID_DTYPE)
+    for i, phase in enumerate(GRID_PHASES):
+        for period, grid in grids_by_phase.get(phase, {}).items():
+            if period in GRID_PERIODS:
+                packed[i, GRID_PERIODS.index(period)] = grid
+    return zlib.compress(packed.tobytes(), 6)
+
+
+def unpack_count_grids(blob: bytes, bins: tuple = TEAM_HEATMAP_BINS) -> np.ndarray:
+    """Inverse of ``pack_count_grids``: a (phase, period, y, x) uint16 array"""
+    shape = (len(GRID_PHASES), len(GRID_PERIODS)) + tuple(bins)
+    return np.frombuffer(zlib.decompress(blob), dtype=_GRID_DTYPE).reshape(shape)
+
+
+def sum_count_grids(blobs: Iterable[bytes], bins: tuple = TEAM_HEATMAP_BINS) -> np.ndarray:
+    """Add up packed grids from any number of matches"""
+    total = np.zeros((len(GRID_PHASES), len(GRID_PERIODS)) + tuple(bins), dtype=np.int64)
+    for blob in blobs:
+        total += unpack_count_grids(blob, bins)
+    return total
+
+
+def season_heatmap(total: np.ndarray, phase: str = "possession", half: str = "full",
+                   title_prefix: str = None) -> dict:
+    """Heatmap figure for one phase/half of summed grids (same styling as the match heatmaps)"""
+    if phase not in GRID_PHASES:
+        raise ValueError(f"Unknown phase: {phase}. Must be one of {', '.join(GRID_PHASES)}")
+    phase_grids = total[GRID_PHASES.index(phase)]
+    grids = {period: phase_grids[j] for j, period in enumerate(GRID_PERIODS)}
+    counts = counts_for_half(grids, half, phase_grids.shape[1:])
+    title_prefix = title_prefix or f"Season {phase.capitalize()} Map"
+    return heatmap_from_counts(counts, phase, half, title_prefix=title_prefix)
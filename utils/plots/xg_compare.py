@@ -0,0 +1,80 @@
+"""
+Overlay the stored cumulative xG series of several matches in one figure.
+
+Pure Python on the compact series written by the ETL
+(``xG_per_game.match_xg_series``), so the web workers build comparison
+figures without numpy or pandas.
+"""
+from typing import Any, Dict, List
+
+# One colour per match, in date order
+PALETTE = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+           '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf')
+
+
+def match_label(home_team: str, away_team: str, scoreline: str = None, match_date: str = None) -> str:
+    label = f"{home_team} {scoreline} {away_team}" if scoreline else f"{home_team} vs {away_team}"
+    return f"{label} ({match_date})" if match_date else label
+
+
+def compare_xg_figure(matches: List[Dict[str, Any]], team: str = None) -> Dict[str, Any]:
+    """
+    Plotly figure with a cumulative xG step line per match and team
+
+    ``matches`` holds ``{'match_id', 'label', 'series'}`` dicts in plot order.
+    With ``team`` only that team's line is drawn for each match; otherwise the
+    home team is solid and the away team dotted, in the match's colour.
+    """
+    data = []
+    y_max = x_max = 0
+    for i, match in enumerate(matches):
+        color = PALETTE[i % len(PALETTE)]
+        for side, series in enumerate(match['series']['series']):
+            if team is not None and series['team'] != team:
+                continue
+            data.append({
+                'x': series['minute'],
+                'y': series['xg'],
+                'customdata': series['goals'],
+                'mode': 'lines',
+                'name': match['label'] if team is not None else f"{series['team']} · {match['label']}",
+                'legendgroup': str(match['match_id']),
+                'line': {'color': color, 'shape': 'hv', 'dash': 'dot' if side and team is None else 'solid'},
+                'hovertemplate': f"{series['team']}<br>%{{x}}' xG %{{y:.2f}}, goals %{{customdata}}<extra></extra>",
+                'type': 'scatter'
+            })
+            y_max = max(y_max, series['xg'][-1])
+            x_max = max(x_max, series['minute'][-1])
+
+    layout = {
+        'title': {
+            'text': f"Cumulative xG: {team}" if team else 'Cumulative xG',
+            'font': {'color': 'white', 'size': 14},
+            'x': 0.5
+        },
+        'xaxis': {
+            'title': {'text': 'Minute'},
+            'color': 'white',
+            'gridcolor': 'rgba(255, 255, 255, 0.1)',
+            'showline': True,
+            'linecolor': 'rgba(255, 255, 255, 0.2)',
+            'range': [0, max(x_max, 90)]
+        },
+        'yaxis': {
+            'title': {'text': 'xG'},
+            'color': 'white',
+            'gridcolor': 'rgba(255, 255, 255, 0.1)',
+            'showline': True,
+            'linecolor': 'rgba(255, 255, 255, 0.2)',
+            'range': [0, y_max + 0.5]
+        },
+        'legend': {
+            'font': {'color': 'white', 'size': 11},
+            'bgcolor': 'rgba(0,0,0,0)'
+        },
+        'autosize': True,
+        'plot_bgcolor': "rgba(0, 0, 0, 0)",
+        'paper_bgcolor': "rgba(0, 0, 0, 0)",
+        'margin': {'l': 10, 'r': 10, 't': 30, 'b': 30}
+    }
+    return {'data': data, 'layout': layout}
@@ -0,0 +1,167 @@
+"""
+In-memory typeahead index over teams, players and fixtures.
+
+Each entry is indexed under its normalised label (lowercase, accents
+stripped) and under every later word of the label, in one sorted list per
+kind. A prefix lookup is a ``bisect`` into those lists followed by a short
+scan, so it never issues SQL. The index is built from the catalog tables
+on worker start (or the first search) and rebuilt when the catalog
+fingerprint changes; the fingerprint is re-read at most every
+``SEARCH_INDEX_TTL`` seconds.
+"""
+import logging
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_KINDS = ('team', 'player', 'match')
+
+
+def normalise(text: str) -> str:
+    """Lowercase, accent-free, single-spaced form used for keys and queries"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+
+class SearchIndex:
+    """Immutable sorted-prefix index; build a new one instead of mutating"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Dict[str, Any]]], version: Any = None):
+        self.version = version
+        self.entries: List[Dict[str, Any]] = []
+        pairs = {kind: ([], []) for kind in SEARCH_KINDS}  # kind -> (label keys, word keys)
+        for kind, label, payload in entries:
+            entry_id = len(self.entries)
+            self.entries.append({'type': kind, 'label': label, **payload})
+            key = normalise(label)
+            words = key.split(' ')
+            pairs[kind][0].append((key, entry_id))
+            for i in range(1, len(words)):
+                pairs[kind][1].append((' '.join(words[i:]), entry_id))
+        self._keys = {}
+        for kind, (labels, words) in pairs.items():
+            labels.sort()
+            words.sort()
+            self._keys[kind] = (
+                ([key for key, _ in labels], [entry_id for _, entry_id in labels]),
+                ([key for key, _ in words], [entry_id for _, entry_id in words]),
+            )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, kinds: Iterable[str] = SEARCH_KINDS, limit: int = 10) -> List[Dict[str, Any]]:
+        """Entries whose label, or a later word of it, starts with ``query``; label matches first"""
+        prefix = normalise(query)
+        if not prefix:
+            return []
+        found, seen = [], set()
+        for tier in (0, 1):
+            for kind in kinds:
+                keys, ids = self._keys[kind][tier]
+                i = bisect_left(keys, prefix)
+                while i < len(keys) and keys[i].startswith(prefix) and len(found) < limit:
+                    if ids[i] not in seen:
+                        seen.add(ids[i])
+                        found.append(self.entries[ids[i]])
+                    i += 1
+        return found
+
+
+def catalog_version() -> Tuple:
+    """Cheap fingerprint of the catalog tables; changes whenever matches, seasons or players are added"""
+    from utils.db import db
+    from models import Competition, Season, Match, PlayerMatchStats
+
+    return tuple(db.session.query(
+        db.session.query(db.func.count(Competition.id)).scalar_subquery(),
+        db.session.query(db.func.count(Season.id)).scalar_subquery(),
+        db.session.query(db.func.count(Match.id)).scalar_subquery(),
+        db.session.query(db.func.max(Match.id)).scalar_subquery(),
+        db.session.query(db.func.count(PlayerMatchStats.match_id)).scalar_subquery(),
+    ).one())
+
+
+def catalog_entries() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(kind, label, payload) for every team, indexed player and fixture"""
+    from utils.db import db
+    from models import Competition, Season, Match, PlayerMatchStats
+
+    fixtures = (
+        db.session.query(Match.id, Match.season_id, Match.home_team, Match.away_team, Match.match_date,
+                         Match.scoreline, Season.year, Competition.name)
+        .join(Season, Season.id == Match.season_id)
+        .join(Competition, Competition.id == Season.competition_id)
+        .all()
+    )
+    entries = []
+    teams = sorted({team for row in fixtures for team in (row.home_team, row.away_team) if team})
+    entries.extend(('team', team, {'team': team}) for team in teams)
+
+    players = (
+        db.session.query(PlayerMatchStats.player_id,
+                         db.func.max(PlayerMatchStats.player).label('player'),
+                         db.func.max(PlayerMatchStats.team).label('team'))
+        .group_by(PlayerMatchStats.player_id)
+        .all()
+    )
+    entries.extend(('player', row.player, {'player_id': row.player_id, 'team': row.team}) for row in players)
+
+    entries.extend(
+        ('match', f"{row.home_team} vs {row.away_team}", {
+            'match_id': row.id,
+            'season_id': row.season_id,
+            'competition_name': row.name,
+            'season_name': row.year,
+            'match_date': row.match_date,
+            'scoreline': row.scoreline,
+        })
+        for row in fixtures
+    )
+    return entries
+
+
+class CatalogSearch:
+    """Per-process holder that swaps in a rebuilt SearchIndex when the catalog changes"""
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._index = SearchIndex([])
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = float(app.config.get('SEARCH_INDEX_TTL', self.ttl))
+
+    @property
+    def index(self) -> SearchIndex:
+        return self._index
+
+    def refresh(self, force: bool = False) -> SearchIndex:
+        """Rebuild if the catalog version moved; needs an app context. Other threads keep the old index"""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.ttl:
+            return self._index
+        if not self._lock.acquire(blocking=self._checked_at is None):
+            return self._index
+        try:
+            version = catalog_version()
+            if force or version != self._index.version:
+                start = time.perf_counter()
+                self._index = SearchIndex(catalog_entries(), version)
+                logger.info(f"🔎 Search index built: {len(self._index)} entries "
+                            f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._index
+
+    def search(self, query: str, kinds: Iterable[str] = SEARCH_KINDS, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.refresh().search(query, kinds, limit)
+
+
+catalog_search = CatalogSearch()
@@ -1,6 +1,4 @@
-import pandas as pd
-from statsbombpy import sb
-
 def get_all_competitions():
+    from statsbombpy import sb  # heavy import, only needed when actually fetching
     df = sb.competitions()
-    return df
\ No newline at end of file
+    return df
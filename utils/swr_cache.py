@@ -0,0 +1,134 @@
+"""
+Single-flight computation and stale-while-revalidate on top of the Flask cache.
+
+``StaleWhileRevalidate`` stores ``(value, fresh_until)`` in the shared
+flask_caching backend for ``timeout + stale_timeout`` seconds:
+
+- fresh entries are served as they are
+- stale entries (past ``timeout``) are still served, while one background
+  thread per worker process recomputes them
+- on a miss, concurrent requests for a key in one process wait for a single
+  computation instead of all hitting the database at once
+
+Backends are shared between workers, so a key is recomputed at most once per
+worker rather than once per request.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key: callers that arrive while a call runs share its result"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def _claim(self, key: Hashable):
+        """(future, leader): the running call's future, or a new one the caller must complete"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> Any:
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """``fn()``, or the result (or exception) of the call already running for ``key``"""
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+        return self._run(key, future, fn)
+
+    def do_in_background(self, key: Hashable, fn: Callable[[], Any], executor: ThreadPoolExecutor) -> bool:
+        """Start ``fn`` on ``executor`` unless a call for ``key`` is running; returns whether it started"""
+        future, leader = self._claim(key)
+        if not leader:
+            return False
+
+        def run():
+            try:
+                self._run(key, future, fn)
+            except Exception as e:
+                logger.warning(f"⚠️ Background refresh of {key!r} failed: {e}")
+
+        executor.submit(run)
+        return True
+
+
+class StaleWhileRevalidate:
+    """Cached values with a stale window; misses and refreshes are computed once per key and process"""
+
+    def __init__(self, cache, timeout: int = 3600, stale_timeout: int = 600, max_workers: int = 2):
+        self.cache = cache
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.max_workers = max_workers
+        self.fresh = self.stale = self.misses = self.refreshes = 0
+        self._flight = SingleFlight()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _refresh_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='swr-refresh')
+            return self._executor
+
+    def _compute_and_store(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = compute()
+        self.cache.set(key, (value, time.time() + self.timeout), timeout=self.timeout + self.stale_timeout)
+        return value
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Cached value for ``key``, computing it with ``compute()`` on a miss
+
+        A stale value is returned immediately and refreshed in the background,
+        inside the caller's app context so ``compute`` can use the database.
+        """
+        entry = self.cache.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.time() < fresh_until:
+                self.fresh += 1
+                return value
+            self.stale += 1
+            app = current_app._get_current_object() if has_app_context() else None
+
+            def refresh():
+                if app is None:
+                    return self._compute_and_store(key, compute)
+                with app.app_context():
+                    return self._compute_and_store(key, compute)
+
+            if self._flight.do_in_background(key, refresh, self._refresh_executor()):
+                self.refreshes += 1
+            return value
+
+        self.misses += 1
+        return self._flight.do(key, lambda: self._compute_and_store(key, compute))
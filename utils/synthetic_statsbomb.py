@@ -0,0 +1,684 @@
+"""
+Seeded synthetic StatsBomb event data for offline benchmarks and tests.
+
+Frames produced here follow the flattened schema returned by ``sb.events``
+(NaN for missing values, list locations, ``tactics`` dicts on Starting XI
+rows) so they can be fed through the ETL exactly like live data, e.g.
+``generate_match_events(seed=1).fillna(-999)``.
+
+Coordinates follow the StatsBomb convention: every event is recorded from
+the acting team's perspective, attacking towards x=120.
+"""
+import json
+import os
+import uuid
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+EVENT_COLUMNS = [
+    'id', 'index', 'period', 'timestamp', 'minute', 'second', 'type',
+    'possession', 'possession_team', 'possession_team_id', 'play_pattern',
+    'team', 'team_id', 'player', 'player_id', 'position', 'location',
+    'duration', 'under_pressure', 'match_id', 'tactics',
+    'pass_end_location', 'pass_outcome', 'pass_recipient', 'pass_length',
+    'pass_height', 'pass_type', 'pass_goal_assist', 'pass_shot_assist',
+    'carry_end_location', 'dribble_outcome', 'duel_type', 'duel_outcome',
+    'shot_statsbomb_xg', 'shot_outcome', 'shot_end_location', 'shot_type',
+    'shot_body_part', 'shot_technique', 'shot_key_pass_id',
+    'substitution_outcome', 'substitution_replacement',
+    'substitution_replacement_id', 'bad_behaviour_card', 'foul_committed_card',
+]
+
+TEAM_NAMES = [
+    'Northbridge Athletic', 'Riverside United', 'Hollowmere City', 'Ashford Rovers',
+    'Kingsport Wanderers', 'Eastvale Town', 'Marlow Harbour', 'Stonegate Albion',
+    'Westbrook Villa', 'Calder Park', 'Fenwick Borough', 'Lowther Forest',
+]
+
+_FIRST_NAMES = [
+    'Alex', 'Ben', 'Carlos', 'Daniel', 'Emil', 'Felix', 'Gabriel', 'Hugo', 'Ivan',
+    'Jonas', 'Kai', 'Luca', 'Marco', 'Nico', 'Oscar', 'Pablo', 'Rafael', 'Sami',
+    'Tomas', 'Victor', 'Yusuf', 'Zoran',
+]
+_LAST_NAMES = [
+    'Almeida', 'Brandt', 'Costa', 'Dubois', 'Eriksen', 'Fischer', 'Garcia', 'Hansen',
+    'Ibarra', 'Jansen', 'Kovac', 'Lindqvist', 'Moreau', 'Novak', 'Okafor', 'Petrov',
+    'Quintero', 'Rossi', 'Schmidt', 'Tanaka', 'Urban', 'Vidal', 'Weber', 'Yilmaz',
+]
+
+# 4-3-3 with StatsBomb position ids
+_FORMATION = 433
+_POSITIONS = [
+    (1, 'Goalkeeper'), (2, 'Right Back'), (3, 'Right Center Back'),
+    (5, 'Left Center Back'), (6, 'Left Back'), (10, 'Center Defensive Midfield'),
+    (13, 'Right Center Midfield'), (15, 'Left Center Midfield'), (17, 'Right Wing'),
+    (23, 'Center Forward'), (21, 'Left Wing'),
+]
+_SQUAD_SIZE = 18
+
+# Regulation length of each period in seconds and the minute it starts at
+_PERIOD_LENGTH = {1: 45 * 60, 2: 45 * 60, 3: 15 * 60, 4: 15 * 60}
+_PERIOD_START_MINUTE = {1: 0, 2: 45, 3: 90, 4: 105, 5: 120}
+
+_MISSED_SHOT_OUTCOMES = ['Saved', 'Off T', 'Blocked', 'Wayward', 'Post', 'Saved Off Target']
+_DEFENSIVE_TYPES = ['Ball Recovery', 'Interception', 'Clearance', 'Block', 'Duel']
+# Restarts per team per 90 minutes (roughly top-flight averages) and the play pattern they start
+_SET_PIECES = {
+    'Corner': (5.0, 'From Corner'),
+    'Free Kick': (12.0, 'From Free Kick'),
+    'Throw-in': (21.0, 'From Throw In'),
+    'Goal Kick': (7.0, 'From Goal Kick'),
+}
+
+
+def _stable_id(name: str, modulo: int = 100000) -> int:
+    """Deterministic small id for a name, independent of PYTHONHASHSEED"""
+    return zlib.crc32(name.encode('utf-8')) % modulo + 1
+
+
+def team_squad(team: str) -> List[Dict]:
+    """
+    Deterministic squad for a team name.
+
+    The same team always gets the same players (names, ids and shirt numbers)
+    so per-player aggregates line up across a synthetic season.
+    """
+    rng = np.random.default_rng(_stable_id(team, 2 ** 31))
+    first = rng.permutation(len(_FIRST_NAMES))
+    last = rng.permutation(len(_LAST_NAMES))
+    team_id = _stable_id(team, 1000)
+    squad = []
+    for i in range(_SQUAD_SIZE):
+        name = f"{_FIRST_NAMES[first[i % len(first)]]} {_LAST_NAMES[last[i % len(last)]]}"
+        position = _POSITIONS[i] if i < len(_POSITIONS) else _POSITIONS[1 + i % (len(_POSITIONS) - 1)]
+        squad.append({
+            'player_id': team_id * 100 + i + 1,
+            'player': name,
+            'jersey_number': i + 1,
+            'position_id': position[0],
+            'position': position[1],
+        })
+    return squad
+
+
+def _timestamp(seconds: float) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600 * 1000)
+    minutes, millis = divmod(millis, 60 * 1000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
+
+def _clip_x(x: float) -> float:
+    return float(min(max(x, 0.5), 119.5))
+
+
+def _clip_y(y: float) -> float:
+    return float(min(max(y, 0.5), 79.5))
+
+
+def _shot_xg(x: float, y: float) -> float:
+    """Rough distance/angle based xG, good enough for realistic magnitudes"""
+    distance = np.hypot(120 - x, 40 - y)
+    return float(np.clip(0.9 * np.exp(-distance / 7.5) + 0.01, 0.01, 0.95))
+
+
+class _TeamState:
+    """Players on the pitch over time for one team"""
+
+    def __init__(self, name: str, rng: np.random.Generator):
+        self.name = name
+        self.team_id = _stable_id(name, 1000)
+        self.squad = team_squad(name)
+        self.starters = self.squad[:len(_POSITIONS)]
+        self.bench = list(self.squad[len(_POSITIONS):])
+        rng.shuffle(self.bench)
+        # player name -> [on, off) in absolute match seconds
+        self.windows = {p['player']: [0.0, float('inf')] for p in self.starters}
+        self.by_name = {p['player']: p for p in self.squad}
+
+    def on_pitch(self, t: float) -> List[Dict]:
+        return [self.by_name[n] for n, (on, off) in self.windows.items() if on <= t < off]
+
+    def outfield_on_pitch(self, t: float) -> List[Dict]:
+        players = [p for p in self.on_pitch(t) if p['position_id'] != 1]
+        return players or self.on_pitch(t)
+
+    def staying_on(self, t: float) -> List[Dict]:
+        """Outfield players on the pitch at ``t`` with no exit scheduled yet (red card or substitution)"""
+        return [p for p in self.outfield_on_pitch(t) if self.windows[p['player']][1] == float('inf')]
+
+
+def generate_match_events(
+    match_id: int = 3900000,
+    home_team: str = TEAM_NAMES[0],
+    away_team: str = TEAM_NAMES[1],
+    seed: int = 0,
+    n_events: int = 3400,
+    home_goals: int = 2,
+    away_goals: int = 1,
+    home_shots: int = 14,
+    away_shots: int = 10,
+    substitutions: int = 5,
+    yellow_cards: int = 3,
+    red_cards: int = 0,
+    extra_time: bool = False,
+    extra_time_goals: Tuple[int, int] = (0, 0),
+    penalties: bool = False,
+    penalty_score: Tuple[int, int] = (4, 3),
+) -> pd.DataFrame:
+    """
+    Generate one synthetic match with the ``sb.events`` schema.
+
+    Args:
+        match_id: Value written to the ``match_id`` column
+        home_team / away_team: Team names (squads are derived from the name)
+        seed: RNG seed; identical arguments always give an identical frame
+        n_events: Approximate number of event rows
+        home_goals / away_goals: Goals scored in normal time
+        home_shots / away_shots: Normal-time shots including goals
+        substitutions: Substitutions per team
+        yellow_cards / red_cards: Cards shown across both teams
+        extra_time: Play periods 3 and 4
+        extra_time_goals: (home, away) goals scored in extra time
+        penalties: Finish with a period 5 shootout (implies extra time)
+        penalty_score: (home, away) scored penalties in the shootout
+
+    Returns:
+        DataFrame with ``EVENT_COLUMNS`` ordered by period and time
+    """
+    rng = np.random.default_rng(seed)
+    home = _TeamState(home_team, rng)
+    away = _TeamState(away_team, rng)
+    teams = (home, away)
+    opponent = {home.name: away, away.name: home}
+
+    extra_time = extra_time or penalties
+    periods = [1, 2, 3, 4] if extra_time else [1, 2]
+    lengths = {p: _PERIOD_LENGTH[p] + float(rng.uniform(30, 240 if p in (1, 2) else 90)) for p in periods}
+    offsets, elapsed = {}, 0.0
+    for p in periods:
+        offsets[p] = elapsed
+        elapsed += lengths[p]
+    match_length = elapsed
+
+    rows: List[Dict] = []
+
+    def new_id() -> str:
+        return str(uuid.UUID(bytes=rng.bytes(16)))
+
+    def add(period: int, t: float, order: int, team: _TeamState, event_type: str, **fields) -> Dict:
+        row = {
+            'id': new_id(), 'period': period, 'type': event_type,
+            'team': team.name, 'team_id': team.team_id,
+            'possession_team': fields.pop('possession_team', team.name),
+            'play_pattern': fields.pop('play_pattern', 'Regular Play'),
+            'match_id': match_id, '_t': t, '_order': order,
+        }
+        player = fields.pop('player_info', None)
+        if player is not None:
+            row.update(player=player['player'], player_id=player['player_id'], position=player['position'])
+        row.update(fields)
+        rows.append(row)
+        return row
+
+    # --- Match structure: Starting XI, half start/end ---------------------
+    for team in teams:
+        add(1, 0.0, 0, team, 'Starting XI', duration=0.0, tactics={
+            'formation': _FORMATION,
+            'lineup': [
+                {'player': {'id': p['player_id'], 'name': p['player']},
+                 'position': {'id': p['position_id'], 'name': p['position']},
+                 'jersey_number': p['jersey_number']}
+                for p in team.starters
+            ],
+        })
+    for p in periods + ([5] if penalties else []):
+        for team in teams:
+            add(p, 0.0, 1, team, 'Half Start', duration=0.0)
+
+    # --- Red cards, substitutions and yellow cards --------------------------
+    # Exits are placed first (reds, then subs), each from players with no exit yet,
+    # so nobody is substituted or booked after leaving the pitch
+    def card_event(t_abs: float, card: str, team: _TeamState, player: Dict):
+        period = max(p for p in periods if offsets[p] <= t_abs)
+        x, y = _clip_x(rng.uniform(20, 100)), _clip_y(rng.uniform(5, 75))
+        if rng.random() < 0.5:
+            add(period, t_abs - offsets[period], 2, team, 'Foul Committed', player_info=player,
+                location=[x, y], foul_committed_card=card, possession_team=opponent[team.name].name)
+        else:
+            add(period, t_abs - offsets[period], 2, team, 'Bad Behaviour', player_info=player,
+                bad_behaviour_card=card, possession_team=opponent[team.name].name)
+
+    for t_abs in rng.uniform(offsets[1] + 20 * 60, match_length - 60, red_cards):
+        t_abs = float(t_abs)
+        team = teams[int(rng.integers(2))]
+        candidates = team.staying_on(t_abs)
+        if candidates:
+            player = candidates[int(rng.integers(len(candidates)))]
+            card_event(t_abs, 'Red Card', team, player)
+            team.windows[player['player']][1] = t_abs
+
+    for team in teams:
+        n_subs = min(substitutions, len(team.bench))
+        sub_times = np.sort(rng.uniform(offsets[2] + 5 * 60, offsets[2] + lengths[2] - 60, n_subs))
+        for t_abs, incoming in zip(sub_times, team.bench[:n_subs]):
+            candidates = team.staying_on(t_abs)
+            if not candidates:
+                continue
+            outgoing = candidates[int(rng.integers(len(candidates)))]
+            team.windows[outgoing['player']][1] = t_abs
+            team.windows[incoming['player']] = [t_abs, float('inf')]
+            add(2, t_abs - offsets[2], 2, team, 'Substitution', player_info=outgoing,
+                substitution_replacement=incoming['player'],
+                substitution_replacement_id=incoming['player_id'],
+                substitution_outcome='Injury' if rng.random() < 0.1 else 'Tactical')
+
+    for t_abs in rng.uniform(60, match_length - 60, yellow_cards):
+        t_abs = float(t_abs)
+        team = teams[int(rng.integers(2))]
+        players = team.outfield_on_pitch(t_abs)
+        card_event(t_abs, 'Yellow Card', team, players[int(rng.integers(len(players)))])
+
+    # --- Shots, goals and their key passes ------------------------------
+    def place_shots(team: _TeamState, shot_periods: List[int], n_shots: int, n_goals: int):
+        n_shots = max(n_shots, n_goals)
+        span = [(offsets[p], lengths[p]) for p in shot_periods]
+        total = sum(length for _, length in span)
+        is_goal = np.zeros(n_shots, dtype=bool)
+        is_goal[rng.choice(n_shots, n_goals, replace=False)] = True
+        for goal in is_goal:
+            u = rng.uniform(0, total)
+            for (start, length), p in zip(span, shot_periods):
+                if u < length:
+                    break
+                u -= length
+            t = float(min(u, length - 1.0))
+            players = team.outfield_on_pitch(start + t)
+            shooter = players[int(rng.integers(len(players)))]
+            x = _clip_x(120 - abs(rng.normal(0, 6 if goal else 12)) - 6)
+            y = _clip_y(rng.normal(40, 6 if goal else 10))
+            xg = _shot_xg(x, y)
+            outcome = 'Goal' if goal else _MISSED_SHOT_OUTCOMES[int(rng.integers(len(_MISSED_SHOT_OUTCOMES)))]
+            shot = add(p, t, 4, team, 'Shot', player_info=shooter, location=[x, y],
+                       duration=float(rng.uniform(0.1, 1.0)), shot_statsbomb_xg=xg,
+                       shot_outcome=outcome, shot_type='Open Play', shot_technique='Normal',
+                       shot_body_part=['Right Foot', 'Left Foot', 'Head'][int(rng.integers(3))],
+                       shot_end_location=[120.0, _clip_y(rng.normal(40, 3)), float(rng.uniform(0, 3))])
+            if rng.random() < (0.8 if goal else 0.6):
+                passer = [q for q in players if q['player'] != shooter['player']]
+                passer = passer[int(rng.integers(len(passer)))]
+                px, py = _clip_x(x - rng.uniform(5, 25)), _clip_y(rng.uniform(5, 75))
+                key_pass = add(p, max(t - 2.0, 0.0), 3, team, 'Pass', player_info=passer,
+                               location=[px, py], pass_end_location=[x, y],
+                               pass_recipient=shooter['player'], pass_length=float(np.hypot(x - px, y - py)),
+                               pass_height='Ground Pass', duration=1.2)
+                key_pass['pass_goal_assist' if goal else 'pass_shot_assist'] = True
+                shot['shot_key_pass_id'] = key_pass['id']
+
+    place_shots(home, [1, 2], home_shots, home_goals)
+    place_shots(away, [1, 2], away_shots, away_goals)
+    if extra_time:
+        place_shots(home, [3, 4], max(2, extra_time_goals[0]), extra_time_goals[0])
+        place_shots(away, [3, 4], max(2, extra_time_goals[1]), extra_time_goals[1])
+
+    if penalties:
+        kicks_home, kicks_away = max(5, penalty_score[0]), max(5, penalty_score[1])
+        scored = {home.name: penalty_score[0], away.name: penalty_score[1]}
+        taken = {home.name: 0, away.name: 0}
+        t = 0.0
+        for k in range(max(kicks_home, kicks_away) * 2):
+            team = teams[k % 2]
+            limit = kicks_home if team is home else kicks_away
+            if taken[team.name] >= limit:
+                continue
+            remaining = limit - taken[team.name]
+            goal = scored[team.name] > 0 and (scored[team.name] >= remaining or rng.random() < 0.75)
+            scored[team.name] -= int(goal)
+            taken[team.name] += 1
+            t += float(rng.uniform(40, 80))
+            takers = team.outfield_on_pitch(match_length - 1.0)
+            add(5, t, 4, team, 'Shot', player_info=takers[taken[team.name] % len(takers)],
+                location=[108.0, 40.0], shot_statsbomb_xg=0.7835, shot_type='Penalty',
+                shot_technique='Normal', shot_body_part='Right Foot',
+                shot_outcome='Goal' if goal else ['Saved', 'Off T'][int(rng.integers(2))],
+                play_pattern='Other', duration=1.0)
+
+    # --- Set pieces and kick-offs ----------------------------------------
+    def set_piece(period: int, t: float, team: _TeamState, pass_type: str, play_pattern: str):
+        players = team.outfield_on_pitch(offsets[period] + t)
+        taker = players[int(rng.integers(len(players)))]
+        side = float(rng.choice([0.5, 79.5]))
+        if pass_type == 'Corner':
+            x, y = 119.5, side
+            ex, ey = _clip_x(rng.uniform(102, 118)), _clip_y(rng.uniform(25, 55))
+            height, completion = 'High Pass', 0.35
+        elif pass_type == 'Free Kick':
+            x, y = _clip_x(rng.uniform(15, 105)), _clip_y(rng.uniform(5, 75))
+            ex, ey = _clip_x(x + rng.normal(15, 12)), _clip_y(y + rng.normal(0, 15))
+            height, completion = ('High Pass' if rng.random() < 0.4 else 'Ground Pass'), 0.8
+        elif pass_type == 'Throw-in':
+            x, y = _clip_x(rng.uniform(5, 115)), side
+            ex, ey = _clip_x(x + rng.normal(3, 8)), _clip_y(abs(side - rng.uniform(5, 20)))
+            height, completion = 'Low Pass', 0.8
+        elif pass_type == 'Goal Kick':
+            x, y = 6.0, float(rng.choice([30.0, 50.0]))
+            ex, ey = _clip_x(rng.uniform(15, 80)), _clip_y(rng.uniform(5, 75))
+            height, completion = ('High Pass' if ex > 35 else 'Ground Pass'), 0.55
+            taker = next((p for p in team.on_pitch(offsets[period] + t) if p['position_id'] == 1), taker)
+        else:  # Kick Off: back towards the team's own half
+            x, y = 60.0, 40.0
+            ex, ey = _clip_x(rng.uniform(40, 55)), _clip_y(rng.uniform(25, 55))
+            height, completion = 'Ground Pass', 0.97
+        complete = rng.random() < completion
+        recipient = players[int(rng.integers(len(players)))]
+        add(period, t, 5, team, 'Pass', player_info=taker, location=[x, y],
+            pass_end_location=[ex, ey], pass_length=float(np.hypot(ex - x, ey - y)),
+            pass_height=height, pass_type=pass_type, play_pattern=play_pattern,
+            pass_recipient=recipient['player'] if complete else np.nan,
+            pass_outcome=np.nan if complete else 'Incomplete',
+            duration=float(rng.uniform(0.5, 2.5)))
+
+    for team in teams:
+        for pass_type, (per_90, play_pattern) in _SET_PIECES.items():
+            for t_abs in rng.uniform(1.0, match_length - 1.0, rng.poisson(per_90 * match_length / (90 * 60))):
+                period = max(p for p in periods if offsets[p] <= t_abs)
+                set_piece(period, float(t_abs - offsets[period]), team, pass_type, play_pattern)
+    for p in periods:
+        set_piece(p, 0.0, teams[(p - 1) % 2], 'Kick Off', 'From Kick Off')
+    for goal in [r for r in rows if r['type'] == 'Shot' and r.get('shot_outcome') == 'Goal' and r['period'] != 5]:
+        restart = min(goal['_t'] + float(rng.uniform(40, 90)), lengths[goal['period']] - 0.5)
+        set_piece(goal['period'], restart, opponent[goal['team']], 'Kick Off', 'From Kick Off')
+
+    # --- Open-play filler: possession chains -----------------------------
+    n_filler = max(n_events - len(rows), 0)
+    per_period = np.floor(n_filler * np.array([lengths[p] for p in periods]) / match_length).astype(int)
+    for p, count in zip(periods, per_period):
+        times = np.sort(rng.uniform(0, lengths[p], count))
+        team = home if p % 2 else away
+        x, y = 60.0, 40.0
+        step = 'Pass'
+        for t in times:
+            t = float(t)
+            players = team.outfield_on_pitch(offsets[p] + t)
+            player = players[int(rng.integers(len(players)))]
+            if step == 'Pass':
+                ex, ey = _clip_x(x + rng.normal(8, 12)), _clip_y(y + rng.normal(0, 15))
+                complete = rng.random() > 0.15
+                recipient = players[int(rng.integers(len(players)))]
+                add(p, t, 5, team, 'Pass', player_info=player, location=[x, y],
+                    pass_end_location=[ex, ey], pass_length=float(np.hypot(ex - x, ey - y)),
+                    pass_height='Ground Pass' if rng.random() < 0.7 else 'High Pass',
+                    pass_recipient=recipient['player'] if complete else np.nan,
+                    pass_outcome=np.nan if complete else ['Incomplete', 'Out'][int(rng.integers(2))],
+                    duration=float(rng.uniform(0.3, 2.0)),
+                    under_pressure=True if rng.random() < 0.2 else np.nan)
+                x, y = ex, ey
+                step = 'Ball Receipt*' if complete else 'Turnover'
+            elif step == 'Ball Receipt*':
+                add(p, t, 5, team, 'Ball Receipt*', player_info=player, location=[x, y], duration=0.0)
+                step = 'Carry' if rng.random() < 0.85 else 'Dribble'
+            elif step == 'Carry':
+                ex, ey = _clip_x(x + rng.normal(4, 5)), _clip_y(y + rng.normal(0, 4))
+                add(p, t, 5, team, 'Carry', player_info=player, location=[x, y],
+                    carry_end_location=[ex, ey], duration=float(rng.uniform(0.5, 4.0)))
+                x, y = ex, ey
+                step = 'Pass'
+            elif step == 'Dribble':
+                success = rng.random() < 0.6
+                add(p, t, 5, team, 'Dribble', player_info=player, location=[x, y],
+                    dribble_outcome='Complete' if success else 'Incomplete', duration=0.0)
+                step = 'Carry' if success else 'Turnover'
+            else:
+                # Opponent wins the ball; coordinates flip to their perspective
+                team = opponent[team.name]
+                x, y = 120.0 - x, 80.0 - y
+                players = team.outfield_on_pitch(offsets[p] + t)
+                player = players[int(rng.integers(len(players)))]
+                event_type = _DEFENSIVE_TYPES[int(rng.integers(len(_DEFENSIVE_TYPES)))]
+                fields = {'duel_type': 'Tackle', 'duel_outcome': 'Won'} if event_type == 'Duel' else {}
+                add(p, t, 5, team, event_type, player_info=player, location=[x, y], duration=0.0, **fields)
+                if rng.random() < 0.05:
+                    # Occasional foul on the ball winner / offside / foul won pair
+                    add(p, t + 0.5, 5, team, 'Foul Won', player_info=player, location=[x, y])
+                    victim = opponent[team.name]
+                    fouler = victim.outfield_on_pitch(offsets[p] + t)[0]
+                    add(p, t + 0.5, 5, victim, 'Foul Committed', player_info=fouler,
+                        location=[120.0 - x, 80.0 - y], possession_team=team.name)
+                elif rng.random() < 0.02:
+                    add(p, t + 0.5, 5, team, 'Offside', player_info=player, location=[x, y])
+                step = 'Pass'
+
+    for p in periods + ([5] if penalties else []):
+        end = lengths.get(p, max((r['_t'] for r in rows if r['period'] == 5), default=0.0) + 30.0)
+        for team in teams:
+            add(p, end, 9, team, 'Half End', duration=0.0)
+
+    # --- Order, number and time-stamp the events --------------------------
+    df = pd.DataFrame(rows)
+    df = df.sort_values(['period', '_t', '_order'], kind='mergesort').reset_index(drop=True)
+    seconds = df['_t'].to_numpy()
+    start_minutes = df['period'].map(_PERIOD_START_MINUTE).to_numpy()
+    df['index'] = np.arange(1, len(df) + 1)
+    df['timestamp'] = [_timestamp(s) for s in seconds]
+    df['minute'] = (start_minutes + seconds // 60).astype(int)
+    df['second'] = (seconds % 60).astype(int)
+    df['possession'] = (df['possession_team'] != df['possession_team'].shift()).cumsum().astype(int)
+    df['possession_team_id'] = df['possession_team'].map({home.name: home.team_id, away.name: away.team_id})
+    return df.reindex(columns=EVENT_COLUMNS)
+
+
+def generate_season(
+    n_matches: int = 20,
+    seed: int = 0,
+    competition_id: int = 9001,
+    season_id: int = 1,
+    teams: List[str] = None,
+    n_events: int = 3400,
+    extra_time_every: int = 7,
+    penalties_every: int = 10,
+) -> Tuple[pd.DataFrame, Dict[int, pd.DataFrame]]:
+    """
+    Generate a round-robin style season of synthetic matches.
+
+    Scores, shot counts and cards vary per match; every ``extra_time_every``-th
+    match goes to extra time and every ``penalties_every``-th to penalties, so
+    a modest season exercises every plot code path.
+
+    Returns:
+        (matches_df shaped like ``sb.matches``, {match_id: events_df})
+    """
+    rng = np.random.default_rng(seed)
+    teams = teams or TEAM_NAMES
+    fixtures = [(h, a) for h in teams for a in teams if h != a]
+    order = rng.permutation(len(fixtures))
+
+    matches, events = [], {}
+    for i in range(n_matches):
+        home_team, away_team = fixtures[order[i % len(fixtures)]]
+        match_id = competition_id * 10000 + season_id * 1000 + i + 1
+        penalties = penalties_every > 0 and (i + 1) % penalties_every == 0
+        extra_time = penalties or (extra_time_every > 0 and (i + 1) % extra_time_every == 0)
+        home_goals, away_goals = (int(g) for g in rng.poisson([1.5, 1.1]))
+        if extra_time:
+            away_goals = home_goals
+        et_goals = (0, 0) if penalties or not extra_time else (int(rng.integers(0, 2)), 0)
+        frame = generate_match_events(
+            match_id=match_id, home_team=home_team, away_team=away_team,
+            seed=int(rng.integers(2 ** 31)), n_events=int(n_events * rng.uniform(0.85, 1.15)),
+            home_goals=home_goals, away_goals=away_goals,
+            home_shots=home_goals + int(rng.integers(5, 16)),
+            away_shots=away_goals + int(rng.integers(4, 13)),
+            substitutions=int(rng.integers(3, 6)),
+            yellow_cards=int(rng.integers(0, 6)),
+            red_cards=int(rng.random() < 0.1),
+            extra_time=extra_time, extra_time_goals=et_goals,
+            penalties=penalties, penalty_score=(4, 3) if penalties else (0, 0),
+        )
+        events[match_id] = frame
+        home_score = home_goals + et_goals[0]
+        away_score = away_goals + et_goals[1]
+        matches.append({
+            'match_id': match_id,
+            'match_date': str(pd.Timestamp('2024-08-10') + pd.Timedelta(days=7 * (i // 6))),
+            'kick_off': '15:00:00.000',
+            'competition': 'Synthetic League',
+            'season': f"{2024 + season_id - 1}/{2025 + season_id - 1}",
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_score': home_score,
+            'away_score': away_score,
+            'match_status': 'available',
+            'match_week': i // 6 + 1,
+            'competition_stage': 'Regular Season',
+        })
+
+    return pd.DataFrame(matches), events
+
+
+# Type-specific attributes are nested under this key in the raw JSON (``sb.events`` flattens them)
+_ATTRIBUTE_PREFIXES = {
+    'Pass': 'pass', 'Carry': 'carry', 'Dribble': 'dribble', 'Duel': 'duel', 'Shot': 'shot',
+    'Substitution': 'substitution', 'Bad Behaviour': 'bad_behaviour', 'Foul Committed': 'foul_committed',
+}
+# Top-level columns that are {'id', 'name'} objects in the raw JSON, with the column holding the id
+_NAMED_COLUMNS = {'type': None, 'possession_team': 'possession_team_id', 'play_pattern': None,
+                  'team': 'team_id', 'player': 'player_id', 'position': None}
+# Attributes that are plain values rather than {'id', 'name'} objects
+_PLAIN_ATTRIBUTES = {'end_location', 'length', 'statsbomb_xg', 'goal_assist', 'shot_assist', 'key_pass_id'}
+# Columns the flattening derives from the objects above (or, for match_id, adds itself)
+_FLATTENED_IDS = {'match_id', 'possession_team_id', 'team_id', 'player_id', 'substitution_replacement_id'}
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _named(name: str, object_id=None) -> Dict:
+    return {'id': int(object_id) if object_id is not None else _stable_id(str(name)), 'name': name}
+
+
+def raw_events(events: pd.DataFrame) -> List[Dict]:
+    """
+    Open-data JSON for a synthetic match (the inverse of the ``sb.events`` flattening)
+
+    Names become ``{'id', 'name'}`` objects and type-specific columns nest under
+    the type's key, so ``sb.events``-style flattening gives back the frame, plus
+    the id columns it always adds (e.g. ``pass_recipient_id``).
+    """
+    player_ids = dict(zip(events['player'], events['player_id']))
+    raw = []
+    for row in events.to_dict('records'):
+        event = {}
+        prefix = _ATTRIBUTE_PREFIXES.get(row['type'])
+        attributes = {}
+        for column, value in row.items():
+            if column in _FLATTENED_IDS:
+                continue
+            if not isinstance(value, (list, dict)) and pd.isna(value):
+                continue
+            value = _json_value(value)
+            if column in _NAMED_COLUMNS:
+                id_column = _NAMED_COLUMNS[column]
+                event[column] = _named(value, row.get(id_column) if id_column else None)
+            elif prefix and column.startswith(prefix + '_'):
+                key = column[len(prefix) + 1:]
+                if key in _PLAIN_ATTRIBUTES:
+                    attributes[key] = value
+                elif key in ('recipient', 'replacement'):
+                    object_id = row.get('substitution_replacement_id') if key == 'replacement' else player_ids.get(value)
+                    attributes[key] = _named(value, object_id)
+                else:
+                    attributes[key] = _named(value)
+            else:
+                event[column] = value
+        if attributes:
+            event[prefix] = attributes
+        raw.append(event)
+    return raw
+
+
+def raw_lineups(events: pd.DataFrame) -> List[Dict]:
+    """Open-data lineup JSON: every player who started or came on, per team"""
+    lineups = []
+    for team in events['team'].dropna().unique()[:2]:
+        squad = {p['player_id']: p for p in team_squad(team)}
+        used = events.loc[(events['team'] == team), ['player_id', 'substitution_replacement_id']]
+        player_ids = sorted({int(v) for v in pd.concat([used['player_id'], used['substitution_replacement_id']])
+                             .dropna() if int(v) in squad})
+        lineups.append({
+            'team_id': _stable_id(team, 1000),
+            'team_name': team,
+            'lineup': [{
+                'player_id': player_id,
+                'player_name': squad[player_id]['player'],
+                'player_nickname': None,
+                'jersey_number': squad[player_id]['jersey_number'],
+                'country': {'id': 68, 'name': 'England'},
+                'cards': [],
+                'positions': [],
+            } for player_id in player_ids],
+        })
+    return lineups
+
+
+def raw_matches(matches: pd.DataFrame, competition_id: int, season_id: int) -> List[Dict]:
+    """Open-data match JSON for a ``generate_season`` matches frame"""
+    raw = []
+    for match in matches.to_dict('records'):
+        raw.append({
+            'match_id': int(match['match_id']),
+            'match_date': match['match_date'][:10],
+            'kick_off': match['kick_off'],
+            'competition': {'competition_id': competition_id, 'country_name': 'England',
+                            'competition_name': match['competition']},
+            'season': {'season_id': season_id, 'season_name': match['season']},
+            'home_team': {'home_team_id': _stable_id(match['home_team'], 1000),
+                          'home_team_name': match['home_team'], 'home_team_gender': 'male'},
+            'away_team': {'away_team_id': _stable_id(match['away_team'], 1000),
+                          'away_team_name': match['away_team'], 'away_team_gender': 'male'},
+            'home_score': int(match['home_score']),
+            'away_score': int(match['away_score']),
+            'match_status': match['match_status'],
+            'match_week': int(match['match_week']),
+            'competition_stage': {'id': 1, 'name': match['competition_stage']},
+            'metadata': {'data_version': '1.1.0', 'shot_fidelity_version': '2', 'xy_fidelity_version': '2'},
+        })
+    return raw
+
+
+def write_open_data(root: str, matches: pd.DataFrame, events: Dict[int, pd.DataFrame],
+                    competition_id: int = 9001, season_id: int = 1):
+    """
+    Write a ``generate_season`` season in the open-data repository layout
+
+    ``root`` gets ``competitions.json``, ``matches/<competition>/<season>.json``,
+    ``events/<match>.json`` and ``lineups/<match>.json``, so it can stand in for
+    a local open-data checkout or be served over HTTP (``python -m http.server``).
+    """
+    for folder in ('events', 'lineups', os.path.join('matches', str(competition_id))):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+
+    def dump(path, data):
+        with open(os.path.join(root, path), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    season_name = matches['season'].iloc[0] if len(matches) else ''
+    dump('competitions.json', [{
+        'competition_id': competition_id, 'season_id': season_id, 'country_name': 'England',
+        'competition_name': matches['competition'].iloc[0] if len(matches) else 'Synthetic League',
+        'competition_gender': 'male', 'competition_youth': False, 'competition_international': False,
+        'season_name': season_name, 'match_updated': None, 'match_updated_360': None,
+        'match_available_360': None, 'match_available': None,
+    }])
+    dump(os.path.join('matches', str(competition_id), f'{season_id}.json'),
+         raw_matches(matches, competition_id, season_id))
+    for match_id, frame in events.items():
+        dump(os.path.join('events', f'{match_id}.json'), raw_events(frame))
+        dump(os.path.join('lineups', f'{match_id}.json'), raw_lineups(frame))